@@ -1,3 +1,6 @@
 """app.__init__"""
 
-__all__ = ['bowling_controller', 'bowling_game', 'helpers']
+__all__ = ['bowling_controller', 'bowling_game', 'compact_bowling_game', 'helpers',
+    'instrumentation', 'leaderboard', 'replay_engine', 'roll_log', 'score_cache', 'score_feed',
+    'scoring_service', 'shared_scores', 'state_machine_bowling_game', 'stats_aggregator',
+    'stream_scorer', 'vectorized_scorer']
@@ -0,0 +1,13 @@
+"""__main__.py
+
+Runs the streaming roll feed scorer from <stream_scorer.py>. Use <python -m app --help> to
+list the options.
+"""
+
+import sys
+
+from .stream_scorer import main
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,15 +6,49 @@ Provides a class used to manage bowling game state for each player. Relies on th
 class to provide scoring functionality.
 """
 
-from .bowling_game import BowlingGame
-from .helpers import read_only, restrict_bounds
+from array import array
+from collections import deque
+import struct
 
+from .bowling_game import BowlingGame, get_max_score
+from .helpers import FrameView, ReadWriteLock, check_bounds, lock_methods, read_locked, \
+    read_only, restrict_bounds, write_locked
+from .instrumentation import Instrumented
 
-class BowlingController(object):
-    """Manage bowling game scores and state for all players."""
 
+class BowlingController(Instrumented):
+    """Manage bowling game scores and state for all players.
 
-    def __init__(self, num_players=2, num_pins=10, num_frames=10, game_states=[]):
+    Current scores, frame data, and game over status are cached after the first read and
+    cleared for a player only when a ball score is posted for that player, so repeated reads
+    between ball scores do not recalculate anything. Post every ball score through this class;
+    scores posted directly to a player's game object are not seen by the cache.
+
+    Each update, such as a posted ball score, increases the controller's <version>. With a
+    change log, clients keep a copy of the frames in sync by reading only the frame fields
+    changed since the version they last saw with <get_changes>.
+
+    In thread safe mode, one thread may post ball scores while any number of threads read.
+    Each read holds the controller's <lock> for reading, so readers never wait for one
+    another and each read sees every player's frames as of the same ball score. Hold
+    <lock.read()> around several reads to see them all as of the same ball score.
+    """
+
+    EMPTY_FRAME = FrameView({}) ## Frame data for an out of bounds frame number.
+    INSTRUMENTED = ('amend_roll', 'get_changes', 'get_current_score', 'get_current_scores',
+        'get_frame_data', 'get_frames', 'get_game_state', 'get_game_states', 'get_max_score',
+        'get_max_scores', 'is_game_over', 'post_new_score', 'post_new_scores', 'undo_last_roll')
+
+    # Snapshot layout: version, players, pins, frames, current player, lane, and game, followed by
+    # a length-prefixed game snapshot for each player.
+    SNAPSHOT_VERSION = 1
+    SNAPSHOT_HEADER = struct.Struct('<BHHHHII')
+    SNAPSHOT_LENGTH = struct.Struct('<H')
+
+
+    def __init__(self, num_players=2, num_pins=10, num_frames=10, game_states=[],
+        engine=BowlingGame, trusted=False, roll_log=None, lane=None, game=None, thread_safe=False,
+        change_log_size=0):
         """Create a bowling game scoring object for each player.
 
         Args:
@@ -22,18 +56,68 @@ class BowlingController(object):
             num_pins: Integer representing the number of pins set up in each frame.
             num_frames: Integer representing the number of frames in this game.
             game_states: List that stores one BowlingGame objects for each player.
+            engine: Class used to create each player's game, such as <CompactBowlingGame>.
+            trusted: Boolean value indicating whether posted ball scores come from a trusted
+                source, such as lane hardware, and can skip checking their bounds. Posting a
+                score that is not an integer between 0 and the number of pins to a trusted
+                controller is undefined behavior.
+            roll_log: <RollLog> object that records every posted ball score, or None.
+            lane: Integer identifying this game's lane in the roll log, required with a log.
+            game: Integer identifying this game on its lane in the roll log, required with a
+                log.
+            thread_safe: Boolean value indicating whether to lock the controller so that
+                threads may read it while another thread posts ball scores.
+            change_log_size: Integer representing the number of frame changes kept for
+                <get_changes>, or 0 to keep none.
+
+        Raises:
+            ValueError if a roll log is given without a valid lane and game, or the game does
+                not fit in its records.
         """
         self.__num_players = num_players if num_players >= 1 else 1
         self.__num_pins = num_pins
         self.__num_frames = num_frames
 
-        # Create bowling game objects for each player to track scores.
+        # Create bowling game objects for each player to track scores. The player who rolled
+        # each ball is only known for new games; it is rebuilt for other games when needed.
+        self.__turns = None
         if not game_states:
             for i in range(num_players):
-                game_states.append(BowlingGame(num_pins, num_frames, []))
+                game_states.append(engine(num_pins, num_frames, []))
+            self.__turns = array('H')
 
         self.__game_states = game_states
         self.__player_turn = 0 ## A pointer to the current player's bowling game object.
+        self.__trusted = trusted
+        self.__lane = lane
+        self.__game = game
+        self.__roll_log = None
+        self.check_roll_log(roll_log)
+        self.__roll_log = roll_log
+        self.__leaderboard = None ## Set by <Leaderboard.add_controller>.
+        self.__score_feed = None ## Set by <ScoreFeed.add_controller>.
+        self.__lock = ReadWriteLock() if thread_safe else None
+
+        # Record the frame fields changed by each update.
+        self.__version = 0
+        self.__changes = deque() if change_log_size > 0 else None
+        self.__change_log_size = change_log_size
+        self.__changes_floor = 0 ## The latest version with a change dropped from the log.
+        self.__frame_copies = [None] * self.__num_players ## Frames copied after the last update.
+
+        # Cache read results until a ball score is posted.
+        self.__scores_cache = None
+        self.__frames_cache = {}
+        self.__frame_cache = [{} for i in range(self.__num_players)]
+        self.__game_over_cache = [None] * self.__num_players
+        self.__max_score_cache = [None] * self.__num_players
+
+        # Reads must not change shared game state, so finish any deferred work up front. Only
+        # thread safe controllers lock, so other controllers call the class functions directly.
+        if thread_safe:
+            for player in range(self.__num_players):
+                self.settle_game(player)
+            lock_methods(self, self.__lock)
 
 
     @read_only
@@ -42,10 +126,430 @@ class BowlingController(object):
         return self.__num_players
 
 
+    @read_only
+    def NUM_PINS(self):
+        """Returns the total number of frame pins in this bowling game."""
+        return self.__num_pins
+
+
+    @read_only
+    def NUM_FRAMES(self):
+        """Returns the total number of frames in this bowling game."""
+        return self.__num_frames
+
+
+    @read_only
+    def version(self):
+        """Returns the number of updates made to this controller, such as posted ball scores."""
+        return self.__version
+
+
+    @read_only
+    def leaderboard(self):
+        """Returns the <Leaderboard> object ranking this controller's players, or None."""
+        return self.__leaderboard
+
+
+    @read_only
+    def lock(self):
+        """Returns the <ReadWriteLock> object used in thread safe mode, or None."""
+        return self.__lock
+
+
+    ##########################
+    ### INTERNAL FUNCTIONS ###
+    ##########################
+
+    def check_roll_log(self, roll_log):
+        """Check that every ball score this controller posts can be recorded in a roll log.
+
+        Args:
+            roll_log: <RollLog> object, or None.
+
+        Raises:
+            ValueError if the lane or game is missing or does not fit in a record.
+            ValueError if the number of players, pins, or frames does not fit in a record.
+        """
+        if roll_log is None:
+            return
+        if self.__lane is None or self.__game is None:
+            raise ValueError('A lane and game should be given to record ball scores!')
+        roll_log.check(self.__lane, self.__game, self.NUM_PLAYERS, self.__num_pins,
+            self.__num_frames)
+
+
+    def clear_cache(self, player):
+        """Clear cached reads that may change after a ball score is posted for this player.
+
+        Args:
+            player: Integer representing the player (zero-indexed).
+        """
+        self.__scores_cache = None
+        self.__frames_cache.clear()
+        self.__frame_cache[player].clear()
+        self.__game_over_cache[player] = None
+        self.__max_score_cache[player] = None
+        self.__frame_copies[player] = None
+
+
+    def copy_frames(self, player, start):
+        """Copy frame data for this player from a frame onward to compare after an update.
+
+        Frames copied after the player's last update are reused, since they have not changed.
+
+        Args:
+            player: Integer representing the player (zero-indexed).
+            start: Integer representing the first frame number to copy.
+
+        Returns:
+            Dictionary object containing a frame dictionary object keyed by frame number.
+        """
+        game = self.__game_states[player]
+        copies = self.__frame_copies[player] or {}
+        return {i: copies.get(i) or game.get_frame_data(i)
+            for i in range(start, game.current_frame + 1)}
+
+
+    def get_cached_frame(self, i, player):
+        """Get read-only frame data for the ith frame for this player, caching it for later reads.
+
+        Args:
+            i: Integer representing the desired frame number.
+            player: Integer representing the desired player (zero-indexed).
+
+        Returns:
+            <FrameView> object containing data from the ith frame.
+        """
+        cache = self.__frame_cache[player]
+        frame = cache.get(i)
+        if frame is None:
+            game = self.__game_states[player]
+            if i < 1 or i > game.current_frame:
+                return self.EMPTY_FRAME
+            frame = cache[i] = FrameView(game.get_frame_data(i))
+        return frame
+
+
+    def get_cached_scores(self):
+        """Get the cached list of current scores for all players, filling it if it is empty.
+
+        Returns:
+            List of the latest scores for all players in order of player number.
+        """
+        scores = self.__scores_cache
+        if scores is None:
+            scores = self.__scores_cache = [
+                self.get_cached_frame(game.current_frame, p).get('running_total')
+                for p, game in enumerate(self.__game_states[:self.NUM_PLAYERS])]
+        return scores
+
+
+    def get_cached_max_score(self, player):
+        """Get the maximum possible score for this player, caching it for later reads.
+
+        Engines without their own projection, such as <CompactBowlingGame>, are scored from
+        every ball score rather than in constant time.
+
+        Args:
+            player: Integer representing the player (zero-indexed).
+
+        Returns:
+            Integer representing the highest score this player can still reach.
+        """
+        max_score = self.__max_score_cache[player]
+        if max_score is None:
+            game = self.__game_states[player]
+            if hasattr(game, 'get_max_score'):
+                max_score = game.get_max_score()
+            else:
+                max_score = get_max_score(game.get_rolls(), self.__num_pins, self.__num_frames)
+            self.__max_score_cache[player] = max_score
+        return max_score
+
+
+    def get_correctable_game(self, player):
+        """Get this player's game, checking that its engine can correct ball scores.
+
+        Args:
+            player: Integer representing the player (zero-indexed).
+
+        Raises:
+            ValueError if the engine does not support <amend_roll> and <undo_last_roll>.
+
+        Returns:
+            Game object for this player.
+        """
+        game = self.__game_states[player]
+        if not hasattr(game, 'undo_last_roll'):
+            raise ValueError('The {engine} engine cannot correct ball scores!' \
+                .format(engine=type(game).__name__))
+        return game
+
+
+    def get_turns(self):
+        """Get the player who rolled each ball, rebuilding the list from the games if needed.
+
+        Players take turns by the same rule they did when the balls were posted, so replaying
+        each player's ball scores in turn recovers the order they were rolled in. A player
+        whose game is over is passed over, as a ball posted for them would have been ignored.
+
+        Returns:
+            Array of integers representing the zero-indexed player who rolled each ball.
+        """
+        if self.__turns is not None:
+            return self.__turns
+
+        games = self.__game_states[:self.NUM_PLAYERS]
+        rolls = [deque(game.get_rolls()) for game in games]
+        replays = [BowlingGame(game.NUM_PINS, game.NUM_FRAMES, []) for game in games]
+        turns = array('H')
+        player = 0
+        while True:
+            replay = replays[player]
+            if rolls[player]:
+                replay.post_new_score(rolls[player].popleft())
+                turns.append(player)
+            elif not (replay.is_game_over() and any(rolls)):
+                break
+            if replay.is_frame_complete(replay.current_frame):
+                player = (player + 1) % self.NUM_PLAYERS
+        self.__turns = turns
+        return turns
+
+
+    def is_recording(self):
+        """Determine whether updates are compared to find their changes.
+
+        Returns:
+            Boolean value indicating whether there is a change log or a subscribed score feed.
+        """
+        return self.__changes is not None or \
+            (self.__score_feed is not None and len(self.__score_feed) > 0)
+
+
+    def pack_roll(self, player, score):
+        """Pack the roll log record for a ball score before it is posted. Call this with a roll log.
+
+        Args:
+            player: Integer representing the player about to bowl (zero-indexed).
+            score: Integer representing the number of pins knocked down.
+
+        Raises:
+            ValueError if the ball score does not fit in a record.
+
+        Returns:
+            Bytes object containing the record.
+        """
+        # The ball is recorded in the player's frame after it is posted.
+        game = self.__game_states[player]
+        i = game.current_frame
+        if i == 0 or (i < self.__num_frames and game.is_frame_complete(i)):
+            i += 1
+        return self.__roll_log.pack(self.__lane, self.__game, player + 1, i, score,
+            self.NUM_PLAYERS)
+
+
+    def record_changes(self, frames):
+        """Compare frame data copied before an update with the frames now, then log the changes
+        and publish them to the score feed.
+
+        Call this once per update, after the update has been applied.
+
+        Args:
+            frames: Dictionary object containing the first frame number copied and the
+                <copy_frames> result for each changed player, keyed by the zero-indexed player.
+
+        Returns:
+            List of (version, player, frame, fields) tuples, where the player is one-indexed
+            and fields is a dictionary object of the changed fields, holding None for a removed
+            field, or None if the frame was removed.
+        """
+        self.__version += 1
+        version = self.__version
+        changes = []
+        updates = {}
+        for player, (start, before) in frames.items():
+            after = self.copy_frames(player, start)
+            self.__frame_copies[player] = after
+            updated = {}
+            for i in sorted(before.keys() | after.keys()):
+                old = before.get(i, {})
+                new = after.get(i)
+                if new == old:
+                    continue
+                elif new is None:
+                    changes.append((version, player + 1, i, None))
+                    updated[i] = None
+                    continue
+                fields = {key: value for key, value in new.items() if old.get(key) != value}
+                fields.update((key, None) for key in old if key not in new)
+                if fields:
+                    changes.append((version, player + 1, i, fields))
+                    updated[i] = FrameView(new)
+            if updated:
+                current = after.get(self.__game_states[player].current_frame, {})
+                updates[player + 1] = (current.get('running_total'), updated)
+
+        # Keep the latest changes, remembering the version of the last one dropped.
+        log = self.__changes
+        if log is not None:
+            log.extend(changes)
+            while len(log) > self.__change_log_size:
+                self.__changes_floor = log.popleft()[0]
+        if self.__score_feed is not None and updates:
+            self.__score_feed.publish(self, version, updates)
+        return changes
+
+
+    def settle_game(self, player):
+        """Finish deferred work for this player's game so that reads do not change it.
+
+        Games restored from a snapshot replay their ball scores on the first read, and lazy
+        games calculate their scores on the first read. Reading the latest frame does both.
+
+        Args:
+            player: Integer representing the player (zero-indexed).
+        """
+        game = self.__game_states[player]
+        game.get_frame_data(game.current_frame)
+
+
     ########################
     ### PUBLIC FUNCTIONS ###
     ########################
 
+    @write_locked
+    @restrict_bounds(1, lambda self: self.NUM_PLAYERS)
+    def amend_roll(self, player, frame, ball, pins):
+        """Correct a ball score already posted for this player and update the player's scores.
+
+        The player's game replays the corrected frame and every later frame, so the time this
+        takes grows with the number of frames after the ball. A correction that would change
+        which balls end a frame, such as turning a first ball into a strike, would change whose
+        turn each later ball was, so it is rejected. The correction is recorded in the roll log,
+        if any.
+
+        Args:
+            player: Integer representing the desired player (one-indexed).
+            frame: Integer representing the frame number of the ball.
+            ball: Integer representing the ball within the frame (one-indexed).
+            pins: Integer representing the corrected number of pins knocked down.
+
+        Raises:
+            ValueError if the engine does not support corrections.
+            ValueError if the ball has not been posted or the correction is not a valid score.
+            ValueError if the correction would change which balls end a frame.
+            ValueError if the correction does not fit in a roll log record.
+        """
+        player = player - 1 ## Shift the argument to be zero-indexed.
+        game = self.get_correctable_game(player)
+        roll_log = self.__roll_log
+        record = None
+        if roll_log is not None:
+            record = roll_log.pack(self.__lane, self.__game, player + 1, frame, pins,
+                self.NUM_PLAYERS, kind=roll_log.AMEND, ball=ball)
+        before = self.copy_frames(player, 1) if self.is_recording() else None
+        try:
+            game.amend_roll(frame, ball, pins, keep_frames=True)
+        finally:
+            self.clear_cache(player)
+            if self.__lock is not None:
+                self.settle_game(player)
+        if record is not None:
+            roll_log.append_record(record)
+
+        if before is None:
+            self.__version += 1
+        else:
+            self.record_changes({player: (1, before)})
+        if self.__leaderboard is not None:
+            self.__leaderboard.update_score(self, player + 1)
+
+
+    @read_locked
+    @restrict_bounds(1, lambda self: self.NUM_PLAYERS)
+    def can_catch(self, player, other):
+        """Determine whether this player can still tie or beat another player's current score.
+
+        Args:
+            player: Integer representing the chasing player (one-indexed).
+            other: Integer representing the player to catch (one-indexed).
+
+        Raises:
+            ValueError if either player is not in the game.
+
+        Returns:
+            Boolean value indicating whether this player's maximum possible score is at least
+            the other player's current score.
+        """
+        return self.get_cached_max_score(player - 1) >= (self.get_current_score(other) or 0)
+
+
+    def disable_instrumentation(self):
+        """Stop recording calls to this controller and to each player's game."""
+        super().disable_instrumentation()
+        if self.__lock is not None:
+            lock_methods(self, self.__lock) ## Removing the recording wrappers removed these.
+        for game in self.__game_states:
+            if hasattr(game, 'disable_instrumentation'):
+                game.disable_instrumentation()
+
+
+    def enable_instrumentation(self, instrumentation=None):
+        """Start recording calls to this controller and to each player's game.
+
+        Games from an engine without instrumentation support, such as <CompactBowlingGame>,
+        are not recorded.
+
+        Args:
+            instrumentation: <Instrumentation> object that records the calls, or None to
+                create a new one.
+
+        Returns:
+            <Instrumentation> object recording the calls.
+        """
+        instrumentation = super().enable_instrumentation(instrumentation)
+        for game in self.__game_states:
+            if hasattr(game, 'enable_instrumentation'):
+                game.enable_instrumentation(instrumentation)
+        return instrumentation
+
+
+    @read_locked
+    def get_changes(self, since=0):
+        """Get the frame fields changed by every update after a version, oldest first.
+
+        A client holding frames as of one version applies each change in order to bring them
+        up to the current <version>: it sets each field, removes a field whose value is None,
+        and removes a frame whose fields are None.
+
+        Args:
+            since: Integer representing the version the client last saw.
+
+        Raises:
+            ValueError if the controller has no change log.
+            ValueError if changes after this version were already dropped from the log, so the
+                client should read every frame again with <get_game_states>.
+
+        Returns:
+            List of (version, player, frame, fields) tuples, where the player is one-indexed.
+        """
+        if self.__changes is None:
+            raise ValueError('The controller does not keep a change log!')
+        if since < self.__changes_floor:
+            raise ValueError('The changes after version {since} are no longer kept!' \
+                .format(since=repr(since)))
+        # Read back from the latest change, since clients usually ask for the last few.
+        changes = []
+        for change in reversed(self.__changes):
+            if change[0] <= since:
+                break
+            changes.append(change)
+        changes.reverse()
+        return changes
+
+
+    @read_locked
     def get_current_player(self):
         """Returns the one-indexed number representing the current player.
 
@@ -55,6 +559,7 @@ class BowlingController(object):
         return self.__player_turn + 1
 
 
+    @read_locked
     @restrict_bounds(1, lambda self: self.NUM_PLAYERS)
     def get_current_score(self, player):
         """Returns the current score for this player.
@@ -65,92 +570,138 @@ class BowlingController(object):
         Returns:
             The latest score for this player.
         """
-        games = self.__game_states
-        player = player - 1 ## Shift the argument to be zero-indexed.
-        frame = games[player].current_frame
-        return games[player].get_frame_data(frame).get('running_total')
+        return self.get_cached_scores()[player - 1] ## Shift the argument to be zero-indexed.
 
 
+    @read_locked
     def get_current_scores(self):
         """Returns the current score for all players.
 
         Returns:
             List of the latest scores for all players in order of player number.
         """
-        data = []
-        games = self.__game_states
-        for p in range(self.NUM_PLAYERS):
-            frame = games[p].current_frame
-            data.append(games[p].get_frame_data(frame).get('running_total'))
-        return data
+        return list(self.get_cached_scores())
 
 
+    @read_locked
     def get_frame_data(self, i, player):
-        """Get a shallow copy of basic frame data associated with the ith frame for this player.
+        """Get read-only basic frame data associated with the ith frame for this player.
 
-        Note that <BowlingGame> returns an empty dictionary for an out of bounds frame number.
+        Note that an empty frame is returned for an out of bounds frame number.
 
         Args:
             i: Integer representing the desired frame number.
             player: Integer representing the desired player (one-indexed).
 
         Returns:
-            Dictionary containing data from the ith frame.
+            <FrameView> object containing data from the ith frame.
         """
         if player < 1 or player > self.NUM_PLAYERS:
-            return {}
+            return self.EMPTY_FRAME
 
-        games = self.__game_states
-        player = player - 1 ## Shift the argument to be zero-indexed.
-        return games[player].get_frame_data(i)
+        return self.get_cached_frame(i, player - 1) ## Shift the argument to be zero-indexed.
 
 
+    @read_locked
     def get_frames(self, i):
-        """Get ith frame data for all players.
+        """Get read-only ith frame data for all players.
 
-        Note that <BowlingGame> returns an empty dictionary for an out of bounds frame number.
+        Note that an empty frame is returned for an out of bounds frame number.
 
         Args:
             i: Integer representing the desired frame number.
 
         Returns:
-            List of dictionary objects containing data from the ith frame in order by player.
+            List of <FrameView> objects containing data from the ith frame in order by player.
         """
-        data = []
-        games = self.__game_states
-        for p in range(self.NUM_PLAYERS):
-            data.append(games[p].get_frame_data(i))
-        return data
+        frames = self.__frames_cache.get(i)
+        if frames is None:
+            frames = [self.get_cached_frame(i, p) for p in range(self.NUM_PLAYERS)]
+            if 1 <= i <= self.__num_frames:
+                self.__frames_cache[i] = frames
+        return list(frames)
 
 
+    @read_locked
     @restrict_bounds(1, lambda self: self.NUM_PLAYERS)
-    def get_game_state(self, player):
-        """Returns a full, recursive copy of the game state for this player.
+    def get_game_state(self, player, copy=False):
+        """Returns read-only views, or a full, recursive copy, of the game state for this player.
+
+        Views read through to the game state, so a copy is always returned in thread safe mode.
 
         Args:
             player: Integer representing the desired player (one-indexed).
+            copy: Boolean value indicating whether to return a copy that may be changed.
 
         Returns:
-            List of dictionary objects representing the state of each frame.
+            List of <FrameView> objects, or of dictionary objects if copy is True, representing
+            the state of each frame.
         """
         games = self.__game_states
         player = player - 1 ## Shift the argument to be zero-indexed.
-        return games[player].get_game_state()
+        return games[player].get_game_state(copy or self.__lock is not None)
 
 
-    def get_game_states(self):
-        """Returns a full, recursive copy of the game state for all players.
+    @read_locked
+    def get_game_states(self, copy=False):
+        """Returns read-only views, or a full, recursive copy, of the game state for all players.
+
+        Views read through to the game state, so copies are always returned in thread safe mode.
+
+        Args:
+            copy: Boolean value indicating whether to return copies that may be changed.
 
         Returns:
-            List of dictionary objects representing the state of each frame in order by player.
+            List of frame lists from <get_game_state> in order by player.
         """
         data = []
         games = self.__game_states
+        copy = copy or self.__lock is not None
         for p in range(self.NUM_PLAYERS):
-            data.append(games[p].get_game_state())
+            data.append(games[p].get_game_state(copy))
         return data
 
 
+    @read_locked
+    @restrict_bounds(1, lambda self: self.NUM_PLAYERS)
+    def get_max_score(self, player):
+        """Returns the highest score this player can still reach if every later ball is a strike.
+
+        Args:
+            player: Integer representing the desired player (one-indexed).
+
+        Returns:
+            Integer representing the maximum possible score, which is the final score once the
+            player's game is over.
+        """
+        return self.get_cached_max_score(player - 1) ## Shift the argument to be zero-indexed.
+
+
+    @read_locked
+    def get_max_scores(self):
+        """Returns the maximum possible score for all players.
+
+        Returns:
+            List of the maximum possible scores for all players in order of player number.
+        """
+        return [self.get_cached_max_score(player) for player in range(self.NUM_PLAYERS)]
+
+
+    @read_locked
+    @restrict_bounds(1, lambda self: self.NUM_PLAYERS)
+    def get_rolls(self, player):
+        """Returns every ball score for this player in the order it was rolled.
+
+        Args:
+            player: Integer representing the desired player (one-indexed).
+
+        Returns:
+            List of integers representing the number of pins knocked down by each ball.
+        """
+        return self.__game_states[player - 1].get_rolls() ## Shift the argument to be zero-indexed.
+
+
+    @read_locked
     @restrict_bounds(1, lambda self: self.NUM_PLAYERS)
     def is_game_over(self, player):
         """Determine whether the game is over for this player.
@@ -161,26 +712,308 @@ class BowlingController(object):
         Returns:
             Boolean value representing whether the game should continue for this player.
         """
-        games = self.__game_states
         player = player - 1 ## Shift the argument to be zero-indexed.
-        return games[player].is_game_over()
+        game_over = self.__game_over_cache[player]
+        if game_over is None:
+            game_over = self.__game_over_cache[player] = self.__game_states[player].is_game_over()
+        return game_over
 
 
-    def post_new_score(self, score):
+    @write_locked
+    def set_leaderboard(self, leaderboard):
+        """Start or stop updating a leaderboard as ball scores are posted.
+
+        Use <Leaderboard.add_controller> rather than calling this directly.
+
+        Args:
+            leaderboard: <Leaderboard> object that ranks this controller's players, or None.
+        """
+        self.__leaderboard = leaderboard
+
+
+    @write_locked
+    def set_roll_log(self, roll_log):
+        """Start or stop recording posted ball scores.
+
+        Args:
+            roll_log: <RollLog> object that records every posted ball score, or None.
+
+        Raises:
+            ValueError if the controller has no valid lane and game, or the game does not fit
+                in the log's records.
+        """
+        self.check_roll_log(roll_log)
+        self.__roll_log = roll_log
+
+
+    @write_locked
+    def set_score_feed(self, score_feed):
+        """Start or stop publishing the frames changed by each update.
+
+        Use <ScoreFeed.add_controller> rather than calling this directly.
+
+        Args:
+            score_feed: <ScoreFeed> object that fans changes out to subscribers, or None.
+        """
+        self.__score_feed = score_feed
+
+
+    @write_locked
+    def post_new_score(self, score, changes=False):
         """Add a new ball score, update scores for the current player, then switch to next player.
 
         Args:
             score: Integer representing the number of pins knocked down.
+            changes: Boolean value indicating whether to return the frame fields changed.
+
+        Returns:
+            List of changes like those from <get_changes> if changes is True, or None.
         """
-        # Post the score.
+        # Post the score. A ball posted after the player's game is over is ignored.
         games = self.__game_states
         player = self.__player_turn
-        games[player].post_new_score(score)
-
-        # Switch to the next player if the frame is complete.
+        game = games[player]
+        accepted = game.current_frame < self.__num_frames or not game.is_game_over()
+        record = self.pack_roll(player, score) if self.__roll_log is not None else None
+        before = None
+        if changes or self.is_recording():
+            start = max(1, game.current_frame - 2) ## Frames awaiting bonus balls may change.
+            before = self.copy_frames(player, start)
+        try:
+            if self.__trusted:
+                games[player].post_trusted_score(score)
+            else:
+                games[player].post_new_score(score)
+        finally:
+            self.clear_cache(player)
+            if self.__lock is not None:
+                self.settle_game(player)
+
+        # Record the score, then switch to the next player if the frame is complete.
+        if before is None:
+            self.__version += 1
+        else:
+            frame_changes = self.record_changes({player: (start, before)})
+        if accepted and self.__turns is not None:
+            self.__turns.append(player)
+        if record is not None:
+            self.__roll_log.append_record(record)
         i = games[player].current_frame
         if games[player].is_frame_complete(i):
             self.__player_turn = (player + 1) % self.NUM_PLAYERS
+        if self.__leaderboard is not None:
+            self.__leaderboard.update_score(self, player + 1)
+        return frame_changes if changes else None
+
+
+    @write_locked
+    def post_new_scores(self, scores, changes=False):
+        """Add a sequence of ball scores, switching players as frames complete, then update scores.
+
+        Every score is checked to be an integer in bounds before any is added unless the
+        controller is trusted, so no engine is left holding part of an invalid score. Each
+        player's frame scores and running totals are updated once after the whole sequence is
+        added. If a score cannot be added to its frame, the scores before it are kept and
+        scored before the error is raised. The whole sequence is one update of the version.
+
+        Args:
+            scores: Iterable of integers representing the number of pins knocked down.
+            changes: Boolean value indicating whether to return the frame fields changed.
+
+        Raises:
+            ValueError if a score is not an integer between 0 and the number of pins.
+            ValueError if a frame score is greater than the number of pins.
+
+        Returns:
+            List of changes like those from <get_changes> if changes is True, or None.
+        """
+        games = self.__game_states
+        scores = list(scores) if self.__trusted else \
+            check_bounds(scores, 0, games[0].NUM_PINS, integer=True)
+
+        # Remember the earliest frame that may change for each player.
+        starts = [max(0, game.current_frame - 3) for game in games]
+        touched = set()
+        frames = None
+        if changes or self.is_recording():
+            frames = {player: (start + 1, self.copy_frames(player, start + 1))
+                for player, start in enumerate(starts[:self.NUM_PLAYERS])}
+        frame_changes = []
+
+        roll_log = self.__roll_log
+        turns = self.__turns
+        num_frames = self.__num_frames
+
+        try:
+            for score in scores:
+                player = self.__player_turn
+                game = games[player]
+                accepted = game.current_frame < num_frames or not game.is_game_over()
+                record = self.pack_roll(player, score) if roll_log is not None else None
+                game.add_ball_score(score)
+                touched.add(player)
+                if accepted and turns is not None:
+                    turns.append(player)
+
+                # Record the score, then switch to the next player if the frame is complete.
+                if record is not None:
+                    roll_log.append_record(record)
+                i = game.current_frame
+                if game.is_frame_complete(i):
+                    self.__player_turn = (player + 1) % self.NUM_PLAYERS
+        finally:
+            for player in touched:
+                games[player].calculate_frame_scores(starts[player])
+                games[player].calculate_running_total(starts[player])
+                self.clear_cache(player)
+                if self.__lock is not None:
+                    self.settle_game(player)
+            if touched and frames is None:
+                self.__version += 1
+            elif touched:
+                frame_changes = self.record_changes({player: frames[player]
+                    for player in sorted(touched)})
+            if self.__leaderboard is not None:
+                for player in touched:
+                    self.__leaderboard.update_score(self, player + 1)
+        return frame_changes if changes else None
+
+
+    @classmethod
+    def restore(cls, data, engine=BowlingGame, trusted=False, roll_log=None, thread_safe=False,
+        change_log_size=0):
+        """Create a controller from a snapshot built by <snapshot>.
+
+        Each player's game is restored with the engine's <restore> function, so scores are
+        recalculated the first time they are read.
+
+        Args:
+            data: Bytes-like object containing a controller snapshot.
+            engine: Class used to restore each player's game, such as <CompactBowlingGame>.
+            trusted: Boolean value indicating whether posted ball scores come from a trusted
+                source, such as lane hardware, and can skip checking their bounds.
+            roll_log: <RollLog> object that records every posted ball score, or None.
+            thread_safe: Boolean value indicating whether to lock the controller so that
+                threads may read it while another thread posts ball scores.
+            change_log_size: Integer representing the number of frame changes kept for
+                <get_changes>, or 0 to keep none. The version starts again at 0.
+
+        Raises:
+            ValueError if the snapshot is not valid.
+
+        Returns:
+            <BowlingController> object holding the restored games.
+        """
+        data = memoryview(data)
+        header = cls.SNAPSHOT_HEADER
+        if len(data) < header.size:
+            raise ValueError('The snapshot is too short!')
+
+        version, num_players, num_pins, num_frames, player_turn, lane, game = \
+            header.unpack_from(data)
+        if version != cls.SNAPSHOT_VERSION:
+            raise ValueError('The snapshot version {version} is not supported!' \
+                .format(version=repr(version)))
+        if num_players < 1 or player_turn >= num_players:
+            raise ValueError('The snapshot does not contain a valid player count!')
+
+        # Restore each player's game from its length-prefixed snapshot.
+        games = []
+        at = header.size
+        for p in range(num_players):
+            if at + cls.SNAPSHOT_LENGTH.size > len(data):
+                raise ValueError('The snapshot is too short!')
+            size, = cls.SNAPSHOT_LENGTH.unpack_from(data, at)
+            at += cls.SNAPSHOT_LENGTH.size
+            games.append(engine.restore(data[at:at + size]))
+            at += size
+
+        if at != len(data):
+            raise ValueError('The snapshot is too long!')
+
+        controller = cls(num_players, num_pins, num_frames, games, engine=engine,
+            trusted=trusted, roll_log=roll_log, lane=lane, game=game, thread_safe=thread_safe,
+            change_log_size=change_log_size)
+        controller.__player_turn = player_turn
+        return controller
+
+
+    @read_locked
+    def snapshot(self):
+        """Returns the game configuration and every player's ball scores in a compact byte string.
+
+        A two player, 10-frame game fits in at most 75 bytes. Cached reads, the roll log, and
+        the trusted setting are not stored.
+
+        Raises:
+            ValueError if the lane, game, or number of players, pins, or frames does not fit in
+                the snapshot header.
+
+        Returns:
+            Bytes object to pass to <restore>.
+        """
+        try:
+            header = self.SNAPSHOT_HEADER.pack(self.SNAPSHOT_VERSION, self.NUM_PLAYERS,
+                self.__num_pins, self.__num_frames, self.__player_turn, self.__lane or 0,
+                self.__game or 0)
+        except struct.error:
+            raise ValueError('The lane and game should be between 0 and {key}, and the number '
+                'of players, pins, and frames less than {count}!'.format(key=repr(2**32 - 1),
+                count=repr(2**16)))
+        parts = [header]
+        for game in self.__game_states[:self.NUM_PLAYERS]:
+            data = game.snapshot()
+            parts.append(self.SNAPSHOT_LENGTH.pack(len(data)))
+            parts.append(data)
+        return b''.join(parts)
+
+
+    @write_locked
+    def undo_last_roll(self):
+        """Remove the last ball score posted, update that player's scores, and give them the turn.
+
+        Balls posted after a player's game is over were ignored, so they are not undone. The
+        removal is recorded in the roll log, if any.
+
+        Raises:
+            ValueError if the engine does not support corrections.
+            ValueError if there is no ball score to undo.
+
+        Returns:
+            Tuple containing the player (one-indexed) and the number of pins knocked down by
+            the removed ball.
+        """
+        turns = self.get_turns()
+        if not turns:
+            raise ValueError('There is no ball score to undo!')
+
+        player = turns[-1]
+        game = self.get_correctable_game(player)
+        roll_log = self.__roll_log
+        record = None
+        if roll_log is not None:
+            record = roll_log.pack(self.__lane, self.__game, player + 1, game.current_frame,
+                game.get_rolls()[-1], self.NUM_PLAYERS, kind=roll_log.UNDO)
+        start = max(1, game.current_frame - 2)
+        before = self.copy_frames(player, start) if self.is_recording() else None
+        try:
+            pins = game.undo_last_roll()
+        finally:
+            self.clear_cache(player)
+            if self.__lock is not None:
+                self.settle_game(player)
+        if record is not None:
+            roll_log.append_record(record)
+        turns.pop()
+        self.__player_turn = player
+
+        if before is None:
+            self.__version += 1
+        else:
+            self.record_changes({player: (start, before)})
+        if self.__leaderboard is not None:
+            self.__leaderboard.update_score(self, player + 1)
+        return player + 1, pins
 
 
 if __name__ == '__main__':
@@ -4,42 +4,283 @@ Provides a low-level class used to manage bowling game state. Do not use this di
 managing a bowling scoring service. Instead, use the <bowling_controller.py> module.
 """
 
-import copy
-from .helpers import read_only, restrict_bounds
+from collections.abc import Mapping
+from copy import deepcopy
+from .helpers import FrameView, check_bounds, pack_snapshot, read_only, restrict_bounds, \
+    unpack_snapshot
+from .instrumentation import Instrumented
 
 
-class BowlingGame(object):
+class Frame(Mapping):
+    """Record holding the data that describes one frame.
+
+    A frame reads like a dictionary object that only holds the keys whose value is not None,
+    so it compares equal to the frame dictionary objects returned by <BowlingGame>. It stores
+    its data in slots rather than a dictionary to save memory and attribute lookups. Change a
+    frame through its attributes or <update>.
+
+    Example:
+        frame = Frame(ball_1_score=4, ball_2_score=6, is_spare=True, is_strike=False)
+        frame['ball_1_score'] ## 4
+        frame.get('frame_score') ## None
+    """
+
+    KEYS = ('ball_1_score', 'ball_2_score', 'is_spare', 'is_strike', 'frame_score',
+        'running_total', 'next_frame')
+
+    __slots__ = KEYS
+
+
+    def __init__(self, ball_1_score=None, ball_2_score=None, is_spare=None, is_strike=None,
+        frame_score=None, running_total=None, next_frame=None):
+        """Initialize the frame. A value of None leaves its key out of the frame."""
+        self.ball_1_score = ball_1_score
+        self.ball_2_score = ball_2_score
+        self.is_spare = is_spare
+        self.is_strike = is_strike
+        self.frame_score = frame_score
+        self.running_total = running_total
+        self.next_frame = next_frame
+
+
+    def __getitem__(self, key):
+        """Get a value that is not None."""
+        if key in Frame.KEYS:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        raise KeyError(key)
+
+
+    def __iter__(self):
+        """Iterate over the keys whose value is not None."""
+        return (key for key in Frame.KEYS if getattr(self, key) is not None)
+
+
+    def __len__(self):
+        """Count the keys whose value is not None."""
+        return sum(1 for key in Frame.KEYS if getattr(self, key) is not None)
+
+
+    def __repr__(self):
+        """Show the frame data without following links."""
+        return 'Frame({data})'.format(data=repr(self.to_dict()))
+
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a frame from a frame dictionary object.
+
+        Args:
+            data: Dictionary object containing frame data.
+
+        Raises:
+            ValueError if the dictionary has a key that is not a frame key.
+
+        Returns:
+            <Frame> object holding the same data.
+        """
+        for key in data:
+            if key not in cls.KEYS:
+                raise ValueError('The frame key {key} is not supported!'.format(key=repr(key)))
+        return cls(**data)
+
+
+    def copy(self):
+        """Returns a full, recursive copy of the frame as dictionary objects that may be changed."""
+        return copy_frames([self])[0]
+
+
+    def to_dict(self):
+        """Returns a dictionary object holding the frame data without the next frame link."""
+        # Frames are read far more often than they change, so test each slot directly.
+        data = {}
+        value = self.ball_1_score
+        if value is not None: data['ball_1_score'] = value
+        value = self.ball_2_score
+        if value is not None: data['ball_2_score'] = value
+        value = self.is_spare
+        if value is not None: data['is_spare'] = value
+        value = self.is_strike
+        if value is not None: data['is_strike'] = value
+        value = self.frame_score
+        if value is not None: data['frame_score'] = value
+        value = self.running_total
+        if value is not None: data['running_total'] = value
+        return data
+
+
+    def update(self, **data):
+        """Set frame data from keyword arguments the same way a dictionary object would.
+
+        Raises:
+            ValueError if an argument is not a frame key.
+        """
+        for key, value in data.items():
+            if key not in Frame.KEYS:
+                raise ValueError('The frame key {key} is not supported!'.format(key=repr(key)))
+            setattr(self, key, value)
+
+
+EMPTY_FRAME = Frame() ## Stands in for a missing frame. Never change it.
+
+
+def copy_frames(frames):
+    """Copy a list of linked frames into linked frame dictionary objects.
+
+    Args:
+        frames: List of <Frame> objects.
+
+    Returns:
+        List of dictionary objects linked to each other the same way the frames are.
+    """
+    copies = [frame.to_dict() for frame in frames]
+    index = {id(frame): n for n, frame in enumerate(frames)}
+
+    for frame, frame_copy in zip(frames, copies):
+        link = frame.next_frame
+        if link is None:
+            continue
+        elif id(link) in index:
+            frame_copy['next_frame'] = copies[index[id(link)]]
+        elif isinstance(link, Frame):
+            frame_copy['next_frame'] = link.copy()
+        else:
+            frame_copy['next_frame'] = deepcopy(link)
+
+    return copies
+
+
+def get_frame_rolls(frames):
+    """List the ball scores rolled in a sequence of frames.
+
+    Args:
+        frames: Iterable of <Frame> objects.
+
+    Returns:
+        List of integers representing the number of pins knocked down by each ball.
+    """
+    # A strike records a second ball score of zero that was never rolled.
+    rolls = []
+    for frame in frames:
+        rolls.append(frame.ball_1_score)
+        if frame.ball_2_score is not None and not frame.is_strike:
+            rolls.append(frame.ball_2_score)
+    return rolls
+
+
+def get_max_score(rolls, num_pins, num_frames):
+    """Score a game as if every ball still to be rolled knocks down all the pins left standing.
+
+    Frames that start after the last ball score each take the maximum of three strikes, so this
+    takes time in proportion to the number of ball scores rather than frames.
+
+    Args:
+        rolls: List of integers representing the ball scores from the start of a frame onward.
+        num_pins: Integer representing the number of pins set up in each frame.
+        num_frames: Integer representing the number of frames to score from the first ball.
+
+    Returns:
+        Integer representing the highest total score those frames can still reach.
+    """
+    def ball(i, standing):
+        return rolls[i] if i < len(rolls) else standing
+
+    total = 0
+    i = 0
+    for n in range(num_frames):
+        if i >= len(rolls):
+            return total + 3 * num_pins * (num_frames - n)
+
+        ball_1 = rolls[i]
+        if ball_1 == num_pins:
+            ball_2 = ball(i + 1, num_pins)
+            ball_3 = ball(i + 2, num_pins if ball_2 == num_pins else num_pins - ball_2)
+            total += ball_1 + ball_2 + ball_3
+            i += 1
+        else:
+            ball_2 = ball(i + 1, num_pins - ball_1)
+            ball_3 = ball(i + 2, num_pins) if ball_1 + ball_2 == num_pins else 0
+            total += ball_1 + ball_2 + ball_3
+            i += 2
+    return total
+
+
+def to_frames(game_state):
+    """Replace frame dictionary objects in a game state with linked <Frame> objects.
+
+    Args:
+        game_state: List of frame dictionary or <Frame> objects, changed in place.
+
+    Raises:
+        ValueError if a dictionary has a key that is not a frame key.
+    """
+    frames = {}
+    for n, frame in enumerate(game_state):
+        if isinstance(frame, dict):
+            frames[id(frame)] = game_state[n] = Frame.from_dict(frame)
+
+    # Point links at the new frames rather than the dictionary objects they replaced.
+    for frame in game_state:
+        link = frame.next_frame
+        if isinstance(link, dict):
+            frame.next_frame = frames.get(id(link)) or Frame.from_dict(link)
+
+
+class BowlingGame(Instrumented):
     """Manage bowling game scores and state.
 
-    The game state consists of a linked list implemented using dictionary objects all enclosed
+    The game state consists of a linked list implemented using <Frame> objects all enclosed
     within an outer list. This structure has two advantages: (1) Retrieve data from any desired
     frame in O(1) time, and (2) Use linked objects for extra clarity when calculating the
-    forward score for special game outcomes including spare balls and strike balls.
+    forward score for special game outcomes including spare balls and strike balls. Public
+    functions return frame dictionary objects or read-only views rather than the frames.
 
     Example:
         state = [
-            {'ball_1_score': 4, 'ball_2_score': 6, 'is_spare': True, 'is_strike': False,
-                'next_frame': <object reference>, 'frame_score': 20, 'running_total': 20},
-            {'ball_1_score': 10, 'ball_2_score': 0, 'is_spare': False, 'is_strike': True,
-                'next_frame': <object reference>, 'frame_score': 13, 'running_total': 33},
-            {'ball_1_score': 1, 'ball_2_score': 2, 'is_spare': False, 'is_strike': False,
-                'next_frame': <object reference>, 'frame_score': 3, 'running_total': 36},
-            {'ball_1_score': 2, 'is_spare': False, 'is_strike': False, 'running_total': 36}
+            Frame(ball_1_score=4, ball_2_score=6, is_spare=True, is_strike=False,
+                next_frame=<object reference>, frame_score=20, running_total=20),
+            Frame(ball_1_score=10, ball_2_score=0, is_spare=False, is_strike=True,
+                next_frame=<object reference>, frame_score=13, running_total=33),
+            Frame(ball_1_score=1, ball_2_score=2, is_spare=False, is_strike=False,
+                next_frame=<object reference>, frame_score=3, running_total=36),
+            Frame(ball_1_score=2, is_spare=False, is_strike=False, running_total=36)
         ]
     """
 
+    INSTRUMENTED = ('add_ball_score', 'amend_roll', 'calculate_frame_scores',
+        'calculate_running_total', 'get_frame_data', 'get_game_state', 'get_max_score',
+        'is_frame_complete', 'is_game_over', 'post_new_score', 'post_new_scores',
+        'post_trusted_score', 'undo_last_roll')
 
-    def __init__(self, num_pins=10, num_frames=10, game_state=[]):
+
+    def __init__(self, num_pins=10, num_frames=10, game_state=[], lazy=False):
         """Configure the bowling game.
 
+        In lazy mode, posting a ball score only records the ball and marks the frames whose
+        scores may change. Frame scores and running totals are calculated in one pass the next
+        time <get_frame_data> or <get_game_state> is called, so posting many ball scores between
+        reads costs little. Views returned by <get_game_state> show the scores as of the last
+        read until it is called again.
+
         Args:
             num_pins: Integer representing the number of pins set up in each frame.
             num_frames: Integer representing the number of frames in this game.
-            game_state: List that stores frame dictionary objects as the game progresses.
+            game_state: List that stores <Frame> objects as the game progresses. Frame
+                dictionary objects already in the list are replaced with <Frame> objects.
+            lazy: Boolean value indicating whether to calculate scores when they are read
+                rather than when each ball score is posted.
+
+        Raises:
+            ValueError if a frame dictionary object has a key that is not a frame key.
         """
         self.__num_pins = num_pins if num_pins >= 1 else 1
         self.__num_frames = num_frames if num_frames >= 1 else 1
+        to_frames(game_state)
         self.__game_state = game_state
+        self.__pending = None ## Ball scores from a snapshot that have not been replayed yet.
+        self.__lazy = lazy
+        self.__dirty = None ## The first zero-indexed frame whose scores are out of date.
 
 
     @read_only
@@ -57,6 +298,7 @@ class BowlingGame(object):
     @read_only
     def current_frame(self):
         """Returns the current frame, always between 0 and <NUM_FRAMES>."""
+        if self.__pending is not None: self.load_pending()
         game_len = len(self.__game_state) ## Zero indicates the game has not started.
         return game_len if game_len <= self.NUM_FRAMES else self.NUM_FRAMES
 
@@ -76,8 +318,8 @@ class BowlingGame(object):
 
             game = self.__game_state
             game_len = len(game)
-            frame_prev = game[-2] if game_len >= 2 else {}
-            frame = game[-1] if game_len >= 1 else {}
+            frame_prev = game[-2] if game_len >= 2 else None
+            frame = game[-1] if game_len >= 1 else None
             frame_is_incomplete = self.is_frame_incomplete(frame)
 
             # This is the first ball in the game.
@@ -86,11 +328,11 @@ class BowlingGame(object):
 
             # This may be frame 1, so a previous frame may not exist.
             elif game_len == 1 and frame_is_incomplete:
-                game[0] = self.build_frame(frame.get('ball_1_score', 0), score)
+                game[0] = self.build_frame(frame.ball_1_score or 0, score)
 
             # This is frame 2+, so link the previous frame then append the new score.
             elif frame_is_incomplete:
-                frame = self.build_frame(frame.get('ball_1_score', 0), score)
+                frame = self.build_frame(frame.ball_1_score or 0, score)
                 self.link_frames(frame_prev, frame)
                 game[-1] = frame
 
@@ -102,7 +344,7 @@ class BowlingGame(object):
 
 
     def build_frame(self, ball_1_score=None, ball_2_score=None):
-        """Build a dictionary containing ball score data that describes this frame.
+        """Build a <Frame> object containing ball score data that describes this frame.
 
         Args:
             ball_1_score: Integer representing the number of pins knocked down on the first ball.
@@ -114,8 +356,8 @@ class BowlingGame(object):
             ValueError if there is a ball_2_score with no ball_1_score.
 
         Returns:
-            Dictionary containing the data that describes this frame. Example:
-            {'ball_1_score': 4, 'ball_2_score': 6, 'is_spare': True, 'is_strike': False}
+            <Frame> object containing the data that describes this frame. Example:
+            Frame(ball_1_score=4, ball_2_score=6, is_spare=True, is_strike=False)
         """
         # The score should represent an appropriate number of pins knocked down.
         if ball_1_score is not None and (ball_1_score < 0 or ball_1_score > self.NUM_PINS):
@@ -135,26 +377,27 @@ class BowlingGame(object):
         elif ball_1_score is None and ball_2_score is not None:
             raise ValueError('The ball 1 score should be given with the ball 2 score!')
 
-        # Construct the frame dictionary object.
-        frame = {}
-        is_strike = False
+        # Construct the frame object. A strike records a second ball score of zero.
+        is_strike = ball_1_score is not None and ball_1_score == self.NUM_PINS
         is_spare = False
 
-        if ball_1_score is not None:
-            is_strike = ball_1_score == self.NUM_PINS
-            if is_strike: frame.update(ball_2_score=0)
-            frame.update(ball_1_score=ball_1_score)
-
         if ball_2_score is not None:
             is_spare = ball_1_score < self.NUM_PINS and ball_1_score + ball_2_score == self.NUM_PINS
-            frame.update(ball_2_score=ball_2_score)
+        elif is_strike:
+            ball_2_score = 0
 
-        frame.update(is_spare=is_spare, is_strike=is_strike)
-        return frame
+        return Frame(ball_1_score, ball_2_score, is_spare, is_strike)
+
+
+    def calculate_dirty_scores(self):
+        """Calculate the frame scores and running totals marked out of date in lazy mode."""
+        start, self.__dirty = self.__dirty, None
+        self.calculate_frame_scores(start)
+        self.calculate_running_total(start)
 
 
     def calculate_forward_score(self, i):
-        """Mutate a frame object from the game state to add a calculated <frame_score> key-value.
+        """Mutate a frame object from the game state to set its calculated <frame_score>.
 
         Given a frame i, calculate the frame score starting up to two frames back in order to
         incorporate special scoring rules for spares and strikes. Adds the 'frame_score' key upon
@@ -173,75 +416,104 @@ class BowlingGame(object):
         n = 0 if n - 2 <= 0 else n - 2 ## Calculate the score for up to two frames behind.
 
         # Get frame data and completion status.
-        frame_start = self.__game_state[n] or {}
-        frame_next = frame_start.get('next_frame', {})
-        frame_last = frame_next.get('next_frame', {})
+        frame_start = self.__game_state[n]
+        frame_next = frame_start.next_frame
+        frame_next = EMPTY_FRAME if frame_next is None else frame_next
+        frame_last = frame_next.next_frame
+        frame_last = EMPTY_FRAME if frame_last is None else frame_last
 
         frame_is_complete = not self.is_frame_incomplete(frame_start)
         frame_next_is_complete = not self.is_frame_incomplete(frame_next)
         frame_last_is_complete = not self.is_frame_incomplete(frame_last)
 
         # Get scores and special balls.
-        ball_1_score = frame_start.get('ball_1_score', 0)
-        ball_2_score = frame_start.get('ball_2_score', 0)
-        ball_3_score = frame_next.get('ball_1_score', 0)
-        ball_4_score = frame_next.get('ball_2_score', 0)
-        ball_5_score = frame_last.get('ball_1_score', 0)
+        ball_1_score = frame_start.ball_1_score or 0
+        ball_2_score = frame_start.ball_2_score or 0
+        ball_3_score = frame_next.ball_1_score or 0
+        ball_4_score = frame_next.ball_2_score or 0
+        ball_5_score = frame_last.ball_1_score or 0
 
         score = ball_1_score + ball_2_score
         score_next = ball_3_score + ball_4_score
 
-        is_spare = frame_start.get('is_spare', False)
-        is_strike = frame_start.get('is_strike', False)
+        is_spare = frame_start.is_spare
+        is_strike = frame_start.is_strike
         open_frame = not (is_spare or is_strike)
 
         # Calculate frame score for one of these frames: i=1, i=2, i=i-2.
         if frame_is_complete:
             if open_frame:
-                frame_start.update(frame_score=score)
-            elif is_spare and frame_next:
-                frame_start.update(frame_score=score + ball_3_score)
+                frame_start.frame_score = score
+            elif is_spare and frame_next is not EMPTY_FRAME:
+                frame_start.frame_score = score + ball_3_score
             elif is_strike and frame_next_is_complete:
-                if frame_next.get('is_strike') and frame_last:
-                    frame_start.update(frame_score=score + score_next + ball_5_score)
-                elif not frame_next.get('is_strike'):
-                    frame_start.update(frame_score=score + score_next)
+                if frame_next.is_strike and frame_last is not EMPTY_FRAME:
+                    frame_start.frame_score = score + score_next + ball_5_score
+                elif not frame_next.is_strike:
+                    frame_start.frame_score = score + score_next
 
 
-    def calculate_frame_scores(self):
+    def calculate_frame_scores(self, start=None):
         """Mutate up to three frame objects in game state to add the <frame_score> key-value pair.
+
+        Args:
+            start: Integer representing the zero-indexed frame from which to calculate every
+                later frame score, or None to calculate the three latest frame scores.
         """
-        for i in range(3):
-            self.calculate_forward_score(self.current_frame + i)
+        if start is None:
+            start = max(0, self.current_frame - 3)
+
+        # Each forward score calculation updates the zero-indexed frame i - 3.
+        for i in range(start + 3, self.current_frame + 3):
+            self.calculate_forward_score(i)
 
 
-    def calculate_running_total(self):
+    def calculate_running_total(self, start=None):
         """Mutate up to three frame objects in game state to add the <running_total> key-value pair.
+
+        Args:
+            start: Integer representing the zero-indexed frame from which to calculate every
+                later running total, or None to calculate the three latest running totals.
         """
+        if self.__pending is not None: self.load_pending()
         game_len = len(self.__game_state)
-        start = max(0, game_len - 3)
+        start = max(0, game_len - 3) if start is None else start
 
+        game = self.__game_state
         for i in range(start, game_len):
-            frame_prev = self.__game_state[i-1] or {}
-            running_total_prev = frame_prev.get('running_total', 0)
+            running_total_prev = game[i-1].running_total if i > 0 else None
+            frame = game[i]
+            frame.running_total = (running_total_prev or 0) + (frame.frame_score or 0)
+
+
+    def get_frame_shape(self, n):
+        """Describe which balls belong to each frame from the zero-indexed frame n onward.
 
-            frame = self.__game_state[i]
-            frame_score = frame.get('frame_score', 0)
+        Args:
+            n: Integer representing the first zero-indexed frame to describe.
 
-            frame.update(running_total=running_total_prev + frame_score)
+        Returns:
+            List of tuples containing the number of balls rolled in each frame and whether the
+            frame is incomplete.
+        """
+        return [(len(get_frame_rolls([frame])), self.is_frame_incomplete(frame))
+            for frame in self.__game_state[n:]]
 
 
     def is_frame_incomplete(self, frame):
         """Determine whether this frame has a remaining ball.
 
         Args:
-            frame: Dictionary containing frame data with ball_1_score and ball_2_score keys.
+            frame: <Frame> object, or None for a frame that does not exist.
 
         Returns:
             Boolean value indicating whether the frame is incomplete.
         """
-        ball_1_score = frame.get('ball_1_score')
-        ball_2_score = frame.get('ball_2_score')
+        if frame is None:
+            return True
+
+        ball_1_score = frame.ball_1_score
+        ball_2_score = frame.ball_2_score
 
         # A ball has not been recorded and/or this is not a strike.
         if ball_1_score is None or (ball_1_score < self.NUM_PINS and ball_2_score is None):
@@ -254,22 +526,133 @@ class BowlingGame(object):
         """Mutate a frame object to add a link to another frame object.
 
         Args:
-            frame_1: Dictionary object representing the frame before frame_2.
-            frame_2: Dictionary object representing the frame after frame_1.
+            frame_1: <Frame> object representing the frame before frame_2.
+            frame_2: <Frame> object representing the frame after frame_1.
 
         Returns:
-            New frame_1 dictionary object linked to frame_2.
+            The frame_1 object linked to frame_2.
         """
         frame_1.update(next_frame=frame_2)
         return frame_1
 
 
+    def load_pending(self):
+        """Replay ball scores restored from a snapshot, then update all scores."""
+        rolls, self.__pending = self.__pending, None
+        self.post_new_scores(rolls, trusted=True)
+
+
+    def mark_dirty(self, start):
+        """Mark scores from a zero-indexed frame onward as out of date in lazy mode.
+
+        Args:
+            start: Integer representing the first zero-indexed frame whose scores may change.
+        """
+        dirty = self.__dirty
+        self.__dirty = start if dirty is None or start < dirty else dirty
+
+
+    def remove_frames(self, n):
+        """Remove frames from the zero-indexed frame n onward and clear the scores they affect.
+
+        The two frames before frame n may await bonus balls from it, so their frame scores
+        are cleared as well.
+
+        Args:
+            n: Integer representing the first zero-indexed frame to remove.
+
+        Returns:
+            List of integers representing the ball scores rolled in the removed frames.
+        """
+        game = self.__game_state
+        rolls = get_frame_rolls(game[n:])
+        del game[n:]
+        if n > 0:
+            game[n-1].next_frame = None
+        for frame in game[max(0, n - 2):]:
+            frame.frame_score = None
+        return rolls
+
+
+    def rescore(self, start):
+        """Update frame scores and running totals from a zero-indexed frame onward.
+
+        Args:
+            start: Integer representing the first zero-indexed frame whose scores may change.
+        """
+        if self.__lazy:
+            self.mark_dirty(start)
+        else:
+            self.calculate_frame_scores(start)
+            self.calculate_running_total(start)
+
+
     ########################
     ### PUBLIC FUNCTIONS ###
     ########################
 
+    def amend_roll(self, frame, ball, pins, keep_frames=False):
+        """Correct a ball score that was already posted, then update the scores it affects.
+
+        The corrected frame and every later frame are replayed, and the two frames before it,
+        which may await bonus balls from it, are rescored along with the later running totals.
+        Earlier frames are not touched, so the time a correction takes grows with the number of
+        frames after the corrected ball, and correcting the first frame replays the whole game.
+
+        Args:
+            frame: Integer representing the frame holding the ball, including bonus frames.
+            ball: Integer representing the first or second ball in the frame.
+            pins: Integer representing the corrected number of pins knocked down.
+            keep_frames: Boolean value indicating whether to reject a correction that moves
+                any later ball into a different frame, such as changing a strike to a spare.
+
+        Raises:
+            ValueError if there is no ball score for this frame and ball.
+            ValueError if the number of pins is not a number between 0 and <NUM_PINS>.
+            ValueError if the correction makes a frame score greater than <NUM_PINS>, leaves
+                balls after the end of the game, or moves a ball when keep_frames is True.
+                The game is not changed.
+        """
+        if self.__pending is not None: self.load_pending()
+        pins, = check_bounds([pins], 0, self.NUM_PINS)
+        game = self.__game_state
+        if not (type(frame) is int and 1 <= frame <= len(game)) or ball not in (1, 2) or \
+            (ball == 2 and (game[frame-1].ball_2_score is None or game[frame-1].is_strike)):
+            raise ValueError('There is no ball {ball} in frame {frame}!' \
+                .format(ball=repr(ball), frame=repr(frame)))
+
+        # Replay the corrected frame and every later frame.
+        n = frame - 1
+        shape = self.get_frame_shape(n)
+        rolls = self.remove_frames(n)
+        corrected = list(rolls)
+        corrected[ball - 1] = pins
+
+        error = None
+        try:
+            for score in corrected:
+                self.add_ball_score(score)
+        except ValueError as e:
+            error = e
+
+        if error is None and get_frame_rolls(game[n:]) != corrected:
+            error = ValueError('The correction would leave balls after the end of the game!')
+        if error is None and keep_frames and shape != self.get_frame_shape(n):
+            error = ValueError('The correction would move later balls into other frames!')
+
+        # Put the original balls back if the correction is not valid.
+        if error is not None:
+            self.remove_frames(n)
+            for score in rolls:
+                self.add_ball_score(score)
+
+        self.rescore(max(0, n - 2))
+        if error is not None:
+            raise error
+
+
     def get_frame_data(self, i):
-        """Get a shallow copy of basic frame data associated with the ith frame.
+        """Get a copy of basic frame data associated with the ith frame.
 
         Args:
             i: Integer representing the desired frame number.
@@ -278,25 +661,66 @@ class BowlingGame(object):
             Dictionary containing data from the ith frame without the next frame link.
         """
         # Return an empty dictionary for invalid frame requests.
-        if i <= 0 or i > self.current_frame:
+        if self.__pending is not None: self.load_pending()
+        game = self.__game_state
+        if i <= 0 or i > len(game) or i > self.__num_frames:
             return {}
+        if self.__dirty is not None: self.calculate_dirty_scores()
 
-        # Create a shallow copy of the frame to avoid recursively copying the linked objects.
-        frame = copy.copy(self.__game_state[i-1])
-        if 'next_frame' in frame:
-            del frame['next_frame']
+        # Copy the frame without its link to avoid recursively copying the linked objects.
+        return game[i-1].to_dict()
 
-        # Return the basic frame data.
-        return frame
 
+    def get_game_state(self, copy=False):
+        """Returns read-only views of the game state, or a full, recursive copy of it.
 
-    def get_game_state(self):
-        """Returns a full, recursive copy of the game state.
+        The views read through to the game state without copying it, so they show later ball
+        scores as they are posted.
+
+        Args:
+            copy: Boolean value indicating whether to return a copy that may be changed.
+
+        Returns:
+            List of <FrameView> objects, or of dictionary objects if copy is True, representing
+            the state of each frame.
+        """
+        if self.__pending is not None: self.load_pending()
+        if self.__dirty is not None: self.calculate_dirty_scores()
+        if copy:
+            return copy_frames(self.__game_state)
+        return [FrameView(frame) for frame in self.__game_state]
+
+
+    def get_max_score(self):
+        """Get the highest score this game can still reach if every later ball is a strike.
+
+        Frames more than two frames before the current frame already have their final scores,
+        so only the latest frames and the number of frames left are scored, in constant time.
+
+        Returns:
+            Integer representing the maximum possible score, which is the final score once the
+            game is over.
+        """
+        if self.__pending is not None: self.load_pending()
+        if self.__dirty is not None: self.calculate_dirty_scores()
+        game = self.__game_state
+
+        # Start from the running total of the last frame that can no longer change.
+        n = max(0, min(len(game), self.NUM_FRAMES) - 3)
+        total = game[n-1].running_total if n > 0 else 0
+        return total + get_max_score(get_frame_rolls(game[n:]), self.NUM_PINS,
+            self.NUM_FRAMES - n)
+
+
+    def get_rolls(self):
+        """Returns every ball score in the order it was rolled.
 
         Returns:
-            List of dictionary objects representing the state of each frame.
+            List of integers representing the number of pins knocked down by each ball.
         """
-        return copy.deepcopy(self.__game_state)
+        if self.__pending is not None:
+            return list(self.__pending)
+        return get_frame_rolls(self.__game_state)
 
 
     @restrict_bounds(1, lambda self: self.NUM_FRAMES)
@@ -309,7 +733,8 @@ class BowlingGame(object):
         Returns:
             Boolean value representing whether the frame has ended.
         """
-        return not self.is_frame_incomplete(self.get_frame_data(i))
+        frame = self.__game_state[i-1] if i <= self.current_frame else None
+        return not self.is_frame_incomplete(frame)
 
 
     def is_game_over(self):
@@ -318,12 +743,13 @@ class BowlingGame(object):
         Returns:
             Boolean value representing whether the game should continue.
         """
+        if self.__pending is not None: self.load_pending()
         game = self.__game_state
 
         if len(game) < self.NUM_FRAMES:
             return False ## The game is not in the last frame.
 
-        prev_frame = game[-2] if len(game) >= 2 else {}
+        prev_frame = game[-2] if len(game) >= 2 else EMPTY_FRAME
         frame = game[-1]
         frame_count = len(game)
 
@@ -332,24 +758,43 @@ class BowlingGame(object):
             return False ## The last frame is incomplete.
 
         # The last frame gets bonus ball(s).
-        elif frame_count == self.NUM_FRAMES and (frame.get('is_spare') or frame.get('is_strike')):
+        elif frame_count == self.NUM_FRAMES and (frame.is_spare or frame.is_strike):
             return False
 
         # There is another bonus ball.
         elif frame_count == self.NUM_FRAMES + 1 and \
-            ((prev_frame.get('is_spare') and frame.get('ball_1_score') is None) or \
-            (prev_frame.get('is_strike') and frame.get('ball_2_score') is None) or \
-            frame.get('is_strike')):
+            ((prev_frame.is_spare and frame.ball_1_score is None) or \
+            (prev_frame.is_strike and frame.ball_2_score is None) or \
+            frame.is_strike):
             return False
 
         # There is one final strike ball.
         elif frame_count == self.NUM_FRAMES + 2 and \
-            (prev_frame.get('is_strike') and frame.get('ball_1_score') is None):
+            (prev_frame.is_strike and frame.ball_1_score is None):
             return False
 
         return True
 
 
+    def post_trusted_score(self, score):
+        """Add a new ball score without checking its bounds, then update all scores.
+
+        Use this only for scores from a trusted source, such as lane hardware, that always
+        reports an integer between 0 and <NUM_PINS>. Any other score is undefined behavior.
+
+        Args:
+            score: Integer representing the number of pins knocked down between [0, NUM_PINS].
+        """
+        if self.__lazy:
+            self.mark_dirty(max(0, self.current_frame - 3))
+            self.add_ball_score(score)
+            return
+
+        self.add_ball_score(score)
+        self.calculate_frame_scores()
+        self.calculate_running_total()
+
+
     @restrict_bounds(0, lambda self: self.NUM_PINS)
     def post_new_score(self, score):
         """Add a new ball score, update frame scores, then update the running total scores.
@@ -357,10 +802,103 @@ class BowlingGame(object):
         Args:
             score: Integer representing the number of pins knocked down between [0, NUM_PINS].
         """
+        if self.__lazy:
+            self.mark_dirty(max(0, self.current_frame - 3))
+            self.add_ball_score(score)
+            return
+
         self.add_ball_score(score)
         self.calculate_frame_scores()
         self.calculate_running_total()
 
 
+    def post_new_scores(self, scores, trusted=False):
+        """Add a sequence of ball scores, then update frame scores and running totals once.
+
+        Every score is checked before any is added. If a score cannot be added to its frame,
+        the scores before it are kept and scored before the error is raised.
+
+        Args:
+            scores: Iterable of integers representing the number of pins knocked down.
+            trusted: Boolean value indicating whether to skip checking the score bounds.
+
+        Raises:
+            ValueError if a score is not a number between 0 and <NUM_PINS>.
+            ValueError if a frame score is greater than <NUM_PINS>.
+        """
+        scores = scores if trusted else check_bounds(scores, 0, self.NUM_PINS)
+        start = max(0, self.current_frame - 3) ## Earlier frames do not await bonus balls.
+
+        try:
+            for score in scores:
+                self.add_ball_score(score)
+        finally:
+            if self.__lazy:
+                self.mark_dirty(start)
+            else:
+                self.calculate_frame_scores(start)
+                self.calculate_running_total(start)
+
+
+    @classmethod
+    def restore(cls, data):
+        """Create a game from a snapshot built by <snapshot> on either game class.
+
+        Only the ball scores are restored at first. They are replayed and scored the first time
+        the game is read or a ball score is posted, so restoring many games is fast.
+
+        Args:
+            data: Bytes-like object containing a game snapshot.
+
+        Raises:
+            ValueError if the snapshot is not valid.
+
+        Returns:
+            <BowlingGame> object holding the restored game.
+        """
+        num_pins, num_frames, rolls = unpack_snapshot(data)
+        game = cls(num_pins, num_frames, [])
+        if rolls:
+            game.__pending = rolls
+        return game
+
+
+    def snapshot(self):
+        """Returns the game configuration and ball scores packed into a compact byte string.
+
+        Frame scores and running totals are not stored because <restore> recalculates them.
+
+        Returns:
+            Bytes object to pass to <restore> on either game class.
+        """
+        return pack_snapshot(self.NUM_PINS, self.NUM_FRAMES, self.get_rolls())
+
+
+    def undo_last_roll(self):
+        """Remove the last ball score, then update the scores it affected.
+
+        Only the last frame and the two frames before it are rescored.
+
+        Raises:
+            ValueError if no ball score has been posted.
+
+        Returns:
+            Integer representing the number of pins knocked down by the removed ball.
+        """
+        if self.__pending is not None: self.load_pending()
+        game = self.__game_state
+        if not game:
+            raise ValueError('There is no ball score to undo!')
+
+        # Remove the last frame, then put back its first ball if the frame had two.
+        n = len(game) - 1
+        rolls = self.remove_frames(n)
+        score = rolls.pop()
+        for ball in rolls:
+            self.add_ball_score(ball)
+        self.rescore(max(0, n - 2))
+        return score
+
+
 if __name__ == '__main__':
     pass
@@ -0,0 +1,452 @@
+"""compact_bowling_game.py
+
+Provides a low-level class used to manage bowling game state in a flat typed array. This class
+is a drop-in replacement for <BowlingGame> when many games must be held in memory at once. Do
+not use this directly for managing a bowling scoring service. Instead, use the
+<bowling_controller.py> module with the <engine> argument.
+"""
+
+from array import array
+from .helpers import FrameView, pack_snapshot, read_only, unpack_snapshot
+
+
+class CompactBowlingGame(object):
+    """Manage bowling game scores and state using a flat typed array.
+
+    The game state is a single array preallocated for the longest possible game rather than a
+    list of linked dictionary objects. It holds four fixed regions: every ball score in the
+    order it was rolled, the index of the first ball in each frame, each frame score, and each
+    running total. Frame dictionary objects are only built when a caller reads them, so the
+    public interface returns the same data as <BowlingGame>.
+
+    Example:
+        rolls         = [4, 6, 10, 1, 2, 2, ...]
+        frame_start   = [0, 2, 3, 5, ...]
+        frame_score   = [20, 13, 3, -1, ...] ## -1 marks a frame that is not scored.
+        running_total = [20, 33, 36, 36, ...]
+    """
+
+    __slots__ = ('__num_pins', '__num_frames', '__state', '__num_rolls', '__frame_count',
+        '__start_at', '__score_at', '__total_at', '__pending')
+
+    NO_SCORE = -1 ## Marks a frame score that cannot be calculated yet.
+
+
+    def __init__(self, num_pins=10, num_frames=10, rolls=None):
+        """Configure the bowling game.
+
+        Args:
+            num_pins: Integer representing the number of pins set up in each frame.
+            num_frames: Integer representing the number of frames in this game.
+            rolls: Iterable of ball scores used to replay a game in progress.
+        """
+        self.__num_pins = num_pins if num_pins >= 1 else 1
+        self.__num_frames = num_frames if num_frames >= 1 else 1
+        self.__num_rolls = 0
+        self.__frame_count = 0
+        self.__pending = None ## Ball scores from a snapshot that have not been replayed yet.
+
+        # A game has at most two balls per frame plus two bonus balls held in up to two bonus
+        # frames. Use 16-bit integers unless a perfect game would overflow them.
+        max_rolls = 2 * self.__num_frames + 2
+        max_frames = self.__num_frames + 2
+        typecode = 'h' if 3 * self.__num_pins * self.__num_frames < 2**15 else 'q'
+
+        self.__start_at = max_rolls
+        self.__score_at = max_rolls + max_frames
+        self.__total_at = max_rolls + 2 * max_frames
+        self.__state = array(typecode, [0]) * (max_rolls + 3 * max_frames)
+
+        for score in rolls or ():
+            self.post_new_score(score)
+
+
+    @read_only
+    def NUM_PINS(self):
+        """Returns the total number of frame pins in this bowling game."""
+        return self.__num_pins
+
+
+    @read_only
+    def NUM_FRAMES(self):
+        """Returns the total number of frames in this bowling game."""
+        return self.__num_frames
+
+
+    @read_only
+    def current_frame(self):
+        """Returns the current frame, always between 0 and <NUM_FRAMES>."""
+        if self.__pending is not None: self.load_pending()
+        game_len = self.__frame_count ## Zero indicates the game has not started.
+        return game_len if game_len <= self.__num_frames else self.__num_frames
+
+
+    ##########################
+    ### INTERNAL FUNCTIONS ###
+    ##########################
+
+    def add_ball_score(self, score):
+        """Add a new ball score to the game and open a new frame when appropriate.
+
+        Args:
+            score: Integer representing the number of pins knocked down.
+
+        Raises:
+            ValueError if the total frame score is greater than <NUM_PINS>.
+            TypeError or OverflowError if the score cannot be stored in the array, in which
+                case the game is unchanged.
+        """
+        # Only proceed if this game is still in progress.
+        if self.is_game_over():
+            return
+
+        state = self.__state
+        game_len = self.__frame_count
+
+        # Complete the last frame if it is still waiting on a second ball.
+        completes_frame = game_len and self.is_frame_incomplete(game_len - 1)
+        if completes_frame:
+            ball_1_score = state[state[self.__start_at + game_len - 1]]
+            if ball_1_score + score > self.__num_pins:
+                raise ValueError('The total frame score should be no more than {num} pins!' \
+                    .format(num=repr(self.__num_pins)))
+
+        # Store the ball before any frame bookkeeping, so a score the array cannot hold leaves
+        # the game unchanged.
+        state[self.__num_rolls] = score
+
+        # Otherwise this ball starts the next frame.
+        if not completes_frame:
+            state[self.__start_at + game_len] = self.__num_rolls
+            state[self.__score_at + game_len] = self.NO_SCORE
+            self.__frame_count = game_len + 1
+
+        self.__num_rolls += 1
+
+
+    def calculate_frame_scores(self, start=None):
+        """Update the frame scores for up to three of the latest frames.
+
+        Args:
+            start: Integer representing the zero-indexed frame from which to calculate every
+                later frame score, or None to calculate the three latest frame scores.
+        """
+        state = self.__state
+        start_at = self.__start_at
+        score_at = self.__score_at
+        num_pins = self.__num_pins
+        num_rolls = self.__num_rolls
+        end = self.current_frame
+
+        for n in range(max(0, end - 3) if start is None else start, end):
+            if state[score_at + n] != self.NO_SCORE or self.is_frame_incomplete(n):
+                continue
+
+            # Strike and spare bonus balls are the next one or two balls in the roll sequence
+            # because a strike's second ball is recorded as zero rather than rolled.
+            i = state[start_at + n]
+            ball_1_score = state[i]
+            if ball_1_score == num_pins:
+                score, bonus_at, needed = num_pins, i + 1, 2
+            else:
+                score = ball_1_score + state[i + 1]
+                bonus_at, needed = i + 2, 1 if score == num_pins else 0
+
+            if bonus_at + needed <= num_rolls:
+                state[score_at + n] = score + sum(state[bonus_at:bonus_at + needed])
+
+
+    def calculate_running_total(self, start=None):
+        """Update the running totals for up to three of the latest frames.
+
+        Args:
+            start: Integer representing the zero-indexed frame from which to calculate every
+                later running total, or None to calculate the three latest running totals.
+        """
+        if self.__pending is not None: self.load_pending()
+        state = self.__state
+        score_at = self.__score_at
+        total_at = self.__total_at
+        game_len = self.__frame_count
+
+        for n in range(max(0, game_len - 3) if start is None else start, game_len):
+            running_total_prev = state[total_at + n - 1] if n > 0 else 0
+            frame_score = state[score_at + n]
+            if frame_score == self.NO_SCORE:
+                frame_score = 0
+            state[total_at + n] = running_total_prev + frame_score
+
+
+    def check_score(self, score):
+        """Check that a ball score is an integer between 0 and <NUM_PINS>.
+
+        Args:
+            score: Unknown argument to test.
+
+        Raises:
+            ValueError if the score is not an integer between 0 and <NUM_PINS>.
+        """
+        if not isinstance(score, int) or score < 0 or score > self.__num_pins:
+            raise ValueError('The argument should be a number between {left} and {right}!' \
+                .format(left=repr(0), right=repr(self.__num_pins)))
+
+
+    def get_ball_scores(self, n):
+        """Get the ball scores recorded in the zero-indexed frame n.
+
+        Args:
+            n: Integer representing the zero-indexed frame.
+
+        Returns:
+            Array slice containing one or two ball scores.
+        """
+        state = self.__state
+        start_at = self.__start_at
+        end = state[start_at + n + 1] if n + 1 < self.__frame_count else self.__num_rolls
+        return state[state[start_at + n]:end]
+
+
+    def is_frame_incomplete(self, n):
+        """Determine whether the zero-indexed frame n has a remaining ball.
+
+        Args:
+            n: Integer representing the zero-indexed frame.
+
+        Returns:
+            Boolean value indicating whether the frame is incomplete.
+        """
+        if n < 0 or n >= self.__frame_count:
+            return True
+
+        balls = self.get_ball_scores(n)
+        return len(balls) < 2 and balls[0] < self.__num_pins
+
+
+    def load_pending(self):
+        """Replay ball scores restored from a snapshot, then update all scores."""
+        rolls, self.__pending = self.__pending, None
+        self.post_new_scores(rolls, trusted=True)
+
+
+    def build_frame(self, n):
+        """Build a dictionary containing the data that describes the zero-indexed frame n.
+
+        Args:
+            n: Integer representing the zero-indexed frame.
+
+        Returns:
+            Dictionary containing the same keys as a <BowlingGame> frame without a link.
+        """
+        balls = self.get_ball_scores(n)
+        ball_1_score = balls[0]
+        is_strike = ball_1_score == self.__num_pins
+        is_spare = False
+
+        frame = {'ball_1_score': ball_1_score}
+        if is_strike:
+            frame['ball_2_score'] = 0
+        elif len(balls) > 1:
+            frame['ball_2_score'] = balls[1]
+            is_spare = ball_1_score + balls[1] == self.__num_pins
+
+        frame['is_spare'] = is_spare
+        frame['is_strike'] = is_strike
+
+        frame_score = self.__state[self.__score_at + n]
+        if frame_score != self.NO_SCORE:
+            frame['frame_score'] = frame_score
+        frame['running_total'] = self.__state[self.__total_at + n]
+
+        return frame
+
+
+    ########################
+    ### PUBLIC FUNCTIONS ###
+    ########################
+
+    def get_frame_data(self, i):
+        """Get basic frame data associated with the ith frame.
+
+        Args:
+            i: Integer representing the desired frame number.
+
+        Returns:
+            Dictionary containing data from the ith frame without the next frame link.
+        """
+        # Return an empty dictionary for invalid frame requests.
+        if i <= 0 or i > self.current_frame:
+            return {}
+
+        return self.build_frame(i-1)
+
+
+    def get_game_state(self, copy=False):
+        """Returns read-only views of the game state, or a copy of it, built from the score array.
+
+        Args:
+            copy: Boolean value indicating whether to return a copy that may be changed.
+
+        Returns:
+            List of <FrameView> objects, or of dictionary objects if copy is True, representing
+            the state of each frame.
+        """
+        if self.__pending is not None: self.load_pending()
+        state = [self.build_frame(n) for n in range(self.__frame_count)]
+        for n in range(len(state) - 1):
+            state[n]['next_frame'] = state[n+1]
+        return state if copy else [FrameView(frame) for frame in state]
+
+
+    def get_rolls(self):
+        """Returns every ball score in the order it was rolled.
+
+        Returns:
+            List of integers representing the number of pins knocked down by each ball.
+        """
+        if self.__pending is not None:
+            return list(self.__pending)
+        return self.__state[:self.__num_rolls].tolist()
+
+
+    def is_frame_complete(self, i):
+        """Determines whether the specified frame has ended.
+
+        Args:
+            i: Integer representing the desired frame.
+
+        Raises:
+            ValueError if the frame is not a number between 1 and <NUM_FRAMES>.
+
+        Returns:
+            Boolean value representing whether the frame has ended.
+        """
+        if not isinstance(i, int) or i < 1 or i > self.__num_frames:
+            raise ValueError('The argument should be a number between {left} and {right}!' \
+                .format(left=repr(1), right=repr(self.__num_frames)))
+
+        if self.__pending is not None: self.load_pending()
+        return not self.is_frame_incomplete(i-1)
+
+
+    def is_game_over(self):
+        """Determine whether the game is over.
+
+        Returns:
+            Boolean value representing whether the game should continue.
+        """
+        if self.__pending is not None: self.load_pending()
+        num_frames = self.__num_frames
+        num_pins = self.__num_pins
+        frame_count = self.__frame_count
+
+        if frame_count < num_frames:
+            return False ## The game is not in the last frame.
+
+        frame = self.get_ball_scores(frame_count - 1)
+        is_strike = frame[0] == num_pins
+
+        # The last frame is incomplete or gets bonus ball(s).
+        if frame_count == num_frames:
+            is_spare = len(frame) > 1 and frame[0] + frame[1] == num_pins
+            return not (len(frame) < 2 and not is_strike or is_spare or is_strike)
+
+        # There is another bonus ball.
+        elif frame_count == num_frames + 1:
+            prev_is_strike = self.get_ball_scores(frame_count - 2)[0] == num_pins
+            return not (prev_is_strike and len(frame) < 2 or is_strike)
+
+        return True
+
+
+    def post_trusted_score(self, score):
+        """Add a new ball score without checking its bounds, then update all scores.
+
+        Use this only for scores from a trusted source, such as lane hardware, that always
+        reports an integer between 0 and <NUM_PINS>. Any other score is undefined behavior,
+        except that a score the array cannot hold raises an error and leaves the game unchanged.
+
+        Args:
+            score: Integer representing the number of pins knocked down between [0, NUM_PINS].
+        """
+        self.add_ball_score(score)
+        self.calculate_frame_scores()
+        self.calculate_running_total()
+
+
+    def post_new_score(self, score):
+        """Add a new ball score, update frame scores, then update the running total scores.
+
+        Args:
+            score: Integer representing the number of pins knocked down between [0, NUM_PINS].
+
+        Raises:
+            ValueError if the score is not a number between 0 and <NUM_PINS>.
+        """
+        self.check_score(score)
+        self.add_ball_score(score)
+        self.calculate_frame_scores()
+        self.calculate_running_total()
+
+
+    def post_new_scores(self, scores, trusted=False):
+        """Add a sequence of ball scores, then update frame scores and running totals once.
+
+        Every score is checked before any is added. If a score cannot be added to its frame,
+        the scores before it are kept and scored before the error is raised.
+
+        Args:
+            scores: Iterable of integers representing the number of pins knocked down.
+            trusted: Boolean value indicating whether to skip checking the score bounds.
+
+        Raises:
+            ValueError if a score is not a number between 0 and <NUM_PINS>.
+            ValueError if a frame score is greater than <NUM_PINS>.
+        """
+        scores = list(scores)
+        if not trusted:
+            for score in scores:
+                self.check_score(score)
+        start = max(0, self.current_frame - 3) ## Earlier frames do not await bonus balls.
+
+        try:
+            for score in scores:
+                self.add_ball_score(score)
+        finally:
+            self.calculate_frame_scores(start)
+            self.calculate_running_total(start)
+
+
+    @classmethod
+    def restore(cls, data):
+        """Create a game from a snapshot built by <snapshot> on either game class.
+
+        Only the ball scores are restored at first. They are replayed and scored the first time
+        the game is read or a ball score is posted, so restoring many games is fast.
+
+        Args:
+            data: Bytes-like object containing a game snapshot.
+
+        Raises:
+            ValueError if the snapshot is not valid.
+
+        Returns:
+            <CompactBowlingGame> object holding the restored game.
+        """
+        num_pins, num_frames, rolls = unpack_snapshot(data)
+        game = cls(num_pins, num_frames)
+        if rolls:
+            game.__pending = rolls
+        return game
+
+
+    def snapshot(self):
+        """Returns the game configuration and ball scores packed into a compact byte string.
+
+        Returns:
+            Bytes object to pass to <restore> on either game class.
+        """
+        return pack_snapshot(self.__num_pins, self.__num_frames, self.get_rolls())
+
+
+if __name__ == '__main__':
+    pass
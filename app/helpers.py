@@ -3,6 +3,18 @@
 Provides general helper functions for use with other modules.
 """
 
+from array import array
+from collections.abc import Mapping
+from contextlib import contextmanager
+import copy
+import struct
+import sys
+import threading
+
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct('<BHH') ## Version, number of pins, number of frames.
+
 
 def read_only(fn):
     """Decorator used to make a class function read only.
@@ -26,6 +38,196 @@ def read_only(fn):
     return property(fget, fset)
 
 
+def read_locked(fn):
+    """Decorator used to mark a class function that holds the object's <lock> for reading.
+
+    The function itself is not wrapped, so objects without a lock call it directly. Call
+    <lock_methods> on an object with a lock to bind a locking wrapper for it.
+
+    Args:
+        fn: Class function that reads the object.
+
+    Returns:
+        The same function, marked for locking.
+    """
+    fn.lock_mode = 'read'
+    return fn
+
+
+def write_locked(fn):
+    """Decorator used to mark a class function that holds the object's <lock> for writing.
+
+    The function itself is not wrapped, so objects without a lock call it directly. Call
+    <lock_methods> on an object with a lock to bind a locking wrapper for it.
+
+    Args:
+        fn: Class function that changes the object.
+
+    Returns:
+        The same function, marked for locking.
+    """
+    fn.lock_mode = 'write'
+    return fn
+
+
+def lock_methods(obj, lock):
+    """Bind a wrapper on one object that holds a lock around each marked class function.
+
+    The wrappers are stored on the object itself and shadow its class functions, so objects of
+    the same class without a lock run the class functions with no locking overhead.
+
+    Args:
+        obj: Object whose functions were marked with <read_locked> or <write_locked>.
+        lock: <ReadWriteLock> object held while each function runs.
+    """
+    cls = type(obj)
+    for name in dir(cls):
+        fn = getattr(cls, name, None)
+        mode = getattr(fn, 'lock_mode', None)
+        if mode == 'read':
+            setattr(obj, name, wrap_locked(fn.__get__(obj), lock.acquire_read,
+                lock.release_read))
+        elif mode == 'write':
+            setattr(obj, name, wrap_locked(fn.__get__(obj), lock.acquire_write,
+                lock.release_write))
+
+
+def wrap_locked(fn, acquire, release):
+    """Wrap a function so a lock is held while it runs.
+
+    Args:
+        fn: Function to wrap.
+        acquire: Function that holds the lock, returning False if this thread already held it.
+        release: Function that stops holding the lock.
+
+    Returns:
+        Decorated function.
+    """
+
+    def wrapped_fn(*args, **kwargs):
+        if not acquire():
+            return fn(*args, **kwargs)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            release()
+
+    wrapped_fn.__wrapped__ = fn
+    return wrapped_fn
+
+
+def check_bounds(values, left_bound, right_bound, integer=False):
+    """Check that every value in a sequence is a number within the bounds.
+
+    Use this to validate a batch of arguments once rather than decorating a function that is
+    called once per value.
+
+    Args:
+        values: Iterable of values to test.
+        left_bound: Integer representing the left bound, inclusive.
+        right_bound: Integer representing the right bound, inclusive.
+        integer: Boolean value indicating whether every value must be an integer.
+
+    Raises:
+        ValueError when a value is outside the bounds, or is not an integer if integer is True.
+
+    Returns:
+        List containing the values in their original order.
+    """
+    values = list(values)
+    for value in values:
+        if not (type(value) is int or (not integer and is_number(value))) or \
+            value < left_bound or value > right_bound:
+            raise ValueError('The argument should be a{n} {kind} between {left} and {right}!' \
+                .format(n='n' if integer else '', kind='integer' if integer else 'number',
+                left=repr(left_bound), right=repr(right_bound)))
+    return values
+
+
+def is_number(maybe_number):
+    """Checks an unknown argument to see if it is a number (int, float, or complex).
+
+    Args:
+        maybe_number: Unknown argument to test.
+
+    Returns:
+        Boolean indicating whether the argument is a number or not.
+    """
+    try:
+        complex(maybe_number)
+    except ValueError:
+        return False
+    except TypeError:
+        return False
+
+    return True
+
+
+def pack_snapshot(num_pins, num_frames, rolls):
+    """Pack a game's configuration and ball scores into a compact byte string.
+
+    Each ball score takes one byte, or two bytes if a frame has more than 255 pins, so a
+    10-frame game fits in at most 26 bytes.
+
+    Args:
+        num_pins: Integer representing the number of pins set up in each frame.
+        num_frames: Integer representing the number of frames in the game.
+        rolls: Iterable of integers representing every ball score in the order it was rolled.
+
+    Raises:
+        ValueError if the number of pins or frames does not fit in the snapshot header.
+
+    Returns:
+        Bytes object to pass to <unpack_snapshot>.
+    """
+    try:
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_VERSION, num_pins, num_frames)
+    except struct.error:
+        raise ValueError('The number of pins and frames should be less than {num}!' \
+            .format(num=repr(2**16)))
+
+    rolls = array('B' if num_pins < 2**8 else 'H', rolls)
+    if rolls.itemsize > 1 and sys.byteorder == 'big':
+        rolls.byteswap()
+    return header + rolls.tobytes()
+
+
+def unpack_snapshot(data):
+    """Unpack a byte string built by <pack_snapshot>.
+
+    Args:
+        data: Bytes-like object containing a game snapshot.
+
+    Raises:
+        ValueError if the snapshot is not valid.
+
+    Returns:
+        Tuple containing the number of pins, the number of frames, and an array of ball scores.
+    """
+    data = memoryview(data)
+    if len(data) < SNAPSHOT_HEADER.size:
+        raise ValueError('The snapshot is too short!')
+
+    version, num_pins, num_frames = SNAPSHOT_HEADER.unpack_from(data)
+    if version != SNAPSHOT_VERSION:
+        raise ValueError('The snapshot version {version} is not supported!' \
+            .format(version=repr(version)))
+
+    rolls = array('B' if num_pins < 2**8 else 'H')
+    payload = data[SNAPSHOT_HEADER.size:]
+    if len(payload) % rolls.itemsize or len(payload) // rolls.itemsize > 2 * num_frames + 2:
+        raise ValueError('The snapshot does not contain a valid ball score sequence!')
+
+    rolls.frombytes(payload)
+    if rolls.itemsize > 1 and sys.byteorder == 'big':
+        rolls.byteswap()
+    if rolls and max(rolls) > num_pins:
+        raise ValueError('The ball scores should be between 0 and {num} pins!' \
+            .format(num=repr(num_pins)))
+
+    return num_pins, num_frames, rolls
+
+
 class restrict_bounds(object):
     """Restrict the numeric bounds of a function argument.
 
@@ -64,41 +266,62 @@ class restrict_bounds(object):
         # Keep a reference to the decorator object.
         that = self
 
+        # Resolve fixed bounds once. Bounds functions are called once per class object and the
+        # result is saved on that object under a key unique to this decorator.
+        is_fixed = not callable(self.left_bound) and not callable(self.right_bound)
+        fixed_bounds = (self.left_bound, self.right_bound)
+        bounds_key = '_restrict_bounds_{id}'.format(id=id(self))
+
         def wrapped_fn(*args, **kwargs):
 
             # Get the first or second arg, depending on whether this is a class function.
-            args = [*args]
-            arg_1 = arg = args[0] ## Maybe class object?
-            arg_2 = None
-            self = None
-
-            if len(args) > 1:
-                arg_2 = args[1]
+            arg = args[0] ## Maybe class object?
 
             # Check if the first argument is class object.
-            if hasattr(arg_1, '__dict__'):
-                self = arg_1
-                arg = arg_2
-
-            # Get the bounds; call the bounds functions if they exist.
-            left_bound = that.left_bound
-            if callable(left_bound):
-                left_bound = left_bound(self)
-
-            right_bound = that.right_bound
-            if callable(right_bound):
-                right_bound = right_bound(self)
-
-            # Check bounds.
-            if that.is_number(arg) and left_bound <= arg and right_bound >= arg:
+            if hasattr(arg, '__dict__'):
+                self = arg
+                arg = args[1] if len(args) > 1 else None
+                if is_fixed:
+                    left_bound, right_bound = fixed_bounds
+                else:
+                    bounds = self.__dict__.get(bounds_key)
+                    if bounds is None:
+                        bounds = self.__dict__[bounds_key] = that.get_bounds(self)
+                    left_bound, right_bound = bounds
+            else:
+                left_bound, right_bound = fixed_bounds if is_fixed else that.get_bounds(None)
+
+            # Check bounds; test for an integer directly before trying other numbers.
+            if (type(arg) is int or is_number(arg)) and left_bound <= arg <= right_bound:
                 return fn(*args, **kwargs)
 
             raise ValueError('The argument should be a number between {left} and {right}!' \
                 .format(left=repr(left_bound), right=repr(right_bound)))
 
+        wrapped_fn.__wrapped__ = fn
         return wrapped_fn
 
 
+    def get_bounds(self, obj):
+        """Get the bounds; call the bounds functions if they exist.
+
+        Args:
+            obj: Class object passed to the bounds functions, or None for a plain function.
+
+        Returns:
+            Tuple containing the left bound and the right bound.
+        """
+        left_bound = self.left_bound
+        if callable(left_bound):
+            left_bound = left_bound(obj)
+
+        right_bound = self.right_bound
+        if callable(right_bound):
+            right_bound = right_bound(obj)
+
+        return left_bound, right_bound
+
+
     def is_number(self, maybe_number):
         """Checks an unknown argument to see if it is a number (int, float, or complex).
 
@@ -108,15 +331,175 @@ class restrict_bounds(object):
         Returns:
             Boolean indicating whether the argument is a number or not.
         """
-        try:
-            complex(maybe_number)
-        except ValueError:
-            return False
-        except TypeError:
+        return is_number(maybe_number)
+
+
+class ReadWriteLock(object):
+    """Lock held by any number of reading threads at once, or by one writing thread.
+
+    Readers never wait for one another, only for a writer. A writer waits until the current
+    readers finish, and new readers wait behind a waiting writer, so a steady stream of
+    readers cannot starve the writer. A thread that already holds the lock may read or write
+    again without waiting, except that a reading thread may not start writing.
+
+    Example:
+        lock = ReadWriteLock()
+        with lock.read():
+            scores = controller.get_current_scores()
+    """
+
+
+    def __init__(self):
+        """Initialize an unheld lock."""
+        self.__condition = threading.Condition(threading.Lock())
+        self.__readers = 0
+        self.__writer = None ## Identifier of the thread holding the lock for writing.
+        self.__writers_waiting = 0
+        self.__local = threading.local() ## Marks the threads holding the lock for reading.
+
+
+    def acquire_read(self):
+        """Wait until the lock can be held for reading, then hold it.
+
+        Returns:
+            Boolean value that is False if this thread already held the lock, in which case
+            <release_read> must not be called.
+        """
+        local = self.__local
+        if getattr(local, 'reading', False) or self.__writer == threading.get_ident():
             return False
 
+        condition = self.__condition
+        with condition:
+            while self.__writer is not None or self.__writers_waiting:
+                condition.wait()
+            self.__readers += 1
+        local.reading = True
+        return True
+
+
+    def acquire_write(self):
+        """Wait until the lock can be held for writing, then hold it.
+
+        Raises:
+            RuntimeError if this thread holds the lock for reading.
+
+        Returns:
+            Boolean value that is False if this thread already held the lock, in which case
+            <release_write> must not be called.
+        """
+        thread = threading.get_ident()
+        if self.__writer == thread:
+            return False
+        if getattr(self.__local, 'reading', False):
+            raise RuntimeError('The lock cannot be held for writing while this thread reads!')
+
+        condition = self.__condition
+        with condition:
+            self.__writers_waiting += 1
+            try:
+                while self.__writer is not None or self.__readers:
+                    condition.wait()
+            finally:
+                self.__writers_waiting -= 1
+            self.__writer = thread
         return True
 
 
+    @contextmanager
+    def read(self):
+        """Hold the lock for reading within a with statement."""
+        acquired = self.acquire_read()
+        try:
+            yield
+        finally:
+            if acquired:
+                self.release_read()
+
+
+    def release_read(self):
+        """Stop holding the lock for reading."""
+        self.__local.reading = False
+        condition = self.__condition
+        with condition:
+            self.__readers -= 1
+            if not self.__readers:
+                condition.notify_all()
+
+
+    def release_write(self):
+        """Stop holding the lock for writing."""
+        condition = self.__condition
+        with condition:
+            self.__writer = None
+            condition.notify_all()
+
+
+    @contextmanager
+    def write(self):
+        """Hold the lock for writing within a with statement.
+
+        Raises:
+            RuntimeError if this thread holds the lock for reading.
+        """
+        acquired = self.acquire_write()
+        try:
+            yield
+        finally:
+            if acquired:
+                self.release_write()
+
+
+class FrameView(Mapping):
+    """Read-only view of a frame mapping object that does not copy the frame.
+
+    The view reads through to the frame, so it always shows the latest data. A linked frame
+    stored under a key is returned as another view, so no part of the frame can be changed
+    through the view. Call <copy> to get a frame that may be changed.
+
+    Args:
+        frame: Dictionary or <Frame> object containing frame data.
+
+    Example:
+        view = FrameView({'ball_1_score': 4, 'next_frame': {'ball_1_score': 10}})
+        view['next_frame']['ball_1_score'] ## 10
+        view['ball_1_score'] = 5 ## TypeError
+    """
+
+    __slots__ = ('__frame',)
+
+
+    def __init__(self, frame):
+        """Initialize the view."""
+        self.__frame = frame
+
+
+    def __getitem__(self, key):
+        """Get a value, wrapping a linked frame in another view."""
+        value = self.__frame[key]
+        return FrameView(value) if isinstance(value, Mapping) else value
+
+
+    def __iter__(self):
+        """Iterate over the frame keys."""
+        return iter(self.__frame)
+
+
+    def __len__(self):
+        """Count the frame keys."""
+        return len(self.__frame)
+
+
+    def __repr__(self):
+        """Show the frame data without following links."""
+        return 'FrameView({keys})'.format(keys=repr(list(self.__frame)))
+
+
+    def copy(self):
+        """Returns a full, recursive dictionary copy of the frame that may be changed."""
+        frame = self.__frame
+        return copy.deepcopy(frame) if isinstance(frame, dict) else frame.copy()
+
+
 if __name__ == '__main__':
     pass
@@ -0,0 +1,224 @@
+"""instrumentation.py
+
+Provides opt-in call counters and latency histograms for the scoring classes. Methods are only
+wrapped while instrumentation is enabled on an object, so a disabled object runs exactly the
+same code as an uninstrumented one.
+"""
+
+import time
+
+
+BASE_NS = 100 ## Upper bound of the first histogram bucket in nanoseconds.
+NUM_BUCKETS = 24 ## Buckets double in size, so the last finite bound is about 0.8 seconds.
+
+
+class MethodStats(object):
+    """Call count, cumulative time, and latency histogram for one method."""
+
+    __slots__ = ('count', 'total_ns', 'buckets')
+
+
+    def __init__(self):
+        """Start with no calls recorded."""
+        self.count = 0
+        self.total_ns = 0
+        self.buckets = [0] * (NUM_BUCKETS + 1) ## The last bucket has no upper bound.
+
+
+class Instrumentation(object):
+    """Record call counts, cumulative time, and log-bucketed latency for wrapped methods.
+
+    Bucket k counts calls that took less than BASE_NS * 2**k nanoseconds and at least the
+    bound of bucket k - 1. Share one object between a controller and its games to collect all
+    of their stats in one place.
+
+    Example:
+        instrumentation = Instrumentation()
+        controller.enable_instrumentation(instrumentation)
+        controller.post_new_score(7)
+        instrumentation.stats()['BowlingGame.add_ball_score']['count'] ## 1
+    """
+
+
+    def __init__(self):
+        """Start with no methods recorded."""
+        self.__stats = {}
+
+
+    ##########################
+    ### INTERNAL FUNCTIONS ###
+    ##########################
+
+    def get_bounds(self):
+        """Returns the upper bound of each histogram bucket in seconds, ending with infinity."""
+        return [BASE_NS * 2**k / 1e9 for k in range(NUM_BUCKETS)] + [float('inf')]
+
+
+    ########################
+    ### PUBLIC FUNCTIONS ###
+    ########################
+
+    def instrument(self, obj, names, prefix):
+        """Wrap methods on one object so each call is recorded.
+
+        The wrappers are stored on the object itself and shadow its class methods, so other
+        objects of the same class are not affected. A method already wrapped on the object,
+        such as a locking wrapper, is wrapped again.
+
+        Args:
+            obj: Object whose methods to wrap.
+            names: Iterable of strings representing the method names to wrap.
+            prefix: String added before each method name in the stats, such as 'BowlingGame.'.
+        """
+        for name in names:
+            setattr(obj, name, self.wrap(prefix + name, getattr(obj, name)))
+
+
+    def uninstrument(self, obj, names):
+        """Remove the wrappers added by <instrument> from one object.
+
+        Args:
+            obj: Object whose methods were wrapped.
+            names: Iterable of strings representing the wrapped method names.
+        """
+        for name in names:
+            obj.__dict__.pop(name, None)
+
+
+    def reset(self):
+        """Clear every recorded call."""
+        for stats in self.__stats.values():
+            stats.__init__()
+
+
+    def stats(self):
+        """Summarize the recorded calls for each method.
+
+        Returns:
+            Dictionary keyed by method name. Each value holds the call count, the total time in
+            seconds, and a histogram list of (upper bound in seconds, call count) tuples.
+        """
+        bounds = self.get_bounds()
+        return {name: {
+            'count': stats.count,
+            'total_seconds': stats.total_ns / 1e9,
+            'histogram': list(zip(bounds, stats.buckets)),
+        } for name, stats in sorted(self.__stats.items())}
+
+
+    def to_prometheus(self, metric='bowling_method_duration_seconds'):
+        """Format the recorded calls as a Prometheus histogram in the text exposition format.
+
+        Args:
+            metric: String representing the metric name.
+
+        Returns:
+            String containing cumulative buckets, a sum, and a count for each method.
+        """
+        lines = [
+            '# HELP {metric} Time spent in each bowling score method.'.format(metric=metric),
+            '# TYPE {metric} histogram'.format(metric=metric),
+        ]
+        bounds = ['{bound:.9g}'.format(bound=bound) for bound in self.get_bounds()[:-1]]
+        bounds.append('+Inf')
+
+        for name, stats in sorted(self.__stats.items()):
+            label = 'method="{name}"'.format(name=name)
+            total = 0
+            for bound, count in zip(bounds, stats.buckets):
+                total += count
+                lines.append('{metric}_bucket{{{label},le="{bound}"}} {total}'.format(
+                    metric=metric, label=label, bound=bound, total=total))
+            lines.append('{metric}_sum{{{label}}} {sum:.9g}'.format(
+                metric=metric, label=label, sum=stats.total_ns / 1e9))
+            lines.append('{metric}_count{{{label}}} {count}'.format(
+                metric=metric, label=label, count=stats.count))
+
+        return '\n'.join(lines) + '\n'
+
+
+    def wrap(self, name, fn):
+        """Wrap a function so each call is recorded under a name.
+
+        Args:
+            name: String representing the name the calls are recorded under.
+            fn: Function to wrap.
+
+        Returns:
+            Function that calls the original function and records how long it took.
+        """
+        stats = self.__stats.get(name)
+        if stats is None:
+            stats = self.__stats[name] = MethodStats()
+        timer = time.perf_counter_ns
+        last = NUM_BUCKETS
+
+        def wrapped_fn(*args, **kwargs):
+            start = timer()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = timer() - start
+                stats.count += 1
+                stats.total_ns += elapsed
+                stats.buckets[min(last, (elapsed // BASE_NS).bit_length())] += 1
+
+        wrapped_fn.__wrapped__ = fn
+        return wrapped_fn
+
+
+class Instrumented(object):
+    """Add opt-in instrumentation to a class that lists its method names in <INSTRUMENTED>.
+
+    Calls are recorded under the class name and method name, such as
+    'BowlingGame.add_ball_score'.
+    """
+
+    INSTRUMENTED = () ## Names of the methods wrapped while instrumentation is enabled.
+    __instrumentation = None
+
+
+    def enable_instrumentation(self, instrumentation=None):
+        """Start recording calls to this object's instrumented methods.
+
+        Args:
+            instrumentation: <Instrumentation> object that records the calls, or None to
+                create a new one.
+
+        Returns:
+            <Instrumentation> object recording the calls.
+        """
+        self.disable_instrumentation()
+        if instrumentation is None:
+            instrumentation = Instrumentation()
+        instrumentation.instrument(self, self.INSTRUMENTED, type(self).__name__ + '.')
+        self.__instrumentation = instrumentation
+        return instrumentation
+
+
+    def disable_instrumentation(self):
+        """Stop recording calls and restore the uninstrumented methods."""
+        if self.__instrumentation is not None:
+            self.__instrumentation.uninstrument(self, self.INSTRUMENTED)
+            self.__instrumentation = None
+
+
+    def stats(self, prometheus=False):
+        """Returns the calls recorded since instrumentation was enabled.
+
+        Args:
+            prometheus: Boolean value indicating whether to return Prometheus text format.
+
+        Returns:
+            Dictionary from <Instrumentation.stats>, or a string from
+            <Instrumentation.to_prometheus> if prometheus is True. Both are empty if
+            instrumentation is not enabled.
+        """
+        instrumentation = self.__instrumentation
+        if instrumentation is None:
+            return '' if prometheus else {}
+        return instrumentation.to_prometheus() if prometheus else instrumentation.stats()
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,312 @@
+"""leaderboard.py
+
+Provides a class used to rank every player across many <BowlingController> objects. The
+leaderboard is updated by each controller as ball scores are posted, so ranking queries never
+read or sort the controllers.
+"""
+
+
+class Leaderboard(object):
+    """Rank players from many bowling controllers by their current score.
+
+    Running totals are whole numbers no greater than the highest possible score, so players are
+    grouped by score and the number of players at each score is kept in a binary indexed
+    (Fenwick) tree. Updating a player's score, finding a player's rank, and counting the players
+    in a score range each take O(log S) time, where S is the highest possible score. Listing
+    players takes O(log S) time for each distinct score listed.
+
+    A player is identified by the key given to <add_controller> and the one-indexed player
+    number. A player who has not finished a frame has a score of 0. Players with the same
+    score share a rank, and are listed in the order they reached that score.
+
+    Example:
+        leaderboard = Leaderboard()
+        leaderboard.add_controller(controller, key='lane-7')
+        controller.post_new_score(9)
+        leaderboard.get_top(3) ## [(9, 'lane-7', 1), (0, 'lane-7', 2)]
+        leaderboard.get_rank('lane-7', 2) ## 2
+    """
+
+
+    def __init__(self, num_pins=10, num_frames=10):
+        """Configure the leaderboard.
+
+        Args:
+            num_pins: Integer representing the number of pins set up in each frame.
+            num_frames: Integer representing the number of frames in each game.
+        """
+        self.__num_pins = max(num_pins, 1)
+        self.__num_frames = max(num_frames, 1)
+        self.__max_score = 3 * self.__num_pins * self.__num_frames
+        self.__tree = [0] * (self.__max_score + 2) ## Fenwick tree indexed by score + 1.
+        self.__buckets = [None] * (self.__max_score + 1) ## Dictionary of players at each score.
+        self.__scores = {} ## The score of each player keyed by (key, player).
+        self.__keys = {} ## The key of each controller keyed by its id.
+        self.__controllers = {} ## Each controller keyed by its key.
+
+
+    def __len__(self):
+        """Count the ranked players."""
+        return len(self.__scores)
+
+
+    ##########################
+    ### INTERNAL FUNCTIONS ###
+    ##########################
+
+    def add_count(self, score, count):
+        """Add to the number of players with this score.
+
+        Args:
+            score: Integer representing the score.
+            count: Integer representing the number of players to add, or remove if negative.
+        """
+        tree = self.__tree
+        i = score + 1
+        while i < len(tree):
+            tree[i] += count
+            i += i & -i
+
+
+    def count_below(self, score):
+        """Count the players with a score less than this score.
+
+        Args:
+            score: Integer representing the score.
+
+        Returns:
+            Integer representing the number of players.
+        """
+        tree = self.__tree
+        i = min(max(score, 0), self.__max_score + 1)
+        count = 0
+        while i > 0:
+            count += tree[i]
+            i -= i & -i
+        return count
+
+
+    def find_score(self, n):
+        """Find the score of the nth lowest ranked player.
+
+        Args:
+            n: Integer representing the player's position from the bottom (one-indexed).
+
+        Returns:
+            Integer representing the score.
+        """
+        tree = self.__tree
+        i = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            if i + step < len(tree) and tree[i + step] < n:
+                i += step
+                n -= tree[i]
+            step >>= 1
+        return i ## The tree is indexed by score + 1, so this is the score.
+
+
+    def get_players(self, low, high, limit=None):
+        """List the players with a score in a range from the highest score down.
+
+        Args:
+            low: Integer representing the lowest score to list.
+            high: Integer representing the highest score to list.
+            limit: Integer representing the most players to list, or None for every player.
+
+        Returns:
+            List of (score, key, player) tuples.
+        """
+        players = []
+        n = self.count_below(high + 1)
+        stop = self.count_below(low)
+        while n > stop and (limit is None or len(players) < limit):
+            score = self.find_score(n)
+            for key, player in self.__buckets[score]:
+                if limit is not None and len(players) >= limit:
+                    break
+                players.append((score, key, player))
+            n -= len(self.__buckets[score])
+        return players
+
+
+    def set_score(self, entry, score):
+        """Move a player to a new score.
+
+        Args:
+            entry: Tuple containing the controller key and the one-indexed player number.
+            score: Integer representing the player's score, or None to remove the player.
+
+        Raises:
+            ValueError if the score is greater than the highest possible score.
+        """
+        if score is not None and not 0 <= score <= self.__max_score:
+            raise ValueError('The score {score} is not between 0 and {max_score}!' \
+                .format(score=repr(score), max_score=self.__max_score))
+
+        buckets = self.__buckets
+        old_score = self.__scores.get(entry)
+        if old_score == score:
+            return ## Keep the player's place among players with the same score.
+
+        self.__scores.pop(entry, None)
+        if old_score is not None:
+            del buckets[old_score][entry]
+            self.add_count(old_score, -1)
+
+        if score is not None:
+            if buckets[score] is None:
+                buckets[score] = {}
+            buckets[score][entry] = None
+            self.add_count(score, 1)
+            self.__scores[entry] = score
+
+
+    ########################
+    ### PUBLIC FUNCTIONS ###
+    ########################
+
+    def add_controller(self, controller, key=None):
+        """Rank every player in a controller and keep their scores updated as balls are posted.
+
+        Args:
+            controller: <BowlingController> object to rank.
+            key: Hashable value identifying the controller, or None to use the controller.
+
+        Raises:
+            ValueError if the key is already in use.
+            ValueError if the controller already belongs to a leaderboard.
+            ValueError if the controller's games have a different number of pins or frames.
+        """
+        key = controller if key is None else key
+        if key in self.__controllers:
+            raise ValueError('The key {key} is already in use!'.format(key=repr(key)))
+        if controller.leaderboard is not None:
+            raise ValueError('The controller already belongs to a leaderboard!')
+        if (controller.NUM_PINS, controller.NUM_FRAMES) != (self.__num_pins, self.__num_frames):
+            raise ValueError('The controller should have {pins} pins and {frames} frames!' \
+                .format(pins=repr(self.__num_pins), frames=repr(self.__num_frames)))
+
+        self.__keys[id(controller)] = key
+        self.__controllers[key] = controller
+        controller.set_leaderboard(self)
+        for player in range(1, controller.NUM_PLAYERS + 1):
+            self.update_score(controller, player)
+
+
+    def count_range(self, low, high):
+        """Count the players with a score in a range.
+
+        Args:
+            low: Integer representing the lowest score to count.
+            high: Integer representing the highest score to count.
+
+        Returns:
+            Integer representing the number of players.
+        """
+        if low > high:
+            return 0
+        return self.count_below(high + 1) - self.count_below(low)
+
+
+    def get_range(self, low, high):
+        """List the players with a score in a range from the highest score down.
+
+        Args:
+            low: Integer representing the lowest score to list.
+            high: Integer representing the highest score to list.
+
+        Returns:
+            List of (score, key, player) tuples.
+        """
+        if low > high:
+            return []
+        return self.get_players(low, high)
+
+
+    def get_rank(self, key, player):
+        """Get the rank of a player, where players with the same score share a rank.
+
+        Args:
+            key: Hashable value identifying the player's controller.
+            player: Integer representing the player (one-indexed).
+
+        Raises:
+            ValueError if the player is not ranked.
+
+        Returns:
+            Integer representing the player's rank, where 1 is the highest score.
+        """
+        score = self.get_score(key, player)
+        return len(self.__scores) - self.count_below(score + 1) + 1
+
+
+    def get_score(self, key, player):
+        """Get the score of a ranked player.
+
+        Args:
+            key: Hashable value identifying the player's controller.
+            player: Integer representing the player (one-indexed).
+
+        Raises:
+            ValueError if the player is not ranked.
+
+        Returns:
+            Integer representing the player's score.
+        """
+        score = self.__scores.get((key, player))
+        if score is None:
+            raise ValueError('The player {player} on {key} is not ranked!' \
+                .format(player=repr(player), key=repr(key)))
+        return score
+
+
+    def get_top(self, k):
+        """List the players with the highest scores.
+
+        Args:
+            k: Integer representing the number of players to list.
+
+        Returns:
+            List of up to k (score, key, player) tuples from the highest score down.
+        """
+        if k <= 0:
+            return []
+        return self.get_players(0, self.__max_score, k)
+
+
+    def remove_controller(self, key):
+        """Stop ranking the players in a controller.
+
+        Args:
+            key: Hashable value identifying the controller.
+
+        Raises:
+            ValueError if there is no controller with this key.
+        """
+        controller = self.__controllers.pop(key, None)
+        if controller is None:
+            raise ValueError('There is no controller with the key {key}!'.format(key=repr(key)))
+
+        del self.__keys[id(controller)]
+        controller.set_leaderboard(None)
+        for player in range(1, controller.NUM_PLAYERS + 1):
+            self.set_score((key, player), None)
+
+
+    def update_score(self, controller, player):
+        """Read a player's current score from a controller and move the player to that score.
+
+        Controllers call this after each posted ball score. It does not raise, because
+        <add_controller> only accepts controllers whose scores fit this leaderboard.
+
+        Args:
+            controller: <BowlingController> object added with <add_controller>.
+            player: Integer representing the player (one-indexed).
+        """
+        key = self.__keys[id(controller)]
+        self.set_score((key, player), controller.get_current_score(player) or 0)
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,90 @@
+"""replay_engine.py
+
+Provides functions used to rescore recorded bowling games across worker processes. Each game is
+a sequence of ball scores in the order they were rolled, and each one is replayed through a
+<BowlingGame> so results match a live game exactly.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import os
+
+from .bowling_game import BowlingGame
+
+
+def replay_chunk(chunk, num_pins=10, num_frames=10, engine=BowlingGame):
+    """Replay a chunk of games in the current process.
+
+    Args:
+        chunk: List of sequences, each containing the ball scores for one game.
+        num_pins: Integer representing the number of pins set up in each frame.
+        num_frames: Integer representing the number of frames in each game.
+        engine: Class used to replay each game, such as <CompactBowlingGame>.
+
+    Raises:
+        ValueError if a game contains an invalid ball score.
+
+    Returns:
+        List containing a list of frame dictionary objects for each game in the chunk.
+    """
+    results = []
+    for rolls in chunk:
+        game = engine(num_pins, num_frames, [])
+        game.post_new_scores(rolls)
+        results.append([game.get_frame_data(i) for i in range(1, game.current_frame + 1)])
+    return results
+
+
+def replay_games(games, num_pins=10, num_frames=10, chunk_size=1000, max_workers=None,
+    engine=BowlingGame):
+    """Replay games on a process pool and yield the results in input order.
+
+    Games are read from the input lazily, and only a few chunks per worker are in flight at
+    once, so an input larger than memory can be streamed through the pool.
+
+    Args:
+        games: Iterable of sequences, each containing the ball scores for one game.
+        num_pins: Integer representing the number of pins set up in each frame.
+        num_frames: Integer representing the number of frames in each game.
+        chunk_size: Integer representing the number of games sent to a worker at once.
+        max_workers: Integer representing the number of worker processes, or None to use one
+            per CPU.
+        engine: Class used to replay each game, such as <CompactBowlingGame>.
+
+    Raises:
+        ValueError if the chunk size or the number of workers is less than 1.
+        ValueError if a game contains an invalid ball score.
+
+    Yields:
+        List of frame dictionary objects for each game in the same order as the input.
+    """
+    if chunk_size < 1:
+        raise ValueError('The chunk size should be at least 1!')
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    elif max_workers < 1:
+        raise ValueError('The number of workers should be at least 1!')
+
+    games = iter(games)
+    pending = deque()
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            # Keep every worker busy with a chunk plus one queued behind it.
+            while len(pending) < 2 * max_workers:
+                chunk = [list(rolls) for rolls in islice(games, chunk_size)]
+                if not chunk:
+                    break
+                pending.append(executor.submit(replay_chunk, chunk, num_pins, num_frames, engine))
+
+            if not pending:
+                return
+
+            for result in pending.popleft().result():
+                yield result
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,329 @@
+"""roll_log.py
+
+Provides an append-only binary log of every ball score posted to a <BowlingController>, and of
+every correction and undo, and functions used to read the log back and rebuild each controller's
+game state. The log is split into segment files of fixed-width records so a reader can memory-map
+a whole segment and unpack it in one pass.
+"""
+
+import mmap
+import os
+import struct
+import time
+
+from .bowling_controller import BowlingController
+from .bowling_game import BowlingGame
+
+
+# Record layout: lane, game, player (one-indexed), frame, pins, number of players, timestamp,
+# kind, and ball (one-indexed, for a correction).
+RECORD = struct.Struct('<IIHHHHdBB6x')
+MAX_KEY = 2**32 - 1 ## The highest lane or game number.
+MAX_COUNT = 2**16 - 1 ## The highest player, frame, pin, or player count.
+SEGMENT_NAME = 'rolls-{index:08d}.seg'
+
+
+class RollLog(object):
+    """Append ball score records to segment files in a directory.
+
+    Each record is a posted ball score, a correction made with <BowlingController.amend_roll>,
+    or an undo made with <BowlingController.undo_last_roll>, marked by its kind.
+
+    Records are buffered in memory and written to the current segment when the buffer fills,
+    on <flush>, and on <close>. A new segment is started once the current one reaches the
+    segment size.
+
+    Example:
+        with RollLog('/var/lib/bowling') as log:
+            controller = BowlingController(2, roll_log=log, lane=7, game=1)
+            controller.post_new_score(9)
+    """
+
+    ROLL, AMEND, UNDO = range(3) ## Record kinds.
+
+
+    def __init__(self, directory, segment_size=64 * 2**20, buffer_size=2**16):
+        """Open the latest segment in the directory, creating the directory if needed.
+
+        Args:
+            directory: String representing the path to the directory holding the segments.
+            segment_size: Integer representing the number of bytes at which to start a new
+                segment.
+            buffer_size: Integer representing the number of bytes buffered before a write.
+        """
+        self.__directory = directory
+        self.__segment_size = max(segment_size, RECORD.size)
+        self.__buffer_size = buffer_size
+        self.__buffer = bytearray()
+
+        os.makedirs(directory, exist_ok=True)
+        segments = list_segments(directory)
+        self.__index = len(segments) - 1 if segments else 0
+        self.__file = None
+        self.open_segment()
+
+
+    def __enter__(self):
+        """Use the log as a context manager."""
+        return self
+
+
+    def __exit__(self, *exc_info):
+        """Close the log when leaving the context."""
+        self.close()
+
+
+    ##########################
+    ### INTERNAL FUNCTIONS ###
+    ##########################
+
+    def open_segment(self):
+        """Open the current segment for appending, dropping any partially written record."""
+        if self.__file is not None:
+            self.__file.close()
+
+        path = os.path.join(self.__directory, SEGMENT_NAME.format(index=self.__index))
+        self.__file = open(path, 'ab')
+        size = self.__file.tell()
+        if size % RECORD.size:
+            self.__file.truncate(size - size % RECORD.size)
+            self.__file.seek(0, os.SEEK_END)
+        self.__size = self.__file.tell()
+
+
+    def write_buffer(self):
+        """Write buffered records to the current segment, starting a new segment if it is full."""
+        buffer = self.__buffer
+        while buffer:
+            room = self.__segment_size - self.__size
+            room -= room % RECORD.size
+            if room <= 0:
+                self.__index += 1
+                self.open_segment()
+                continue
+
+            chunk = buffer[:room]
+            self.__file.write(chunk)
+            self.__size += len(chunk)
+            del buffer[:room]
+
+
+    ########################
+    ### PUBLIC FUNCTIONS ###
+    ########################
+
+    def append(self, lane, game, player, frame, pins, num_players, timestamp=None, kind=ROLL,
+        ball=0):
+        """Append a ball score, correction, or undo record.
+
+        Args:
+            lane: Integer identifying the lane.
+            game: Integer identifying the game on this lane.
+            player: Integer representing the player who bowled (one-indexed).
+            frame: Integer representing the player's frame after the ball was posted, or the
+                frame of the corrected or removed ball.
+            pins: Integer representing the number of pins knocked down, or the corrected or
+                removed number of pins.
+            num_players: Integer representing the number of players in this game.
+            timestamp: Float representing the time the ball was posted, or None for now.
+            kind: Integer that is <ROLL>, <AMEND>, or <UNDO>.
+            ball: Integer representing the corrected ball within its frame, or 0.
+
+        Raises:
+            ValueError if a value does not fit in the record.
+        """
+        self.append_record(self.pack(lane, game, player, frame, pins, num_players, timestamp,
+            kind, ball))
+
+
+    def append_record(self, record):
+        """Append a record built by <pack>.
+
+        Args:
+            record: Bytes object containing one packed record.
+        """
+        self.__buffer += record
+        if len(self.__buffer) >= self.__buffer_size:
+            self.write_buffer()
+
+
+    def check(self, lane, game, num_players, num_pins, num_frames):
+        """Check that every record a controller may append will fit, before it posts a ball.
+
+        Args:
+            lane: Integer identifying the lane.
+            game: Integer identifying the game on this lane.
+            num_players: Integer representing the number of players in the game.
+            num_pins: Integer representing the number of pins set up in each frame.
+            num_frames: Integer representing the number of frames in the game.
+
+        Raises:
+            ValueError if the lane or game is not an integer between 0 and <MAX_KEY>.
+            ValueError if the number of players, pins, or frames is greater than <MAX_COUNT>.
+        """
+        for name, value in (('lane', lane), ('game', game)):
+            if type(value) is not int or value < 0 or value > MAX_KEY:
+                raise ValueError('The {name} should be an integer between 0 and {max}!' \
+                    .format(name=name, max=repr(MAX_KEY)))
+        if max(num_players, num_pins, num_frames) > MAX_COUNT:
+            raise ValueError('The number of players, pins, and frames should be no more than ' \
+                '{max}!'.format(max=repr(MAX_COUNT)))
+
+
+    def close(self):
+        """Write buffered records and close the current segment."""
+        if self.__file is not None:
+            self.flush()
+            self.__file.close()
+            self.__file = None
+
+
+    def flush(self, sync=False):
+        """Write buffered records to the current segment.
+
+        Args:
+            sync: Boolean value indicating whether to wait until the records reach the disk.
+        """
+        self.write_buffer()
+        self.__file.flush()
+        if sync:
+            os.fsync(self.__file.fileno())
+
+
+    def pack(self, lane, game, player, frame, pins, num_players, timestamp=None, kind=ROLL,
+        ball=0):
+        """Pack a record like <append> without appending it.
+
+        Controllers pack each record before changing the game, so a record that does not fit
+        is rejected first, then append it with <append_record>.
+
+        Args:
+            lane: Integer identifying the lane.
+            game: Integer identifying the game on this lane.
+            player: Integer representing the player who bowled (one-indexed).
+            frame: Integer representing the player's frame after the ball was posted, or the
+                frame of the corrected or removed ball.
+            pins: Integer representing the number of pins knocked down, or the corrected or
+                removed number of pins.
+            num_players: Integer representing the number of players in this game.
+            timestamp: Float representing the time the ball was posted, or None for now.
+            kind: Integer that is <ROLL>, <AMEND>, or <UNDO>.
+            ball: Integer representing the corrected ball within its frame, or 0.
+
+        Raises:
+            ValueError if a value does not fit in the record.
+
+        Returns:
+            Bytes object containing the packed record.
+        """
+        try:
+            return RECORD.pack(lane, game, player, frame, pins, num_players,
+                time.time() if timestamp is None else timestamp, kind, ball)
+        except struct.error as e:
+            raise ValueError('The record does not fit in the roll log: {error}!' \
+                .format(error=e))
+
+
+def list_segments(directory):
+    """List the segment files in a directory in the order they were written.
+
+    Args:
+        directory: String representing the path to the directory holding the segments.
+
+    Returns:
+        List of strings representing the path to each segment.
+    """
+    if not os.path.isdir(directory):
+        return []
+
+    names = sorted(name for name in os.listdir(directory)
+        if name.startswith('rolls-') and name.endswith('.seg'))
+    return [os.path.join(directory, name) for name in names]
+
+
+def read_records(directory):
+    """Read every record from the segments in a directory.
+
+    Each segment is memory-mapped and unpacked in one pass. A partially written record at the
+    end of a segment is ignored.
+
+    Args:
+        directory: String representing the path to the directory holding the segments.
+
+    Yields:
+        Tuple containing lane, game, player, frame, pins, number of players, timestamp, kind,
+        and ball.
+    """
+    for path in list_segments(directory):
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            size -= size % RECORD.size
+            if not size:
+                continue
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                with memoryview(data) as view, view[:size] as records:
+                    yield from RECORD.iter_unpack(records)
+
+
+def restore_controllers(directory, num_pins=10, num_frames=10, engine=BowlingGame,
+    roll_log=None):
+    """Rebuild the controller for every game in a roll log.
+
+    The ball scores for each game are collected in order and posted to a new controller in
+    batches, so each game is scored once. Corrections and undos are applied between batches in
+    the order they were made.
+
+    Args:
+        directory: String representing the path to the directory holding the segments.
+        num_pins: Integer representing the number of pins set up in each frame.
+        num_frames: Integer representing the number of frames in each game.
+        engine: Class used to create each player's game, such as <CompactBowlingGame>.
+        roll_log: <RollLog> object that the restored controllers append new ball scores to,
+            or None to stop logging.
+
+    Raises:
+        ValueError if a game has corrections or undos and the engine does not support them.
+        ValueError if a record has an unknown kind.
+
+    Returns:
+        Dictionary of <BowlingController> objects keyed by a (lane, game) tuple.
+    """
+    # Keep each ball score as an integer, and each correction or undo as a tuple.
+    events = {}
+    players = {}
+    for lane, game, player, frame, pins, num_players, timestamp, kind, ball in \
+        read_records(directory):
+        key = (lane, game)
+        if key not in events:
+            events[key] = []
+            players[key] = num_players
+        events[key].append(pins if kind == RollLog.ROLL else (kind, player, frame, ball, pins))
+
+    controllers = {}
+    for key, game_events in events.items():
+        lane, game = key
+        controller = BowlingController(players[key], num_pins, num_frames, [], engine=engine,
+            lane=lane, game=game)
+        rolls = []
+        for event in game_events:
+            if type(event) is int:
+                rolls.append(event)
+                continue
+            controller.post_new_scores(rolls)
+            rolls = []
+            kind, player, frame, ball, pins = event
+            if kind == RollLog.AMEND:
+                controller.amend_roll(player, frame, ball, pins)
+            elif kind == RollLog.UNDO:
+                controller.undo_last_roll()
+            else:
+                raise ValueError('The record kind {kind} is not supported!' \
+                    .format(kind=repr(kind)))
+        controller.post_new_scores(rolls)
+        controller.set_roll_log(roll_log)
+        controllers[key] = controller
+    return controllers
+
+
+if __name__ == '__main__':
+    pass
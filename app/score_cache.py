@@ -0,0 +1,219 @@
+"""score_cache.py
+
+Provides a class used to score the same sequences of ball scores many times, such as league
+games scored as each ball is rolled, practice games, and replays checked against a roll log.
+Frame scores and running totals are kept for the most recently scored sequences, and a sequence
+that extends one already scored continues from the frames whose scores are final.
+"""
+
+from collections import OrderedDict
+
+from .helpers import check_bounds, read_only
+
+
+class ScoreCache(object):
+    """Score sequences of ball scores, keeping the results for the most recently used ones.
+
+    Results are keyed by the number of pins, the number of frames, and the ball scores, and the
+    least recently used result is dropped once there are more than max_size. Each lookup is
+    counted as a hit if the sequence was scored before, a resume if it continues from the
+    longest sequence scored before that it starts with, or a miss otherwise. A game scored as
+    each ball is rolled resumes from the previous ball, so only its last few frames are scored.
+
+    Frames are scored with the same rules as <BowlingGame>: a frame score is None until its
+    bonus balls are rolled, and each running total adds the frame scores known so far.
+
+    Example:
+        cache = ScoreCache(max_size=1000)
+        cache.score([10, 7]) ## ((None, 0), (None, 0))
+        cache.score([10, 7, 2]) ## ((19, 19), (9, 28))
+        cache.resumes ## 1
+    """
+
+
+    def __init__(self, max_size=100000):
+        """Configure the cache.
+
+        Args:
+            max_size: Integer representing the number of results to keep.
+        """
+        self.__max_size = max(max_size, 1)
+        self.__results = OrderedDict() ## Results keyed by (num_pins, num_frames, ball scores).
+        self.__hits = 0
+        self.__resumes = 0
+        self.__misses = 0
+
+
+    def __len__(self):
+        """Count the results kept."""
+        return len(self.__results)
+
+
+    @read_only
+    def hits(self):
+        """Returns the number of sequences that were scored before."""
+        return self.__hits
+
+
+    @read_only
+    def misses(self):
+        """Returns the number of sequences scored from the first ball."""
+        return self.__misses
+
+
+    @read_only
+    def resumes(self):
+        """Returns the number of sequences scored from a shorter sequence scored before."""
+        return self.__resumes
+
+
+    ##########################
+    ### INTERNAL FUNCTIONS ###
+    ##########################
+
+    def find_prefix(self, num_pins, num_frames, rolls):
+        """Find the result for the longest sequence scored before that a sequence starts with.
+
+        Args:
+            num_pins: Integer representing the number of pins set up in each frame.
+            num_frames: Integer representing the number of frames in the game.
+            rolls: Tuple of integers representing the ball scores.
+
+        Returns:
+            Tuple containing the result from <score_frames> and the number of ball scores it
+            covers, or None if no such sequence was scored.
+        """
+        results = self.__results
+        for n in range(len(rolls) - 1, 0, -1):
+            key = (num_pins, num_frames, rolls[:n])
+            result = results.get(key)
+            if result is not None:
+                results.move_to_end(key)
+                return result, n
+        return None
+
+
+    ########################
+    ### PUBLIC FUNCTIONS ###
+    ########################
+
+    def clear(self):
+        """Drop every result and reset the counts of hits, resumes, and misses."""
+        self.__results.clear()
+        self.__hits = self.__resumes = self.__misses = 0
+
+
+    def score(self, rolls, num_pins=10, num_frames=10):
+        """Score a sequence of ball scores from the start of a game.
+
+        Args:
+            rolls: Iterable of integers representing the ball scores.
+            num_pins: Integer representing the number of pins set up in each frame.
+            num_frames: Integer representing the number of frames in the game.
+
+        Raises:
+            ValueError if a ball score is not a number between 0 and the number of pins.
+            ValueError if a frame score is greater than the number of pins.
+            ValueError if there are ball scores after the end of the game.
+
+        Returns:
+            Tuple containing a (frame score, running total) tuple for each frame started, up to
+            the number of frames.
+        """
+        rolls = tuple(rolls)
+        key = (num_pins, num_frames, rolls)
+        results = self.__results
+        result = results.get(key)
+        if result is not None:
+            self.__hits += 1
+            results.move_to_end(key)
+            return result[0]
+
+        # Continue from the frames whose scores are final after a shorter sequence.
+        prefix = self.find_prefix(num_pins, num_frames, rolls)
+        if prefix is None:
+            self.__misses += 1
+            result = score_frames(rolls, num_pins, num_frames)
+        else:
+            self.__resumes += 1
+            (frames, final, start), n = prefix
+            result = score_frames(rolls, num_pins, num_frames, start, frames[:final], n)
+
+        results[key] = result
+        if len(results) > self.__max_size:
+            results.popitem(last=False)
+        return result[0]
+
+
+def score_frames(rolls, num_pins, num_frames, start=0, frames=(), checked=0):
+    """Score the frames of a game, continuing after frames whose scores are already final.
+
+    Args:
+        rolls: Sequence of integers representing the ball scores from the start of the game.
+        num_pins: Integer representing the number of pins set up in each frame.
+        num_frames: Integer representing the number of frames in the game.
+        start: Integer representing the index of the first ball after the given frames.
+        frames: Tuple of (frame score, running total) tuples for the first frames.
+        checked: Integer representing the number of ball scores already known to be numbers
+            between 0 and the number of pins.
+
+    Raises:
+        ValueError if a ball score is not a number between 0 and the number of pins.
+        ValueError if a frame score is greater than the number of pins.
+        ValueError if there are ball scores after the end of the game.
+
+    Returns:
+        Tuple containing a tuple of (frame score, running total) tuples for each frame started,
+        the number of those frames whose scores can no longer change, and the index of the
+        first ball after them. The last frame is never counted as final, so its bonus balls
+        are checked each time the game is scored.
+    """
+    check_bounds(rolls[checked:], 0, num_pins)
+    frames = list(frames)
+    final = len(frames)
+    total = frames[-1][1] if frames else 0
+    size = len(rolls)
+    i = start
+    balls = bonus = 0
+    while len(frames) < num_frames and i < size:
+        ball_1 = rolls[i]
+        if ball_1 == num_pins:
+            balls, bonus = 1, 2
+        elif i + 1 < size:
+            pins = ball_1 + rolls[i + 1]
+            if pins > num_pins:
+                raise ValueError('The total frame score should be no more than {num} pins!' \
+                    .format(num=repr(num_pins)))
+            balls, bonus = 2, 1 if pins == num_pins else 0
+        else:
+            frames.append((None, total)) ## The frame awaits its second ball.
+            i += 1
+            break
+
+        # A frame is scored once its bonus balls are rolled.
+        end = i + balls + bonus
+        if end <= size:
+            score = sum(rolls[i:end])
+            total += score
+            frames.append((score, total))
+            if final == len(frames) - 1 and len(frames) < num_frames:
+                final += 1
+                start = i + balls
+        else:
+            frames.append((None, total))
+        i += balls
+
+    # Check the bonus balls after the last frame. A bonus strike after a spare earns one more.
+    extra = rolls[i:]
+    if extra:
+        if len(extra) > (1 + (extra[0] == num_pins) if bonus == 1 else bonus):
+            raise ValueError('There are ball scores after the end of the game!')
+        elif bonus == 2 and len(extra) == 2 and extra[0] < num_pins and \
+            extra[0] + extra[1] > num_pins:
+            raise ValueError('The total frame score should be no more than {num} pins!' \
+                .format(num=repr(num_pins)))
+    return tuple(frames), final, start
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,358 @@
+"""score_feed.py
+
+Provides classes used to fan frame and score changes out from many <BowlingController> objects
+to scoreboard displays. Controllers publish each update as it happens, and each subscriber keeps
+only the latest update for every player it has not read yet, so a slow or stalled display never
+holds up posting ball scores or grows a backlog.
+"""
+
+import asyncio
+from collections import OrderedDict
+import threading
+
+from .helpers import read_only
+
+
+class ScoreFeed(object):
+    """Publish the frames changed by every update to each controller's subscribers.
+
+    Each event describes one player after an update: the controller key, the one-indexed
+    player, the controller version, the player's current score, and the changed frames keyed
+    by frame number. A changed frame holds its full read-only frame data, or None if it was
+    removed, so a display can replace the frame without knowing what it held before.
+
+    Publishing only adds events to each subscriber's <Subscription>, where an event for a player
+    with an unread event is merged into it. Subscribers read events with <Subscription.poll>,
+    <Subscription.get>, or async iteration, or give a callback that is called from its own
+    thread.
+
+    Example:
+        feed = ScoreFeed()
+        feed.add_controller(controller, key='lane-7')
+        subscription = feed.subscribe(keys=['lane-7'])
+        controller.post_new_score(9)
+        subscription.poll() ## [{'key': 'lane-7', 'player': 1, 'version': 1, 'score': 0, ...}]
+    """
+
+
+    def __init__(self):
+        """Start a feed with no controllers or subscribers."""
+        self.__keys = {} ## The key of each controller keyed by its id.
+        self.__controllers = {} ## Each controller keyed by its key.
+        self.__subscriptions = []
+        self.__lock = threading.Lock() ## Guards the subscriptions against concurrent changes.
+
+
+    def __len__(self):
+        """Count the open subscriptions."""
+        return len(self.__subscriptions)
+
+
+    ##########################
+    ### INTERNAL FUNCTIONS ###
+    ##########################
+
+    def publish(self, controller, version, updates):
+        """Add the events for an update to every subscription that follows the controller.
+
+        Controllers call this after each update.
+
+        Args:
+            controller: <BowlingController> object added with <add_controller>.
+            version: Integer representing the controller version after the update.
+            updates: Dictionary object containing the current score and the changed frames
+                for each changed player, keyed by the one-indexed player.
+        """
+        key = self.__keys.get(id(controller))
+        for subscription in self.__subscriptions:
+            if subscription.follows(key):
+                for player, (score, frames) in updates.items():
+                    subscription.push(key, player, version, score, frames)
+
+
+    def unsubscribe(self, subscription):
+        """Stop publishing to a subscription. Use <Subscription.close> instead.
+
+        Args:
+            subscription: <Subscription> object from <subscribe>.
+        """
+        with self.__lock:
+            self.__subscriptions = [other for other in self.__subscriptions
+                if other is not subscription]
+
+
+    ########################
+    ### PUBLIC FUNCTIONS ###
+    ########################
+
+    def add_controller(self, controller, key=None):
+        """Publish the changes made by every update to a controller.
+
+        Args:
+            controller: <BowlingController> object to follow.
+            key: Hashable value identifying the controller, or None to use the controller.
+
+        Raises:
+            ValueError if the key is already in use.
+        """
+        key = controller if key is None else key
+        if key in self.__controllers:
+            raise ValueError('The key {key} is already in use!'.format(key=repr(key)))
+
+        self.__keys[id(controller)] = key
+        self.__controllers[key] = controller
+        controller.set_score_feed(self)
+
+
+    def remove_controller(self, key):
+        """Stop publishing the changes made to a controller.
+
+        Args:
+            key: Hashable value identifying the controller.
+
+        Raises:
+            ValueError if there is no controller with this key.
+        """
+        controller = self.__controllers.pop(key, None)
+        if controller is None:
+            raise ValueError('There is no controller with the key {key}!'.format(key=repr(key)))
+
+        del self.__keys[id(controller)]
+        controller.set_score_feed(None)
+
+
+    def subscribe(self, keys=None, callback=None):
+        """Start receiving events for some or all controllers.
+
+        Args:
+            keys: Iterable of controller keys to follow, or None to follow every controller.
+            callback: Function called with each list of events from the subscription's own
+                thread, or None to read events from the subscription.
+
+        Returns:
+            <Subscription> object holding the unread events.
+        """
+        subscription = Subscription(self, keys)
+        with self.__lock:
+            self.__subscriptions = self.__subscriptions + [subscription]
+        if callback is not None:
+            subscription.start(callback)
+        return subscription
+
+
+class Subscription(object):
+    """Hold a subscriber's unread events, keeping only the latest event for each player.
+
+    An event for a player who already has an unread event is merged into it: the version and
+    score are replaced and the changed frames are updated, so the merged event brings a display
+    from what it last read to the latest state in one step. Events are read in the order each
+    player first had an unread event.
+    """
+
+
+    def __init__(self, feed, keys=None):
+        """Create an empty subscription. Use <ScoreFeed.subscribe> instead.
+
+        Args:
+            feed: <ScoreFeed> object publishing to this subscription.
+            keys: Iterable of controller keys to follow, or None to follow every controller.
+        """
+        self.__feed = feed
+        self.__keys = None if keys is None else frozenset(keys)
+        self.__events = OrderedDict() ## The unread event for each (key, player).
+        self.__condition = threading.Condition()
+        self.__waiters = [] ## The future awaited by each async reader, with its event loop.
+        self.__closed = False
+        self.__merged = 0
+
+
+    def __aiter__(self):
+        """Read lists of events with async iteration until the subscription is closed."""
+        return self
+
+
+    async def __anext__(self):
+        """Wait for unread events without blocking the event loop.
+
+        Raises:
+            StopAsyncIteration when the subscription is closed.
+
+        Returns:
+            List of event dictionary objects.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self.__condition:
+                events = self.take_events()
+                if events or self.__closed:
+                    break
+                waiter = (loop.create_future(), loop)
+                self.__waiters.append(waiter)
+            try:
+                await waiter[0]
+            finally:
+                with self.__condition:
+                    if waiter in self.__waiters:
+                        self.__waiters.remove(waiter) ## The reader was cancelled.
+
+        if not events:
+            raise StopAsyncIteration
+        return events
+
+
+    @read_only
+    def closed(self):
+        """Returns whether the subscription was closed."""
+        return self.__closed
+
+
+    @read_only
+    def merged(self):
+        """Returns the number of events merged into an unread event rather than queued."""
+        return self.__merged
+
+
+    ##########################
+    ### INTERNAL FUNCTIONS ###
+    ##########################
+
+    def follows(self, key):
+        """Determine whether this subscription receives events for a controller.
+
+        Args:
+            key: Hashable value identifying the controller.
+
+        Returns:
+            Boolean value indicating whether the controller is followed.
+        """
+        return self.__keys is None or key in self.__keys
+
+
+    def push(self, key, player, version, score, frames):
+        """Add an event, merging it into the player's unread event if there is one.
+
+        Args:
+            key: Hashable value identifying the controller.
+            player: Integer representing the player (one-indexed).
+            version: Integer representing the controller version after the update.
+            score: The player's current score.
+            frames: Dictionary object containing read-only frame data, or None for a removed
+                frame, keyed by frame number.
+        """
+        with self.__condition:
+            if self.__closed:
+                return
+            event = self.__events.get((key, player))
+            if event is None:
+                self.__events[(key, player)] = {'key': key, 'player': player,
+                    'version': version, 'score': score, 'frames': dict(frames)}
+            else:
+                event['version'] = version
+                event['score'] = score
+                event['frames'].update(frames)
+                self.__merged += 1
+            self.wake()
+
+
+    def run(self, callback):
+        """Call a function with each list of events until the subscription is closed.
+
+        Args:
+            callback: Function called with a list of event dictionary objects.
+        """
+        while True:
+            events = self.get()
+            if not events:
+                return
+            callback(events)
+
+
+    def start(self, callback):
+        """Start a thread that calls a function with each list of events.
+
+        Args:
+            callback: Function called with a list of event dictionary objects.
+        """
+        thread = threading.Thread(target=self.run, args=(callback,), daemon=True,
+            name='score-feed-subscription')
+        thread.start()
+
+
+    def take_events(self):
+        """Remove and return every unread event. Hold the condition while calling this.
+
+        Returns:
+            List of event dictionary objects.
+        """
+        events = list(self.__events.values())
+        self.__events.clear()
+        return events
+
+
+    def wake(self):
+        """Wake readers waiting for events. Hold the condition while calling this.
+
+        This runs while a controller posts a ball score, so it never raises. A reader whose
+        event loop was closed is dropped.
+        """
+        self.__condition.notify_all()
+        waiters, self.__waiters = self.__waiters, []
+        for future, loop in waiters:
+            if loop.is_closed():
+                continue
+            try:
+                loop.call_soon_threadsafe(resolve, future)
+            except RuntimeError:
+                pass ## The event loop closed after it was checked.
+
+
+    ########################
+    ### PUBLIC FUNCTIONS ###
+    ########################
+
+    def close(self):
+        """Stop receiving events and wake any waiting reader. Unread events are kept."""
+        self.__feed.unsubscribe(self)
+        with self.__condition:
+            self.__closed = True
+            self.wake()
+
+
+    def get(self, timeout=None):
+        """Wait for unread events, then remove and return them.
+
+        Args:
+            timeout: Number of seconds to wait, or None to wait until there are events or the
+                subscription is closed.
+
+        Returns:
+            List of event dictionary objects, which is empty if the wait timed out or the
+            subscription is closed.
+        """
+        with self.__condition:
+            self.__condition.wait_for(lambda: self.__events or self.__closed, timeout)
+            return self.take_events()
+
+
+    def poll(self):
+        """Remove and return every unread event without waiting.
+
+        Returns:
+            List of event dictionary objects.
+        """
+        with self.__condition:
+            return self.take_events()
+
+
+def resolve(future):
+    """Mark a future done unless it was cancelled.
+
+    Args:
+        future: <asyncio.Future> object awaited by a reader.
+    """
+    if not future.done():
+        future.set_result(None)
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,249 @@
+"""scoring_service.py
+
+Provides an asyncio front end that manages a <BowlingController> for every lane in a bowling
+center. Ball scores for each lane are applied one at a time through a per-lane queue, while
+scoreboard reads are answered directly from the lane's controller.
+"""
+
+import asyncio
+from collections import deque
+import random
+import time
+
+from .bowling_controller import BowlingController
+from .bowling_game import BowlingGame
+
+
+class ScoringService(object):
+    """Manage bowling games for many lanes from one event loop.
+
+    A worker task per lane takes ball scores off that lane's queue and posts them to the lane's
+    controller. Each score is applied in a single step of the event loop, so a read never sees
+    a partially applied score and never waits on the queue.
+    """
+
+
+    def __init__(self, num_pins=10, num_frames=10, engine=BowlingGame, max_samples=100000):
+        """Configure the scoring service.
+
+        Args:
+            num_pins: Integer representing the number of pins set up in each frame.
+            num_frames: Integer representing the number of frames in each game.
+            engine: Class used to create each player's game, such as <CompactBowlingGame>.
+            max_samples: Integer representing the number of latest latencies kept for reports.
+        """
+        self.__num_pins = num_pins
+        self.__num_frames = num_frames
+        self.__engine = engine
+        self.__controllers = {}
+        self.__queues = {}
+        self.__workers = {}
+        self.__latencies = deque(maxlen=max_samples)
+
+
+    ##########################
+    ### INTERNAL FUNCTIONS ###
+    ##########################
+
+    def get_lane(self, lane):
+        """Get the controller for an open lane.
+
+        Args:
+            lane: Hashable value identifying the lane.
+
+        Raises:
+            ValueError if the lane is not open.
+
+        Returns:
+            <BowlingController> object for this lane.
+        """
+        controller = self.__controllers.get(lane)
+        if controller is None:
+            raise ValueError('The lane {lane} is not open!'.format(lane=repr(lane)))
+        return controller
+
+
+    async def run_lane(self, lane):
+        """Apply ball scores from a lane's queue in the order they arrive.
+
+        Args:
+            lane: Hashable value identifying the lane.
+        """
+        controller = self.__controllers[lane]
+        queue = self.__queues[lane]
+
+        while True:
+            score, future, posted_at = await queue.get()
+            try:
+                controller.post_new_score(score)
+                if not future.done():
+                    future.set_result(None)
+            except Exception as error: ## Keep the lane running after a rejected score.
+                # Drop the traceback so the caller's error does not hold this worker's frame.
+                if not future.done():
+                    future.set_exception(error.with_traceback(None))
+            finally:
+                self.__latencies.append(time.perf_counter() - posted_at)
+                queue.task_done()
+
+
+    ########################
+    ### PUBLIC FUNCTIONS ###
+    ########################
+
+    def open_lane(self, lane, num_players=2):
+        """Start a new game on a lane. Call this from a running event loop.
+
+        Args:
+            lane: Hashable value identifying the lane.
+            num_players: Integer representing the number of players in this game.
+
+        Raises:
+            ValueError if the lane is already open.
+        """
+        if lane in self.__controllers:
+            raise ValueError('The lane {lane} is already open!'.format(lane=repr(lane)))
+
+        self.__controllers[lane] = BowlingController(num_players, self.__num_pins,
+            self.__num_frames, [], engine=self.__engine)
+        self.__queues[lane] = asyncio.Queue()
+        self.__workers[lane] = asyncio.ensure_future(self.run_lane(lane))
+
+
+    async def close_lane(self, lane):
+        """Wait for a lane's queued ball scores to be applied, then close the lane.
+
+        Args:
+            lane: Hashable value identifying the lane.
+
+        Raises:
+            ValueError if the lane is not open.
+
+        Returns:
+            <BowlingController> object holding the lane's final game state.
+        """
+        controller = self.get_lane(lane)
+        await self.__queues[lane].join()
+
+        worker = self.__workers.pop(lane)
+        worker.cancel()
+        try:
+            await worker
+        except asyncio.CancelledError:
+            pass
+
+        del self.__queues[lane]
+        del self.__controllers[lane]
+        return controller
+
+
+    async def close(self):
+        """Close every open lane."""
+        for lane in list(self.__controllers):
+            await self.close_lane(lane)
+
+
+    def get_current_scores(self, lane):
+        """Returns the current score for all players on a lane.
+
+        Args:
+            lane: Hashable value identifying the lane.
+
+        Returns:
+            List of the latest scores for all players in order of player number.
+        """
+        return self.get_lane(lane).get_current_scores()
+
+
+    def get_frames(self, lane, i):
+        """Get ith frame data for all players on a lane.
+
+        Args:
+            lane: Hashable value identifying the lane.
+            i: Integer representing the desired frame number.
+
+        Returns:
+            List of dictionary objects containing data from the ith frame in order by player.
+        """
+        return self.get_lane(lane).get_frames(i)
+
+
+    def get_latency(self):
+        """Summarize the time from posting a ball score until it is applied.
+
+        Returns:
+            Dictionary containing the sample count and the p50, p99, and max latency in seconds.
+        """
+        samples = sorted(self.__latencies)
+        if not samples:
+            return {'count': 0, 'p50': 0.0, 'p99': 0.0, 'max': 0.0}
+
+        def percentile(p):
+            return samples[min(len(samples) - 1, int(p * len(samples)))]
+
+        return {'count': len(samples), 'p50': percentile(0.50), 'p99': percentile(0.99),
+            'max': samples[-1]}
+
+
+    async def post_new_score(self, lane, score):
+        """Queue a ball score for a lane and wait until it is applied.
+
+        Args:
+            lane: Hashable value identifying the lane.
+            score: Integer representing the number of pins knocked down.
+
+        Raises:
+            ValueError if the lane is not open.
+            ValueError if the controller rejects the score.
+        """
+        self.get_lane(lane)
+        future = asyncio.get_running_loop().create_future()
+        self.__queues[lane].put_nowait((score, future, time.perf_counter()))
+        await future
+
+
+async def simulate_load(num_lanes=200, num_players=4, num_readers=2, seed=None):
+    """Play a full game on many lanes at once while scoreboards poll every lane.
+
+    Args:
+        num_lanes: Integer representing the number of lanes in the bowling center.
+        num_players: Integer representing the number of players on each lane.
+        num_readers: Integer representing the number of scoreboards polling each lane.
+        seed: Value used to seed the random ball scores.
+
+    Returns:
+        Dictionary containing the latency summary from <ScoringService.get_latency>.
+    """
+    rng = random.Random(seed)
+    service = ScoringService()
+    for lane in range(num_lanes):
+        service.open_lane(lane, num_players)
+
+    async def bowl(lane):
+        controller = service.get_lane(lane)
+        players = range(1, num_players + 1)
+        while not all(controller.is_game_over(p) for p in players):
+            try:
+                await service.post_new_score(lane, rng.randint(0, 10))
+            except ValueError:
+                await service.post_new_score(lane, 0) ## More pins than were left standing.
+
+    async def poll(lane, done):
+        while not done.is_set():
+            service.get_current_scores(lane)
+            service.get_frames(lane, 1)
+            await asyncio.sleep(0)
+
+    done = asyncio.Event()
+    readers = [asyncio.ensure_future(poll(lane, done))
+        for lane in range(num_lanes) for _ in range(num_readers)]
+    await asyncio.gather(*(bowl(lane) for lane in range(num_lanes)))
+    done.set()
+    await asyncio.gather(*readers)
+    await service.close()
+
+    return service.get_latency()
+
+
+if __name__ == '__main__':
+    print(asyncio.run(simulate_load()))
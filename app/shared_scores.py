@@ -0,0 +1,360 @@
+"""shared_scores.py
+
+Provides a table of bowling scores in shared memory, so lanes can be scored in worker processes
+while any other process reads every lane's scores directly. Each lane has a fixed-size slot
+holding every player's ball scores, frame scores, and running totals, and a version counter
+that lets readers detect a slot being written while they copy it.
+"""
+
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+import struct
+import time
+
+from .helpers import read_only
+
+
+# Header layout: magic, layout version, players per lane, number of lanes, pins, frames.
+HEADER = struct.Struct('<4sHHIHH')
+MAGIC = b'BWLS'
+LAYOUT_VERSION = 1
+NO_SCORE = -1 ## Marks a frame score that cannot be calculated yet or a frame not yet started.
+
+
+class SharedScoreTable(object):
+    """Fixed-layout score slots for many lanes in one shared memory block.
+
+    Every value is a 32-bit integer. Each lane slot starts with a 64-bit version counter
+    followed by the current player and the number of players, then one block per player
+    holding the number of ball scores, the ball scores, the frame scores, and the running
+    totals. A writer makes the version odd while it publishes a lane and even when it is done,
+    so a reader that sees an odd version, or a different version after copying the slot, reads
+    the slot again.
+
+    Only one process should publish each lane. Any number of processes may attach to the table
+    read-only with <attach>.
+
+    Example:
+        table = SharedScoreTable.create(num_lanes=40, num_players=6)
+        table.publish(7, controller) ## In the worker process scoring lane 7.
+        SharedScoreTable.attach(table.name).get_current_scores(7) ## In any other process.
+    """
+
+
+    def __init__(self, memory, writable):
+        """Map the table layout onto a shared memory block. Use <create> or <attach> instead.
+
+        Args:
+            memory: <SharedMemory> object holding the table.
+            writable: Boolean value indicating whether this process may publish to the table.
+
+        Raises:
+            ValueError if the shared memory block does not hold a score table.
+        """
+        magic, layout_version, num_players, num_lanes, num_pins, num_frames = \
+            HEADER.unpack_from(memory.buf)
+        if magic != MAGIC or layout_version != LAYOUT_VERSION:
+            raise ValueError('The shared memory block {name} is not a score table!' \
+                .format(name=repr(memory.name)))
+
+        self.__memory = memory
+        self.__writable = writable
+        self.__num_lanes = num_lanes
+        self.__num_players = num_players
+        self.__num_pins = num_pins
+        self.__num_frames = num_frames
+        self.__max_rolls = 2 * num_frames + 2 ## Two balls per frame and two bonus balls.
+        self.__player_size = 1 + self.__max_rolls + 2 * num_frames
+        self.__slot_size = get_slot_size(num_players, num_frames)
+
+        buf = memory.buf if writable else memory.buf.toreadonly()
+        table = buf[HEADER.size:HEADER.size + 4 * num_lanes * self.__slot_size]
+        self.__ints = table.cast('i')
+        self.__versions = table.cast('Q') ## Slot sizes are even, so each version is aligned.
+
+
+    def __enter__(self):
+        """Use the table as a context manager."""
+        return self
+
+
+    def __exit__(self, *exc_info):
+        """Close the table when leaving the context."""
+        self.close()
+
+
+    @read_only
+    def name(self):
+        """Returns the name other processes use to attach to the shared memory block."""
+        return self.__memory.name
+
+
+    @read_only
+    def NUM_LANES(self):
+        """Returns the number of lane slots in the table."""
+        return self.__num_lanes
+
+
+    ##########################
+    ### INTERNAL FUNCTIONS ###
+    ##########################
+
+    def check_lane(self, lane):
+        """Check that a lane has a slot in the table.
+
+        Args:
+            lane: Integer identifying the lane (zero-indexed).
+
+        Raises:
+            ValueError if the lane does not have a slot.
+        """
+        if not (type(lane) is int and 0 <= lane < self.__num_lanes):
+            raise ValueError('The lane should be a number between 0 and {last}!' \
+                .format(last=self.__num_lanes - 1))
+
+
+    def read_slot(self, lane, retries):
+        """Copy a lane slot, reading it again if a writer changed it during the copy.
+
+        Args:
+            lane: Integer identifying the lane (zero-indexed).
+            retries: Integer representing the number of times to read a changing slot.
+
+        Raises:
+            ValueError if the lane does not have a slot.
+            RuntimeError if the slot changed on every read.
+
+        Returns:
+            Tuple containing the version and a list of integers holding the slot.
+        """
+        self.check_lane(lane)
+        start = lane * self.__slot_size
+        index = start // 2
+        versions = self.__versions
+        ints = self.__ints
+
+        for attempt in range(retries):
+            version = versions[index]
+            if not version & 1:
+                slot = ints[start:start + self.__slot_size].tolist()
+                if versions[index] == version:
+                    return version // 2, slot
+            time.sleep(0) ## Let the writer finish.
+
+        raise RuntimeError('The lane {lane} changed on every read!'.format(lane=lane))
+
+
+    ########################
+    ### PUBLIC FUNCTIONS ###
+    ########################
+
+    @classmethod
+    def attach(cls, name):
+        """Attach read-only to a table created by another process.
+
+        Args:
+            name: String representing the name of the shared memory block.
+
+        Raises:
+            ValueError if the shared memory block does not hold a score table.
+
+        Returns:
+            <SharedScoreTable> object that reads the table.
+        """
+        return cls(attach_memory(name), False)
+
+
+    def close(self):
+        """Stop using the table in this process without removing it."""
+        self.__ints.release()
+        self.__versions.release()
+        self.__memory.close()
+
+
+    @classmethod
+    def create(cls, num_lanes, num_players=6, num_pins=10, num_frames=10, name=None):
+        """Create a table with an empty slot for each lane.
+
+        Args:
+            num_lanes: Integer representing the number of lanes.
+            num_players: Integer representing the most players in one lane's game.
+            num_pins: Integer representing the number of pins set up in each frame.
+            num_frames: Integer representing the number of frames in each game.
+            name: String representing the name of the shared memory block, or None to pick one.
+
+        Returns:
+            <SharedScoreTable> object that may publish to the table.
+        """
+        num_lanes = max(num_lanes, 1)
+        num_players = max(num_players, 1)
+        num_frames = max(num_frames, 1)
+        size = HEADER.size + 4 * num_lanes * get_slot_size(num_players, num_frames)
+
+        memory = shared_memory.SharedMemory(name, create=True, size=size)
+        HEADER.pack_into(memory.buf, 0, MAGIC, LAYOUT_VERSION, num_players, num_lanes,
+            max(num_pins, 1), num_frames)
+        return cls(memory, True)
+
+
+    def get_current_scores(self, lane, retries=1000):
+        """Returns the current score for all players on a lane.
+
+        Args:
+            lane: Integer identifying the lane (zero-indexed).
+            retries: Integer representing the number of times to read a changing slot.
+
+        Raises:
+            ValueError if the lane does not have a slot.
+            RuntimeError if the slot changed on every read.
+
+        Returns:
+            List of the latest scores for all players in order of player number, where a
+            player who has not started has a score of None.
+        """
+        return [next((total for total in reversed(player['running_totals'])
+            if total is not None), None) for player in self.read_lane(lane, retries)['players']]
+
+
+    def publish(self, lane, controller):
+        """Copy every player's ball scores, frame scores, and running totals to a lane slot.
+
+        Call this from the one process that scores the lane after posting ball scores.
+
+        Args:
+            lane: Integer identifying the lane (zero-indexed).
+            controller: <BowlingController> object holding the lane's game.
+
+        Raises:
+            ValueError if the lane does not have a slot.
+            ValueError if the table is attached read-only.
+            ValueError if the controller has more players than a slot holds.
+            ValueError if the controller's games have a different number of pins or frames,
+                or a player has more ball scores than a slot holds. The slot is not changed.
+        """
+        self.check_lane(lane)
+        if not self.__writable:
+            raise ValueError('The score table is attached read-only!')
+        if controller.NUM_PLAYERS > self.__num_players:
+            raise ValueError('The lane slots only hold {num} players!' \
+                .format(num=self.__num_players))
+        if (controller.NUM_PINS, controller.NUM_FRAMES) != (self.__num_pins, self.__num_frames):
+            raise ValueError('The controller should have {pins} pins and {frames} frames!' \
+                .format(pins=repr(self.__num_pins), frames=repr(self.__num_frames)))
+
+        num_frames = self.__num_frames
+        blocks = []
+        for player in range(1, controller.NUM_PLAYERS + 1):
+            rolls = controller.get_rolls(player)
+            if len(rolls) > self.__max_rolls:
+                raise ValueError('The lane slots only hold {num} ball scores per player!' \
+                    .format(num=self.__max_rolls))
+            frames = controller.get_game_state(player)[:num_frames]
+            frame_scores = [frame.get('frame_score', NO_SCORE) for frame in frames]
+            running_totals = [frame.get('running_total', NO_SCORE) for frame in frames]
+            padding = [NO_SCORE] * (num_frames - len(frames))
+            blocks.append(array('i', [len(rolls)] + rolls +
+                [0] * (self.__max_rolls - len(rolls)) + frame_scores + padding +
+                running_totals + padding))
+
+        # Make the version odd while the slot is written, then even again.
+        start = lane * self.__slot_size
+        index = start // 2
+        ints = self.__ints
+        version = self.__versions[index] | 1
+        self.__versions[index] = version
+        try:
+            ints[start + 2] = controller.get_current_player()
+            ints[start + 3] = controller.NUM_PLAYERS
+            at = start + 4
+            for block in blocks:
+                ints[at:at + len(block)] = block
+                at += len(block)
+        finally:
+            self.__versions[index] = version + 1
+
+
+    def read_lane(self, lane, retries=1000):
+        """Read a consistent copy of a lane slot.
+
+        Args:
+            lane: Integer identifying the lane (zero-indexed).
+            retries: Integer representing the number of times to read a changing slot.
+
+        Raises:
+            ValueError if the lane does not have a slot.
+            RuntimeError if the slot changed on every read.
+
+        Returns:
+            Dictionary object containing the number of times the lane was published, the
+            current player (one-indexed), and a list with a dictionary object for each player
+            holding its ball scores, frame scores, and running totals. Frame scores that
+            cannot be calculated yet and frames not yet started are None.
+        """
+        version, slot = self.read_slot(lane, retries)
+        num_frames = self.__num_frames
+        max_rolls = self.__max_rolls
+
+        players = []
+        for p in range(slot[3]):
+            at = 4 + p * self.__player_size
+            rolls = slot[at + 1:at + 1 + slot[at]]
+            at += 1 + max_rolls
+            players.append({
+                'rolls': rolls,
+                'frame_scores': [None if score == NO_SCORE else score
+                    for score in slot[at:at + num_frames]],
+                'running_totals': [None if total == NO_SCORE else total
+                    for total in slot[at + num_frames:at + 2 * num_frames]],
+            })
+
+        return {'version': version, 'current_player': slot[2], 'players': players}
+
+
+    def unlink(self):
+        """Remove the shared memory block once every process has closed it."""
+        self.__memory.unlink()
+
+
+def attach_memory(name):
+    """Attach to a shared memory block without tracking it in this process.
+
+    A tracked block is removed when the attaching process exits, so only the creating process
+    should track it. Python 3.13 added an argument that turns tracking off; older versions
+    always register the block, so registering is skipped while attaching.
+
+    Args:
+        name: String representing the name of the shared memory block.
+
+    Returns:
+        <SharedMemory> object attached to the block.
+    """
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        pass
+
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name)
+    finally:
+        resource_tracker.register = register
+
+
+def get_slot_size(num_players, num_frames):
+    """Get the number of 32-bit integers in one lane slot.
+
+    Args:
+        num_players: Integer representing the most players in one lane's game.
+        num_frames: Integer representing the number of frames in each game.
+
+    Returns:
+        Even integer, so every slot's 64-bit version counter is aligned.
+    """
+    player_size = 1 + (2 * num_frames + 2) + 2 * num_frames
+    size = 4 + num_players * player_size
+    return size + size % 2
+
+
+if __name__ == '__main__':
+    pass
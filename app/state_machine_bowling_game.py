@@ -0,0 +1,436 @@
+"""state_machine_bowling_game.py
+
+Provides a low-level class used to manage bowling game state with a table-driven state machine.
+This class is a drop-in replacement for <BowlingGame> that scores each ball in constant time.
+Do not use this directly for managing a bowling scoring service. Instead, use the
+<bowling_controller.py> module with the <engine> argument.
+"""
+
+from .helpers import FrameView, check_bounds, pack_snapshot, read_only, restrict_bounds, \
+    unpack_snapshot
+from .instrumentation import Instrumented
+
+
+# Each ball is one of these kinds, depending on the frame it lands in.
+FIRST = 0 ## A first ball that leaves pins standing.
+OPEN = 1 ## A second ball that leaves pins standing, which scores the frame right away.
+SPARE = 2 ## A second ball that knocks down the last pins, which scores after one more ball.
+STRIKE = 3 ## A first ball that knocks down every pin, which scores after two more balls.
+BONUS = 4 ## Any ball in a bonus frame, which only counts toward earlier frames.
+NUM_KINDS = 5
+
+BONUS_BALLS = {OPEN: 0, SPARE: 1, STRIKE: 2} ## Balls a frame waits on after it is complete.
+
+
+def build_transition_table():
+    """Build the transitions between pending bonus states for every kind of ball.
+
+    A state is a tuple holding the number of bonus balls each unscored frame still needs,
+    oldest frame first, and whether the current frame is waiting on its second ball. For
+    example, ((1, 2), False) follows two strikes in a row. Every ball counts toward every
+    waiting frame, then a frame completed by the ball joins the end of the tuple.
+
+    Returns:
+        Tuple containing the list of states and the transition list. The transition for
+        state s and ball kind k is at index s * NUM_KINDS + k and holds the next state and the
+        number of frames at the front of the waiting list that are now scored, or None if
+        that kind of ball cannot follow the state.
+    """
+    states = [((), False)]
+    index = {states[0]: 0}
+    transitions = []
+
+    # Visit every state reachable from the start of a game.
+    for needs, is_second_ball in states:
+        for kind in range(NUM_KINDS):
+            if (kind in (OPEN, SPARE)) != is_second_ball:
+                transitions.append(None)
+                continue
+
+            next_needs = [need - 1 for need in needs]
+            if kind in BONUS_BALLS:
+                next_needs.append(BONUS_BALLS[kind])
+
+            scored = 0
+            while scored < len(next_needs) and next_needs[scored] == 0:
+                scored += 1
+
+            next_state = (tuple(next_needs[scored:]), kind == FIRST)
+            if next_state not in index:
+                index[next_state] = len(states)
+                states.append(next_state)
+            transitions.append((index[next_state], scored))
+
+    return states, transitions
+
+
+STATES, TRANSITIONS = build_transition_table()
+
+
+class StateMachineBowlingGame(Instrumented):
+    """Manage bowling game scores and state using a table-driven state machine.
+
+    Rather than walking linked frames to find bonus balls, the game tracks which frames still
+    wait on bonus balls as one of a few states. Each ball looks up the next state and the
+    number of frames it finishes scoring in <TRANSITIONS>, adds its pins to the waiting frames,
+    and updates the running totals of the latest frames. Frame dictionary objects are only
+    built when a caller reads them, so the public interface returns the same data as
+    <BowlingGame>.
+
+    Example:
+        rolls   = [10, 10, 4]
+        state   = ((1, 2), False) -> ((1,), True) ## The 4 scores the first strike only.
+        bonus   = [[1, 14]] ## Frame 2 has 10 pins plus 4 so far.
+    """
+
+    INSTRUMENTED = ('add_ball_score', 'get_frame_data', 'get_game_state', 'is_frame_complete',
+        'is_game_over', 'post_new_score', 'post_new_scores', 'post_trusted_score')
+
+
+    def __init__(self, num_pins=10, num_frames=10, rolls=None):
+        """Configure the bowling game.
+
+        Args:
+            num_pins: Integer representing the number of pins set up in each frame.
+            num_frames: Integer representing the number of frames in this game.
+            rolls: Iterable of ball scores used to replay a game in progress.
+        """
+        self.__num_pins = num_pins if num_pins >= 1 else 1
+        self.__num_frames = num_frames if num_frames >= 1 else 1
+
+        # Frame data is kept in parallel lists indexed by the zero-indexed frame.
+        self.__rolls = []
+        self.__ball_1 = []
+        self.__ball_2 = [] ## None marks a frame waiting on its second ball.
+        self.__frame_score = [] ## None marks a frame that is not scored.
+        self.__running_total = []
+
+        self.__state = 0 ## Index of the pending bonus state in <STATES>.
+        self.__bonus = [] ## A [frame, score so far] list for each frame waiting on bonus balls.
+        self.__pending = None ## Ball scores from a snapshot that have not been replayed yet.
+
+        if rolls:
+            self.post_new_scores(rolls)
+
+
+    @read_only
+    def NUM_PINS(self):
+        """Returns the total number of frame pins in this bowling game."""
+        return self.__num_pins
+
+
+    @read_only
+    def NUM_FRAMES(self):
+        """Returns the total number of frames in this bowling game."""
+        return self.__num_frames
+
+
+    @read_only
+    def current_frame(self):
+        """Returns the current frame, always between 0 and <NUM_FRAMES>."""
+        if self.__pending is not None: self.load_pending()
+        game_len = len(self.__ball_1) ## Zero indicates the game has not started.
+        return game_len if game_len <= self.__num_frames else self.__num_frames
+
+
+    ##########################
+    ### INTERNAL FUNCTIONS ###
+    ##########################
+
+    def add_ball_score(self, score):
+        """Add a new ball score to the game, then update frame scores and running totals.
+
+        Args:
+            score: Integer representing the number of pins knocked down.
+
+        Raises:
+            ValueError if the total frame score is greater than <NUM_PINS>.
+        """
+        # Only proceed if this game is still in progress.
+        if self.is_game_over():
+            return
+
+        num_pins = self.__num_pins
+        ball_1 = self.__ball_1
+        ball_2 = self.__ball_2
+        n = len(ball_1) - 1
+
+        # Complete the last frame if it is still waiting on a second ball.
+        if n >= 0 and ball_2[n] is None:
+            frame_pins = ball_1[n] + score
+            if frame_pins > num_pins:
+                raise ValueError('The total frame score should be no more than {num} pins!' \
+                    .format(num=repr(num_pins)))
+            ball_2[n] = score
+            kind = SPARE if frame_pins == num_pins else OPEN
+
+        # Otherwise this ball starts the next frame. A strike records a second ball of zero.
+        else:
+            n += 1
+            frame_pins = score
+            kind = STRIKE if score == num_pins else FIRST
+            ball_1.append(score)
+            ball_2.append(0 if kind == STRIKE else None)
+            self.__frame_score.append(None)
+            self.__running_total.append(0)
+
+        self.__rolls.append(score)
+
+        # Balls in bonus frames only count toward earlier frames.
+        if n >= self.__num_frames:
+            kind = BONUS
+
+        self.__state, scored = TRANSITIONS[self.__state * NUM_KINDS + kind]
+
+        bonus = self.__bonus
+        for frame in bonus:
+            frame[1] += score
+        if kind in BONUS_BALLS:
+            bonus.append([n, frame_pins])
+
+        frame_score = self.__frame_score
+        for i in range(scored):
+            frame, total = bonus.pop(0)
+            frame_score[frame] = total
+
+        # Only frames waiting on this ball and the frames after them change their totals.
+        running_total = self.__running_total
+        start = max(0, len(ball_1) - 3)
+        total = running_total[start - 1] if start > 0 else 0
+        for i in range(start, len(ball_1)):
+            if frame_score[i] is not None:
+                total += frame_score[i]
+            running_total[i] = total
+
+
+    def build_frame(self, n):
+        """Build a dictionary containing the data that describes the zero-indexed frame n.
+
+        Args:
+            n: Integer representing the zero-indexed frame.
+
+        Returns:
+            Dictionary containing the same keys as a <BowlingGame> frame without a link.
+        """
+        ball_1_score = self.__ball_1[n]
+        ball_2_score = self.__ball_2[n]
+        is_strike = ball_1_score == self.__num_pins
+
+        frame = {'ball_1_score': ball_1_score}
+        if ball_2_score is not None:
+            frame['ball_2_score'] = ball_2_score
+
+        frame['is_spare'] = not is_strike and ball_2_score is not None and \
+            ball_1_score + ball_2_score == self.__num_pins
+        frame['is_strike'] = is_strike
+
+        if self.__frame_score[n] is not None:
+            frame['frame_score'] = self.__frame_score[n]
+        frame['running_total'] = self.__running_total[n]
+
+        return frame
+
+
+    def calculate_frame_scores(self, start=None):
+        """Frame scores are updated as each ball score is added, so there is nothing to do.
+
+        Args:
+            start: Integer representing the zero-indexed frame from which to calculate every
+                later frame score, or None to calculate the three latest frame scores.
+        """
+
+
+    def calculate_running_total(self, start=None):
+        """Running totals are updated as each ball score is added, so there is nothing to do.
+
+        Args:
+            start: Integer representing the zero-indexed frame from which to calculate every
+                later running total, or None to calculate the three latest running totals.
+        """
+
+
+    def is_frame_incomplete(self, n):
+        """Determine whether the zero-indexed frame n has a remaining ball.
+
+        Args:
+            n: Integer representing the zero-indexed frame.
+
+        Returns:
+            Boolean value indicating whether the frame is incomplete.
+        """
+        return n < 0 or n >= len(self.__ball_1) or self.__ball_2[n] is None
+
+
+    def load_pending(self):
+        """Replay ball scores restored from a snapshot."""
+        rolls, self.__pending = self.__pending, None
+        self.post_new_scores(rolls, trusted=True)
+
+
+    ########################
+    ### PUBLIC FUNCTIONS ###
+    ########################
+
+    def get_frame_data(self, i):
+        """Get basic frame data associated with the ith frame.
+
+        Args:
+            i: Integer representing the desired frame number.
+
+        Returns:
+            Dictionary containing data from the ith frame without the next frame link.
+        """
+        # Return an empty dictionary for invalid frame requests.
+        if i <= 0 or i > self.current_frame:
+            return {}
+
+        return self.build_frame(i-1)
+
+
+    def get_game_state(self, copy=False):
+        """Returns read-only views of the game state, or a copy of it, built from the frame lists.
+
+        Args:
+            copy: Boolean value indicating whether to return a copy that may be changed.
+
+        Returns:
+            List of <FrameView> objects, or of dictionary objects if copy is True, representing
+            the state of each frame.
+        """
+        if self.__pending is not None: self.load_pending()
+        state = [self.build_frame(n) for n in range(len(self.__ball_1))]
+        for n in range(len(state) - 1):
+            state[n]['next_frame'] = state[n+1]
+        return state if copy else [FrameView(frame) for frame in state]
+
+
+    def get_rolls(self):
+        """Returns every ball score in the order it was rolled.
+
+        Returns:
+            List of integers representing the number of pins knocked down by each ball.
+        """
+        if self.__pending is not None:
+            return list(self.__pending)
+        return list(self.__rolls)
+
+
+    @restrict_bounds(1, lambda self: self.NUM_FRAMES)
+    def is_frame_complete(self, i):
+        """Determines whether the specified frame has ended.
+
+        Args:
+            i: Integer representing the desired frame.
+
+        Returns:
+            Boolean value representing whether the frame has ended.
+        """
+        if self.__pending is not None: self.load_pending()
+        return not self.is_frame_incomplete(i-1)
+
+
+    def is_game_over(self):
+        """Determine whether the game is over.
+
+        Returns:
+            Boolean value representing whether the game should continue.
+        """
+        if self.__pending is not None: self.load_pending()
+        num_frames = self.__num_frames
+        num_pins = self.__num_pins
+        frame_count = len(self.__ball_1)
+
+        if frame_count < num_frames:
+            return False ## The game is not in the last frame.
+
+        ball_1_score = self.__ball_1[-1]
+        ball_2_score = self.__ball_2[-1]
+
+        # The last frame is incomplete or gets bonus ball(s).
+        if frame_count == num_frames:
+            return ball_2_score is not None and ball_1_score + ball_2_score < num_pins
+
+        # There is another bonus ball.
+        elif frame_count == num_frames + 1:
+            prev_is_strike = self.__ball_1[-2] == num_pins
+            return not (prev_is_strike and ball_2_score is None or ball_1_score == num_pins)
+
+        return True
+
+
+    def post_trusted_score(self, score):
+        """Add a new ball score without checking its bounds, then update all scores.
+
+        Use this only for scores from a trusted source, such as lane hardware, that always
+        reports an integer between 0 and <NUM_PINS>. Any other score is undefined behavior.
+
+        Args:
+            score: Integer representing the number of pins knocked down between [0, NUM_PINS].
+        """
+        self.add_ball_score(score)
+
+
+    @restrict_bounds(0, lambda self: self.NUM_PINS)
+    def post_new_score(self, score):
+        """Add a new ball score, then update frame scores and running totals.
+
+        Args:
+            score: Integer representing the number of pins knocked down between [0, NUM_PINS].
+        """
+        self.add_ball_score(score)
+
+
+    def post_new_scores(self, scores, trusted=False):
+        """Add a sequence of ball scores, updating scores as each one is added.
+
+        Every score is checked before any is added. If a score cannot be added to its frame,
+        the scores before it are kept before the error is raised.
+
+        Args:
+            scores: Iterable of integers representing the number of pins knocked down.
+            trusted: Boolean value indicating whether to skip checking the score bounds.
+
+        Raises:
+            ValueError if a score is not a number between 0 and <NUM_PINS>.
+            ValueError if a frame score is greater than <NUM_PINS>.
+        """
+        scores = scores if trusted else check_bounds(scores, 0, self.NUM_PINS)
+        add_ball_score = self.add_ball_score
+        for score in scores:
+            add_ball_score(score)
+
+
+    @classmethod
+    def restore(cls, data):
+        """Create a game from a snapshot built by <snapshot> on any game class.
+
+        Only the ball scores are restored at first. They are replayed and scored the first time
+        the game is read or a ball score is posted, so restoring many games is fast.
+
+        Args:
+            data: Bytes-like object containing a game snapshot.
+
+        Raises:
+            ValueError if the snapshot is not valid.
+
+        Returns:
+            <StateMachineBowlingGame> object holding the restored game.
+        """
+        num_pins, num_frames, rolls = unpack_snapshot(data)
+        game = cls(num_pins, num_frames)
+        if rolls:
+            game.__pending = rolls
+        return game
+
+
+    def snapshot(self):
+        """Returns the game configuration and ball scores packed into a compact byte string.
+
+        Returns:
+            Bytes object to pass to <restore> on any game class.
+        """
+        return pack_snapshot(self.__num_pins, self.__num_frames, self.get_rolls())
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,335 @@
+"""stats_aggregator.py
+
+Provides a class used to count strikes, spares, open frames, and first ball pins for every
+bowler and lane across any number of games. Ball scores are consumed one at a time or a game at
+a time, so game states are never built, and each bowler and lane only keeps a few counters.
+"""
+
+from .helpers import check_bounds
+from .roll_log import RollLog
+
+
+# Counters kept for each bowler and lane.
+FIELDS = ('games', 'frames', 'strikes', 'spares', 'first_balls', 'first_ball_pins')
+GAMES, FRAMES, STRIKES, SPARES, FIRST_BALLS, FIRST_BALL_PINS = range(len(FIELDS))
+SPARE_BONUS = -1 ## One bonus ball after a last frame spare, and another if it is a strike.
+
+
+class StatsAggregator(object):
+    """Count frame results for every bowler and lane from a stream of ball scores.
+
+    Each bowler and lane keeps the same six counters however many games it bowls, and only the
+    latest game of each bowler on each lane keeps its place in the game. Aggregators built in
+    different worker processes can be pickled and combined with <merge>. Ball scores do not
+    record which pins were left standing, so splits are not counted.
+
+    A game follows the same rules as <BowlingGame>, including its bonus balls, so a roll feed
+    or roll log recorded from a controller is counted frame for frame.
+
+    Example:
+        stats = StatsAggregator()
+        stats.add_rolls([10, 7, 3, 9, 0], 'Ada', lane=7)
+        stats.add_roll(8, 'Ada', lane=7, game=2) ## One ball at a time as it is rolled.
+        stats.get_bowler_stats('Ada')['strike_rate'] ## 0.333...
+    """
+
+
+    def __init__(self, num_pins=10, num_frames=10):
+        """Configure the aggregator.
+
+        Args:
+            num_pins: Integer representing the number of pins set up in each frame.
+            num_frames: Integer representing the number of frames in each game.
+        """
+        self.__num_pins = max(num_pins, 1)
+        self.__num_frames = max(num_frames, 1)
+        self.__bowlers = {} ## The counters of each bowler keyed by bowler.
+        self.__lanes = {} ## The counters of each lane keyed by lane.
+        self.__games = {} ## The latest game and its state keyed by (bowler, lane).
+
+
+    ##########################
+    ### INTERNAL FUNCTIONS ###
+    ##########################
+
+    def add_counts(self, counts, bowler, lane):
+        """Add counters to a bowler and, if given, a lane.
+
+        Args:
+            counts: List of integers in the order of <FIELDS>.
+            bowler: Hashable value identifying the bowler.
+            lane: Hashable value identifying the lane, or None.
+        """
+        add_counts(self.__bowlers, bowler, counts)
+        if lane is not None:
+            add_counts(self.__lanes, lane, counts)
+
+
+    def roll(self, state, pins, counts):
+        """Advance a game by one ball score and count the frame it completes, if any.
+
+        Args:
+            state: Tuple containing the number of frames completed, the first ball score of
+                the frame in progress or None, and the number of bonus balls left or None.
+            pins: Integer representing the number of pins knocked down.
+            counts: List of integers in the order of <FIELDS> to count the ball in.
+
+        Raises:
+            ValueError if the ball knocks down more pins than are standing.
+
+        Returns:
+            The game's next state, or None if the game is over.
+        """
+        num_pins = self.__num_pins
+        frame, ball_1, bonus = state
+        if ball_1 is not None and ball_1 + pins > num_pins:
+            raise ValueError('The total frame score should be no more than {num} pins!' \
+                .format(num=repr(num_pins)))
+
+        # Bonus balls after the last frame are not counted as frames.
+        if bonus is not None:
+            if bonus == SPARE_BONUS:
+                bonus = 1 if pins == num_pins else 0
+                ball_1 = None
+            else:
+                bonus -= 1
+                ball_1 = None if ball_1 is not None or pins == num_pins else pins
+            return None if bonus == 0 else (frame, ball_1, bonus)
+
+        if ball_1 is None:
+            counts[FIRST_BALLS] += 1
+            counts[FIRST_BALL_PINS] += pins
+            if pins < num_pins:
+                return frame, pins, None
+            counts[STRIKES] += 1
+            bonus = 2
+        elif ball_1 + pins == num_pins:
+            counts[SPARES] += 1
+            bonus = SPARE_BONUS
+        else:
+            bonus = 0
+
+        counts[FRAMES] += 1
+        frame += 1
+        if frame < self.__num_frames:
+            return frame, None, None
+        return None if bonus == 0 else (frame, None, bonus)
+
+
+    ########################
+    ### PUBLIC FUNCTIONS ###
+    ########################
+
+    def add_game(self, game, bowler, lane=None):
+        """Count every ball score in a game object from any engine, such as <BowlingGame>.
+
+        Args:
+            game: Game object holding the ball scores.
+            bowler: Hashable value identifying the bowler.
+            lane: Hashable value identifying the lane, or None to only count the bowler.
+        """
+        self.add_rolls(game.get_rolls(), bowler, lane)
+
+
+    def add_roll(self, pins, bowler, lane=None, game=None):
+        """Count one ball score as it is rolled.
+
+        A bowler's game on a lane continues until it is over. Like a controller, later ball
+        scores for the same game are ignored, so a game is needed to tell a new game apart from
+        ball scores posted after the end of the last one. A ball score for a different game
+        starts a new game, even if the last one was never finished. Without a game, the next
+        ball score after a game is over starts a new game.
+
+        Args:
+            pins: Integer representing the number of pins knocked down.
+            bowler: Hashable value identifying the bowler.
+            lane: Hashable value identifying the lane, or None to only count the bowler.
+            game: Hashable value identifying the game, such as a roll log's game number.
+
+        Raises:
+            ValueError if the ball score is not a number between 0 and the number of pins.
+            ValueError if the ball knocks down more pins than are standing.
+        """
+        pins, = check_bounds([pins], 0, self.__num_pins)
+        key = (bowler, lane)
+        latest, state = self.__games.get(key, (None, None))
+        counts = [0] * len(FIELDS)
+        if state is None and game is not None and game == latest:
+            return ## The game is over.
+        if state is None or game != latest:
+            state = (0, None, None) ## Start a new game, leaving any unfinished one.
+            counts[GAMES] = 1
+
+        state = self.roll(state, pins, counts)
+        if state is None and game is None:
+            self.__games.pop(key, None)
+        else:
+            self.__games[key] = (game, state)
+        self.add_counts(counts, bowler, lane)
+
+
+    def add_records(self, records, get_bowler):
+        """Count the ball score records read from a roll log with <roll_log.read_records>.
+
+        Ball scores are counted as they were first posted. Counts cannot be taken back, so
+        correction and undo records are skipped; to count corrected games, rebuild them with
+        <roll_log.restore_controllers> and count each player's game with <add_game>.
+
+        Args:
+            records: Iterable of (lane, game, player, frame, pins, number of players, timestamp,
+                kind, ball) tuples.
+            get_bowler: Function called with the lane, game, and player (one-indexed) that
+                returns the bowler's identity.
+
+        Raises:
+            ValueError if a ball knocks down more pins than are standing.
+        """
+        for lane, game, player, frame, pins, num_players, timestamp, kind, ball in records:
+            if kind == RollLog.ROLL:
+                self.add_roll(pins, get_bowler(lane, game, player), lane, game)
+
+
+    def add_rolls(self, rolls, bowler, lane=None):
+        """Count the ball scores of one game, such as a game from a replay stream.
+
+        Args:
+            rolls: Iterable of integers representing the ball scores from the start of a game.
+            bowler: Hashable value identifying the bowler.
+            lane: Hashable value identifying the lane, or None to only count the bowler.
+
+        Raises:
+            ValueError if a ball score is not a number between 0 and the number of pins.
+            ValueError if a ball knocks down more pins than are standing.
+            ValueError if there are ball scores after the end of the game.
+        """
+        counts = [0] * len(FIELDS)
+        counts[GAMES] = 1
+        state = (0, None, None)
+        for pins in check_bounds(rolls, 0, self.__num_pins):
+            if state is None:
+                raise ValueError('There are ball scores after the end of the game!')
+            state = self.roll(state, pins, counts)
+        self.add_counts(counts, bowler, lane)
+
+
+    def get_bowler_stats(self, bowler):
+        """Get a bowler's counters and rates.
+
+        Args:
+            bowler: Hashable value identifying the bowler.
+
+        Raises:
+            ValueError if the bowler has no ball scores.
+
+        Returns:
+            Dictionary object from <build_stats>.
+        """
+        counts = self.__bowlers.get(bowler)
+        if counts is None:
+            raise ValueError('There are no ball scores for the bowler {bowler}!' \
+                .format(bowler=repr(bowler)))
+        return build_stats(counts)
+
+
+    def get_bowlers(self):
+        """List every bowler with ball scores in the order they were first counted."""
+        return list(self.__bowlers)
+
+
+    def get_lane_stats(self, lane):
+        """Get a lane's counters and rates.
+
+        Args:
+            lane: Hashable value identifying the lane.
+
+        Raises:
+            ValueError if the lane has no ball scores.
+
+        Returns:
+            Dictionary object from <build_stats>.
+        """
+        counts = self.__lanes.get(lane)
+        if counts is None:
+            raise ValueError('There are no ball scores for the lane {lane}!' \
+                .format(lane=repr(lane)))
+        return build_stats(counts)
+
+
+    def get_lanes(self):
+        """List every lane with ball scores in the order they were first counted."""
+        return list(self.__lanes)
+
+
+    def merge(self, other):
+        """Add the counters and games in progress from another aggregator to this one.
+
+        Use this to combine aggregators built from separate parts of a roll feed, such as one
+        from each worker process.
+
+        Args:
+            other: <StatsAggregator> object with the same number of pins and frames.
+
+        Raises:
+            ValueError if the aggregators count games with different numbers of pins or frames.
+            ValueError if both aggregators have a game in progress for the same bowler and lane.
+        """
+        if (other.__num_pins, other.__num_frames) != (self.__num_pins, self.__num_frames):
+            raise ValueError('The aggregators count games with different rules!')
+
+        # Keep the game in progress for each bowler and lane.
+        games = self.__games
+        for key, (game, state) in other.__games.items():
+            if key in games and games[key][1] is not None:
+                if state is not None:
+                    raise ValueError('Both aggregators have a game in progress for {key}!' \
+                        .format(key=repr(key)))
+                continue
+            games[key] = (game, state)
+
+        for bowler, counts in other.__bowlers.items():
+            add_counts(self.__bowlers, bowler, counts)
+        for lane, counts in other.__lanes.items():
+            add_counts(self.__lanes, lane, counts)
+
+
+def add_counts(table, key, counts):
+    """Add counters to the totals kept for a key, starting them if needed.
+
+    Args:
+        table: Dictionary object holding a list of counters for each key.
+        key: Hashable value identifying a bowler or lane.
+        counts: List of integers in the order of <FIELDS>.
+    """
+    totals = table.get(key)
+    if totals is None:
+        table[key] = list(counts)
+    else:
+        for i, count in enumerate(counts):
+            totals[i] += count
+
+
+def build_stats(counts):
+    """Build the counters and rates for a bowler or lane.
+
+    Args:
+        counts: List of integers in the order of <FIELDS>.
+
+    Returns:
+        Dictionary object containing each counter, the number of open frames, the strike rate
+        and open frame rate out of all frames, the spare rate out of frames without a strike,
+        and the average first ball score. A rate with nothing to divide by is None.
+    """
+    stats = dict(zip(FIELDS, counts))
+    frames = stats['frames']
+    chances = frames - stats['strikes'] ## Frames that left pins for a spare.
+    stats['opens'] = chances - stats['spares']
+    stats['strike_rate'] = stats['strikes'] / frames if frames else None
+    stats['spare_rate'] = stats['spares'] / chances if chances else None
+    stats['open_rate'] = stats['opens'] / frames if frames else None
+    stats['first_ball_average'] = stats['first_ball_pins'] / stats['first_balls'] \
+        if stats['first_balls'] else None
+    return stats
+
+
+if __name__ == '__main__':
+    pass
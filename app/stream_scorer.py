@@ -0,0 +1,232 @@
+"""stream_scorer.py
+
+Provides a command line scorer for roll feeds too large to load into memory. Each roll is a
+CSV row or JSON line holding a lane, game, player, and pin count. Rolls are read one at a time,
+each bowler's game is scored by its own <BowlingController>, and a game's frame data is written
+as a JSON line as soon as the game is over, so only open games are kept in memory.
+
+Examples:
+    python -m app < rolls.csv > games.jsonl
+    python -m app --format jsonl --engine state-machine rolls.jsonl
+"""
+
+import argparse
+import csv
+from functools import partial
+from itertools import chain
+import json
+import sys
+
+from .bowling_controller import BowlingController
+from .bowling_game import BowlingGame
+from .compact_bowling_game import CompactBowlingGame
+from .state_machine_bowling_game import StateMachineBowlingGame
+
+
+# Scores are only read once a game is over, so <BowlingGame> calculates them lazily.
+ENGINES = {'bowling': partial(BowlingGame, lazy=True), 'compact': CompactBowlingGame,
+    'state-machine': StateMachineBowlingGame}
+FIELDS = ('lane', 'game', 'player', 'pins')
+
+
+def read_csv(lines):
+    """Read rolls from CSV rows. A header row, if any, may list the columns in any order.
+
+    Args:
+        lines: Iterable of strings, such as an open file.
+
+    Yields:
+        Tuple containing the line number, lane, game, player, and pin count as read.
+    """
+    columns = None
+    for n, row in enumerate(csv.reader(lines), 1):
+        if not row:
+            continue
+        if columns is None:
+            names = [name.strip().lower() for name in row]
+            if set(FIELDS) <= set(names):
+                columns = [names.index(field) for field in FIELDS]
+                continue ## Skip the header row.
+            columns = range(len(FIELDS))
+        try:
+            yield (n,) + tuple(row[i] for i in columns)
+        except IndexError:
+            yield n, None, None, None, None
+
+
+def read_jsonl(lines):
+    """Read rolls from JSON lines, each holding one object with lane, game, player, and pins keys.
+
+    Args:
+        lines: Iterable of strings, such as an open file.
+
+    Yields:
+        Tuple containing the line number, lane, game, player, and pin count as read.
+    """
+    for n, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            roll = json.loads(line)
+            yield (n,) + tuple(roll[field] for field in FIELDS)
+        except (ValueError, KeyError, TypeError):
+            yield n, None, None, None, None
+
+
+def parse_pins(pins):
+    """Read a pin count given as an integer or as a string of digits.
+
+    Args:
+        pins: Pin count as read, such as 7 from JSON or '7' from CSV.
+
+    Raises:
+        ValueError if the pin count is not a whole number, such as 3.7, true, or 'x'.
+
+    Returns:
+        Integer representing the pin count.
+    """
+    if type(pins) is int:
+        return pins
+    if isinstance(pins, str) and pins.strip().lstrip('+-').isdigit():
+        return int(pins)
+    raise ValueError('The pins {pins} should be a whole number!'.format(pins=repr(pins)))
+
+
+def read_rolls(lines, format='auto'):
+    """Read rolls from CSV rows or JSON lines.
+
+    Args:
+        lines: Iterable of strings, such as an open file.
+        format: String that is 'csv', 'jsonl', or 'auto' to choose from the first line.
+
+    Yields:
+        Tuple containing the line number, lane, game, player, and pin count as read.
+    """
+    lines = iter(lines)
+    if format == 'auto':
+        first = next(lines, '')
+        format = 'jsonl' if first.lstrip().startswith('{') else 'csv'
+        lines = chain([first], lines)
+    reader = read_jsonl if format == 'jsonl' else read_csv
+    yield from reader(lines)
+
+
+def build_result(lane, game, player, controller, num_frames):
+    """Collect the frame data for a bowler's game.
+
+    Args:
+        lane: Value identifying the lane, as read.
+        game: Value identifying the game on this lane, as read.
+        player: Value identifying the bowler in this game, as read.
+        controller: <BowlingController> object holding the bowler's game.
+        num_frames: Integer representing the number of frames in each game.
+
+    Returns:
+        Dictionary object containing the lane, game, player, final score, game over status,
+        and a list of frame dictionary objects.
+    """
+    frames = [dict(controller.get_frame_data(i, 1)) for i in range(1, num_frames + 1)]
+    return {'lane': lane, 'game': game, 'player': player,
+        'score': controller.get_current_score(1), 'game_over': controller.is_game_over(1),
+        'frames': [frame for frame in frames if frame]}
+
+
+def score_rolls(rolls, num_pins=10, num_frames=10, engine=BowlingGame, on_error=None):
+    """Score a stream of rolls, yielding each bowler's game as soon as it is over.
+
+    Each bowler is identified by a (lane, game, player) tuple and scored by a one player
+    <BowlingController>, so rolls from different bowlers may be interleaved in any order.
+    A finished game is dropped from memory, so a later roll for the same bowler starts a new
+    game. Games still open at the end of the stream are yielded last with a game over status
+    of False.
+
+    Args:
+        rolls: Iterable of (line number, lane, game, player, pins) tuples from <read_rolls>.
+        num_pins: Integer representing the number of pins set up in each frame.
+        num_frames: Integer representing the number of frames in each game.
+        engine: Class used to create each bowler's game, such as <CompactBowlingGame>.
+        on_error: Function called with the line number and a message for each invalid roll
+            before skipping it, or None to raise an error.
+
+    Raises:
+        ValueError if a roll is invalid and there is no on_error function.
+
+    Yields:
+        Dictionary objects from <build_result>.
+    """
+    games = {}
+    for n, lane, game, player, pins in rolls:
+        try:
+            if lane is None:
+                raise ValueError('The roll does not have a lane, game, player, and pins!')
+            key = (lane, game, player)
+            controller = games.get(key)
+            if controller is None:
+                controller = BowlingController(1, num_pins, num_frames, [], engine=engine)
+            controller.post_new_score(parse_pins(pins))
+            games[key] = controller ## Keep a new game only once it has a valid roll.
+        except (ValueError, TypeError) as error:
+            if on_error is None:
+                raise ValueError('Line {n}: {error}'.format(n=n, error=error))
+            on_error(n, str(error))
+            continue
+
+        if controller.is_game_over(1):
+            del games[key]
+            yield build_result(lane, game, player, controller, num_frames)
+
+    for (lane, game, player), controller in games.items():
+        yield build_result(lane, game, player, controller, num_frames)
+
+
+def main(argv=None):
+    """Score roll feeds from files or stdin and write each finished game as a JSON line.
+
+    Args:
+        argv: List of command line arguments, or None to use <sys.argv>.
+
+    Returns:
+        Integer exit status that is 1 if any roll was invalid.
+    """
+    parser = argparse.ArgumentParser(prog='python -m app',
+        description='Score CSV or JSON lines roll feeds of lane, game, player, and pins.')
+    parser.add_argument('files', nargs='*', default=['-'],
+        help='roll feed files to read in order, or - for stdin (default)')
+    parser.add_argument('--format', choices=['auto', 'csv', 'jsonl'], default='auto',
+        help='roll feed format, chosen from the first line by default')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='bowling',
+        help='scoring engine for each game')
+    parser.add_argument('--pins', type=int, default=10, help='number of pins in each frame')
+    parser.add_argument('--frames', type=int, default=10, help='number of frames in each game')
+    parser.add_argument('--output', help='write the JSON lines to this file, not stdout')
+    args = parser.parse_args(argv)
+
+    errors = 0
+    def on_error(n, message):
+        nonlocal errors
+        errors += 1
+        sys.stderr.write('Line {n}: {message}\n'.format(n=n, message=message))
+
+    def read_files():
+        for path in args.files:
+            if path == '-':
+                yield from read_rolls(sys.stdin, args.format)
+            else:
+                with open(path, newline='') as f:
+                    yield from read_rolls(f, args.format)
+
+    out = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        for result in score_rolls(read_files(), args.pins, args.frames, ENGINES[args.engine],
+            on_error):
+            out.write(json.dumps(result, separators=(',', ':')))
+            out.write('\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
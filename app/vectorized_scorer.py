@@ -0,0 +1,138 @@
+"""vectorized_scorer.py
+
+Provides functions used to score many bowling games at once with NumPy. Each game is a row of
+ball scores in the order they were rolled, and every frame is scored with the same rules as
+<BowlingGame>. Use this module to rescore archives of finished games rather than replaying each
+one through a <BowlingController>.
+
+Requires NumPy.
+"""
+
+import numpy as np
+
+
+NO_SCORE = -1 ## Marks a frame score that cannot be calculated yet or a frame not yet started.
+
+
+def build_roll_matrix(games):
+    """Pack sequences of ball scores into a zero-padded matrix.
+
+    Args:
+        games: Iterable of sequences, each containing the ball scores for one game.
+
+    Returns:
+        Tuple containing an (N games x max rolls) integer matrix and a vector of roll counts.
+    """
+    games = [list(game) for game in games]
+    lengths = np.array([len(game) for game in games], dtype=np.int64)
+    rolls = np.zeros((len(games), lengths.max() if len(games) else 0), dtype=np.int64)
+    for i, game in enumerate(games):
+        rolls[i, :len(game)] = game
+    return rolls, lengths
+
+
+def score_games(rolls, lengths, num_pins=10, num_frames=10):
+    """Score every frame of many bowling games at once.
+
+    Frames are found one at a time across all games, so the work grows with the number of
+    frames rather than the number of games. Ball scores past the end of a finished game are
+    ignored the same way <BowlingGame> ignores them.
+
+    Args:
+        rolls: (N games x max rolls) integer matrix of ball scores in the order they were rolled.
+        lengths: Vector of integers representing the number of rolls in each game.
+        num_pins: Integer representing the number of pins set up in each frame.
+        num_frames: Integer representing the number of frames in each game.
+
+    Raises:
+        ValueError if the matrix and the roll counts do not match.
+        ValueError if a ball score is less than 0 or greater than <num_pins>.
+        ValueError if a frame score is greater than <num_pins>.
+
+    Returns:
+        Dictionary of (N games x num_frames) matrices with the same keys as a frame dictionary:
+        'frame_score', 'running_total', 'is_strike', and 'is_spare'. Frame scores that cannot
+        be calculated yet are <NO_SCORE>, as are running totals for frames not yet started.
+    """
+    num_pins = num_pins if num_pins >= 1 else 1
+    num_frames = num_frames if num_frames >= 1 else 1
+
+    rolls = np.asarray(rolls)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    if rolls.ndim != 2 or lengths.shape != rolls.shape[:1] or \
+        (lengths < 0).any() or (lengths > rolls.shape[1]).any():
+        raise ValueError('The roll counts should match the rows of the roll matrix!')
+
+    # Use the narrowest integers that hold a frame score and a perfect game respectively.
+    roll_type = np.int16 if 3 * num_pins < 2**15 else np.int64
+    score_type = np.int32 if 3 * num_pins * num_frames < 2**31 else np.int64
+
+    # Zero every unrolled ball and leave room to read two balls past the end of each game.
+    num_games, max_rolls = rolls.shape
+    rolled = np.arange(max_rolls) < lengths[:, None]
+    if ((rolls < 0) & rolled).any() or ((rolls > num_pins) & rolled).any():
+        raise ValueError('The ball scores should be between 0 and {num} pins!' \
+            .format(num=repr(num_pins)))
+
+    padded = np.zeros((num_games, max_rolls + 3), dtype=roll_type)
+    padded[:, :max_rolls] = rolls
+    padded[:, :max_rolls] *= rolled
+
+    frame_score = np.full((num_games, num_frames), NO_SCORE, dtype=score_type)
+    is_started = np.zeros((num_games, num_frames), dtype=bool)
+    is_strike = np.zeros((num_games, num_frames), dtype=bool)
+    is_spare = np.zeros((num_games, num_frames), dtype=bool)
+
+    # Read balls through flat indexes into the padded matrix rather than row/column pairs.
+    flat = padded.ravel()
+    row_at = np.arange(num_games, dtype=np.int64) * (max_rolls + 3)
+    start = np.zeros(num_games, dtype=np.int64) ## Index of the first ball in each game's frame.
+
+    for k in range(num_frames):
+        at = row_at + np.minimum(start, max_rolls) ## Games out of balls read zeros.
+        ball_1_score = flat[at]
+        ball_2_score = flat[at + 1]
+        ball_3_score = flat[at + 2]
+        has_ball_1 = start < lengths
+        has_ball_2 = start + 1 < lengths
+        has_ball_3 = start + 2 < lengths
+
+        strike = has_ball_1 & (ball_1_score == num_pins)
+        open_2 = has_ball_2 & ~strike
+        spare = open_2 & (ball_1_score + ball_2_score == num_pins)
+
+        if (open_2 & (ball_1_score + ball_2_score > num_pins)).any():
+            raise ValueError('The total frame score should be no more than {num} pins!' \
+                .format(num=repr(num_pins)))
+
+        # A strike and a spare score the next two balls and the next ball respectively.
+        score = ball_1_score + ball_2_score + np.where(strike | spare, ball_3_score, 0)
+        scored = np.where(strike | spare, has_ball_3, open_2)
+        frame_score[:, k] = np.where(scored, score, NO_SCORE)
+
+        is_started[:, k] = has_ball_1
+        is_strike[:, k] = strike
+        is_spare[:, k] = spare
+        start = start + np.where(strike, 1, 2)
+
+    # Bonus balls after a last frame strike follow the same rule as the balls in a frame.
+    at = row_at + np.minimum(start, max_rolls)
+    bonus = is_strike[:, -1] & (flat[at] < num_pins) & (start + 1 < lengths)
+    if (bonus & (flat[at] + flat[at + 1] > num_pins)).any():
+        raise ValueError('The total frame score should be no more than {num} pins!' \
+            .format(num=repr(num_pins)))
+
+    running_total = np.cumsum(np.where(frame_score == NO_SCORE, 0, frame_score), axis=1,
+        dtype=score_type)
+    running_total[~is_started] = NO_SCORE
+
+    return {
+        'frame_score': frame_score,
+        'running_total': running_total,
+        'is_strike': is_strike,
+        'is_spare': is_spare,
+    }
+
+
+if __name__ == '__main__':
+    pass
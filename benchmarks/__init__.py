@@ -0,0 +1,3 @@
+"""benchmarks.__init__"""
+
+__all__ = ['bowling_controller_bench', 'bowling_game_bench', 'harness']
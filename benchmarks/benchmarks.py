@@ -0,0 +1,96 @@
+"""Run all benchmarks found in the benchmarks directory.
+
+Examples:
+    python benchmarks/benchmarks.py --output results.json
+    python benchmarks/benchmarks.py --compare --threshold 0.15
+    python benchmarks/benchmarks.py --compare --input results.json --filter Controller
+
+The same code can run faster in some processes than in others, so record a baseline from several
+runs. A later run is then only flagged for a slowdown beyond that noise:
+    for i in 1 2 3 4 5; do python benchmarks/benchmarks.py --output run-$i.json; done
+    python benchmarks/benchmarks.py --input run-*.json --save-baseline --note "..."
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks import bowling_controller_bench, bowling_game_bench
+from benchmarks.harness import compare, merge_results, run_benchmarks
+
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def get_benchmarks():
+    """Returns every <Benchmark> object in the benchmarks directory."""
+    return bowling_game_bench.get_benchmarks() + bowling_controller_bench.get_benchmarks()
+
+
+def main(argv=None):
+    """Run the benchmarks, then write and compare the results as requested.
+
+    Args:
+        argv: List of command line arguments, or None to use <sys.argv>.
+
+    Returns:
+        Integer exit status that is 1 if a benchmark slowed down more than the threshold.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the bowling score engine.')
+    parser.add_argument('--filter', help='regular expression that selects benchmarks by name')
+    parser.add_argument('--scale', type=float, default=1.0,
+        help='multiply each call count, such as 0.1 for a quick run')
+    parser.add_argument('--output', help='write the JSON results to this file, not stdout')
+    parser.add_argument('--input', nargs='+', help='use results read from these files, not '
+        'a new run, keeping the slowest result for each benchmark')
+    parser.add_argument('--baseline', default=BASELINE, help='baseline JSON results file')
+    parser.add_argument('--save-baseline', action='store_true',
+        help='store the results as the new baseline')
+    parser.add_argument('--compare', action='store_true',
+        help='flag benchmarks that are slower than the baseline')
+    parser.add_argument('--threshold', type=float, default=0.1,
+        help='fraction of baseline throughput that may be lost before flagging a slowdown')
+    parser.add_argument('--note', help='text stored with the results, such as why a baseline '
+        'was recorded')
+    args = parser.parse_args(argv)
+
+    if args.input:
+        runs = []
+        for path in args.input:
+            with open(path) as f:
+                runs.append(json.load(f))
+        results = runs[0] if len(runs) == 1 else merge_results(runs)
+    else:
+        results = run_benchmarks(get_benchmarks(), args.filter, args.scale)
+    if args.note:
+        results['meta']['note'] = args.note
+
+    status = 0
+    if args.compare:
+        with open(args.baseline) as f:
+            report = compare(results, json.load(f), args.threshold)
+        results['comparison'] = {'threshold': args.threshold, 'benchmarks': report}
+        for row in report:
+            print('{flag} {name}: {change:+.1%} ({ops:,.0f} ops/s)'.format(
+                flag='SLOWER' if row['slowdown'] else 'ok    ', name=row['name'],
+                change=row['change'], ops=row['ops_per_sec']), file=sys.stderr)
+            status = 1 if row['slowdown'] else status
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    elif not args.save_baseline:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""bowling_controller_bench.py
+
+Benchmarks for the controller in <app/bowling_controller.py>.
+"""
+
+from functools import partial
+from itertools import cycle
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.bowling_controller import BowlingController
+from benchmarks.harness import Benchmark
+
+
+PLAYER_COUNTS = [1, 10, 100, 1000]
+NUM_PLAYERS = 4 ## Number of players in the games used by read benchmarks.
+
+
+def generate_controller_rolls(rng, num_players):
+    """Generate the ball scores for one complete game in the order a controller accepts them.
+
+    Args:
+        rng: <random.Random> object used to pick each ball score.
+        num_players: Integer representing the number of players in the game.
+
+    Returns:
+        List of integers representing every ball score in the order it was posted.
+    """
+    controller = BowlingController(num_players, 10, 10, [])
+    players = range(1, num_players + 1)
+    rolls = []
+    while not all(controller.is_game_over(p) for p in players):
+        score = rng.randint(0, 10)
+        try:
+            controller.post_new_score(score)
+        except ValueError:
+            continue ## More pins than were left standing.
+        rolls.append(score)
+    return rolls
+
+
+def setup_post_new_score(num_players, rng):
+    """Post one ball score per step, starting a new game after each game's last ball."""
+    rolls = generate_controller_rolls(rng, num_players)
+
+    def steps():
+        while True:
+            post_new_score = BowlingController(num_players, 10, 10, []).post_new_score
+            for score in rolls:
+                yield post_new_score(score)
+
+    return steps().__next__
+
+
+def setup_replay(rng):
+    """Post a full game's ball scores in one batch per step."""
+    rolls = generate_controller_rolls(rng, NUM_PLAYERS)
+    return lambda: BowlingController(NUM_PLAYERS, 10, 10, []).post_new_scores(rolls)
+
+
+def setup_finished_game(rng):
+    """Build a finished game to read from."""
+    controller = BowlingController(NUM_PLAYERS, 10, 10, [])
+    controller.post_new_scores(generate_controller_rolls(rng, NUM_PLAYERS))
+    return controller
+
+
+def setup_get_current_scores(rng):
+    """Read every player's score per step from a finished game."""
+    return setup_finished_game(rng).get_current_scores
+
+
+def setup_get_frame_data(rng):
+    """Read one frame per step from a finished game."""
+    controller = setup_finished_game(rng)
+    frames = cycle([(i, p) for i in range(1, 11) for p in range(1, NUM_PLAYERS + 1)])
+    return lambda: controller.get_frame_data(*next(frames))
+
+
+def setup_get_game_state(rng):
+    """Read one player's whole game state per step from a finished game."""
+    controller = setup_finished_game(rng)
+    players = cycle(range(1, NUM_PLAYERS + 1))
+    return lambda: controller.get_game_state(next(players))
+
+
+def get_benchmarks():
+    """Returns the list of <Benchmark> objects defined in this module."""
+    benchmarks = [
+        Benchmark('BowlingController.post_new_score[players={num}]'.format(num=num),
+            partial(setup_post_new_score, num), 100000)
+        for num in PLAYER_COUNTS]
+    benchmarks += [
+        Benchmark('BowlingController.replay', setup_replay, 10000),
+        Benchmark('BowlingController.get_current_scores', setup_get_current_scores, 100000),
+        Benchmark('BowlingController.get_frame_data', setup_get_frame_data, 100000),
+        Benchmark('BowlingController.get_game_state', setup_get_game_state, 100000),
+    ]
+    return benchmarks
+
+
+if __name__ == '__main__':
+    pass
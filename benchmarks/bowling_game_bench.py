@@ -0,0 +1,78 @@
+"""bowling_game_bench.py
+
+Benchmarks for the game engines in <app/bowling_game.py>, <app/compact_bowling_game.py>, and
+<app/state_machine_bowling_game.py>.
+"""
+
+from functools import partial
+from itertools import cycle
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.bowling_game import BowlingGame
+from app.compact_bowling_game import CompactBowlingGame
+from app.state_machine_bowling_game import StateMachineBowlingGame
+from benchmarks.harness import Benchmark, generate_rolls
+
+
+ENGINES = [BowlingGame, CompactBowlingGame, StateMachineBowlingGame]
+NUM_GAMES = 100 ## Number of distinct random games each benchmark cycles through.
+
+
+def setup_post_new_score(engine, rng):
+    """Post one ball score per step, starting a new game after each game's last ball."""
+    games = [generate_rolls(rng) for i in range(NUM_GAMES)]
+
+    def steps():
+        for rolls in cycle(games):
+            post_new_score = engine(10, 10, []).post_new_score
+            for score in rolls:
+                yield post_new_score(score)
+
+    return steps().__next__
+
+
+def setup_replay(engine, rng):
+    """Post a full game's ball scores in one batch per step."""
+    games = cycle([generate_rolls(rng) for i in range(NUM_GAMES)])
+    return lambda: engine(10, 10, []).post_new_scores(next(games))
+
+
+def setup_finished_game(engine, rng):
+    """Build a finished game to read from."""
+    game = engine(10, 10, [])
+    game.post_new_scores(generate_rolls(rng))
+    return game
+
+
+def setup_get_frame_data(engine, rng):
+    """Read one frame per step from a finished game."""
+    game = setup_finished_game(engine, rng)
+    frames = cycle(range(1, 11))
+    return lambda: game.get_frame_data(next(frames))
+
+
+def setup_get_game_state(engine, rng, copy=False):
+    """Read the whole game state per step from a finished game."""
+    return partial(setup_finished_game(engine, rng).get_game_state, copy)
+
+
+def get_benchmarks():
+    """Returns the list of <Benchmark> objects defined in this module."""
+    benchmarks = []
+    for engine in ENGINES:
+        name = engine.__name__
+        benchmarks += [
+            Benchmark(name + '.post_new_score', partial(setup_post_new_score, engine), 100000),
+            Benchmark(name + '.replay', partial(setup_replay, engine), 10000),
+            Benchmark(name + '.get_frame_data', partial(setup_get_frame_data, engine), 100000),
+            Benchmark(name + '.get_game_state', partial(setup_get_game_state, engine), 100000),
+            Benchmark(name + '.get_game_state[copy]',
+                partial(setup_get_game_state, engine, copy=True), 10000),
+        ]
+    return benchmarks
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,206 @@
+"""harness.py
+
+Provides functions used to time benchmarks, report the results as JSON, and compare the results
+against a stored baseline.
+"""
+
+from collections import namedtuple
+import datetime
+import platform
+import re
+import time
+
+
+# A benchmark calls <setup> with a random number generator to get a step function, then times
+# <number> calls to the step function. Each call performs one operation.
+Benchmark = namedtuple('Benchmark', ['name', 'setup', 'number'])
+
+
+def run_benchmarks(benchmarks, pattern=None, scale=1.0, seed=0, rounds=3):
+    """Run every benchmark whose name matches a pattern.
+
+    Each round times one throughput loop of every selected benchmark in turn, and the best loop
+    from all rounds is kept. A slow stretch on a shared machine then slows one round of each
+    benchmark rather than every loop of one benchmark.
+
+    Args:
+        benchmarks: Iterable of <Benchmark> objects.
+        pattern: String representing a regular expression that selects benchmarks by name, or
+            None to run them all.
+        scale: Float multiplied by each benchmark's call count, such as 0.1 for a quick run.
+        seed: Integer used to seed the random ball scores.
+        rounds: Integer representing the number of throughput loops timed for each benchmark.
+
+    Returns:
+        Dictionary containing run metadata and the <summarize> results keyed by benchmark name.
+    """
+    import random
+
+    selected = []
+    for benchmark in benchmarks:
+        if pattern and not re.search(pattern, benchmark.name):
+            continue
+        step = benchmark.setup(random.Random(seed))
+        selected.append((benchmark.name, step, max(1, int(benchmark.number * scale))))
+
+    best = {}
+    for r in range(rounds):
+        for name, step, number in selected:
+            elapsed = time_loop(step, number)
+            best[name] = min(elapsed, best.get(name, elapsed))
+
+    results = {}
+    for name, step, number in selected:
+        results[name] = summarize(step, number, best[name], samples=min(number, 1000))
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'time': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'scale': scale,
+            'rounds': rounds,
+        },
+        'results': results,
+    }
+
+
+def summarize(step, number, best, samples=1000):
+    """Summarize a step function's best throughput loop and time individual calls for latency.
+
+    Latency is taken from individually timed calls, so it includes the timer overhead.
+
+    Args:
+        step: Function that performs one operation when called with no arguments.
+        number: Integer representing the number of calls in each throughput loop.
+        best: Float representing the seconds taken by the fastest throughput loop.
+        samples: Integer representing the number of individually timed calls.
+
+    Returns:
+        Dictionary containing the operation count, throughput, and p50, p99, and max latency.
+    """
+    timer = time.perf_counter
+    latencies = []
+    for i in range(samples):
+        start = timer()
+        step()
+        latencies.append(timer() - start)
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1e6
+
+    return {
+        'ops': number,
+        'ops_per_sec': number / best if best > 0 else float('inf'),
+        'latency_p50_us': percentile(0.50),
+        'latency_p99_us': percentile(0.99),
+        'latency_max_us': latencies[-1] * 1e6,
+    }
+
+
+def time_loop(step, number):
+    """Time an untimed loop of calls to a step function.
+
+    Args:
+        step: Function that performs one operation when called with no arguments.
+        number: Integer representing the number of calls in the loop.
+
+    Returns:
+        Float representing the seconds taken by the whole loop.
+    """
+    timer = time.perf_counter
+    start = timer()
+    for i in range(number):
+        step()
+    return timer() - start
+
+
+def compare(results, baseline, threshold=0.1):
+    """Compare benchmark throughput against a baseline.
+
+    Args:
+        results: Dictionary returned from <run_benchmarks>.
+        baseline: Dictionary returned from <run_benchmarks> for the baseline.
+        threshold: Float representing the fraction by which throughput may drop before a
+            benchmark is flagged as a slowdown.
+
+    Returns:
+        List of dictionary objects, one per benchmark in both runs, sorted by name. Each holds
+        the name, both throughputs, the fractional change, and whether it is a slowdown.
+    """
+    report = []
+    for name in sorted(set(results['results']) & set(baseline['results'])):
+        current = results['results'][name]['ops_per_sec']
+        previous = baseline['results'][name]['ops_per_sec']
+        change = current / previous - 1 if previous else 0.0
+        report.append({
+            'name': name,
+            'baseline_ops_per_sec': previous,
+            'ops_per_sec': current,
+            'change': change,
+            'slowdown': change < -threshold,
+        })
+    return report
+
+
+def merge_results(runs):
+    """Merge the results of several runs, keeping the slowest result for each benchmark.
+
+    The same code can run faster or slower from one process to the next, so a baseline merged
+    from several runs on one machine sits at the slow end of that noise, and comparing a later
+    run against it flags only slowdowns beyond it.
+
+    Args:
+        runs: List of dictionary objects returned from <run_benchmarks>.
+
+    Returns:
+        Dictionary like those from <run_benchmarks>, with the metadata of the first run and the
+        number of runs merged.
+    """
+    merged = {'meta': dict(runs[0]['meta'], runs=len(runs)), 'results': {}}
+    for run in runs:
+        for name, result in run['results'].items():
+            kept = merged['results'].get(name)
+            if kept is None or result['ops_per_sec'] < kept['ops_per_sec']:
+                merged['results'][name] = result
+    return merged
+
+
+def generate_rolls(rng, num_pins=10, num_frames=10):
+    """Generate the ball scores for one complete game.
+
+    Args:
+        rng: <random.Random> object used to pick each ball score.
+        num_pins: Integer representing the number of pins set up in each frame.
+        num_frames: Integer representing the number of frames in the game.
+
+    Returns:
+        List of integers representing every ball score in the order it was rolled.
+    """
+    rolls = []
+    is_strike = is_spare = False
+    for frame in range(num_frames):
+        ball_1_score = rng.randint(0, num_pins)
+        rolls.append(ball_1_score)
+        is_strike = ball_1_score == num_pins
+        if not is_strike:
+            ball_2_score = rng.randint(0, num_pins - ball_1_score)
+            rolls.append(ball_2_score)
+        is_spare = not is_strike and ball_1_score + ball_2_score == num_pins
+
+    # A last frame strike earns two bonus balls and a last frame spare earns one.
+    if is_strike:
+        ball_1_score = rng.randint(0, num_pins)
+        rolls.append(ball_1_score)
+        rolls.append(rng.randint(0, num_pins if ball_1_score == num_pins else
+            num_pins - ball_1_score))
+    elif is_spare:
+        rolls.append(rng.randint(0, num_pins))
+
+    return rolls
+
+
+if __name__ == '__main__':
+    pass
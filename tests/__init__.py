@@ -1,3 +1,7 @@
 """tests.__init__"""
 
-__all__ = ['bowling_controller_spec', 'bowling_game_spec', 'helpers_spec']
+__all__ = ['benchmarks_spec', 'bowling_controller_spec', 'bowling_game_spec',
+    'compact_bowling_game_spec', 'helpers_spec', 'instrumentation_spec', 'leaderboard_spec',
+    'replay_engine_spec', 'roll_log_spec', 'score_cache_spec', 'score_feed_spec',
+    'scoring_service_spec', 'shared_scores_spec', 'state_machine_bowling_game_spec',
+    'stats_aggregator_spec', 'stream_scorer_spec', 'vectorized_scorer_spec']
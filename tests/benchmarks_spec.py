@@ -0,0 +1,63 @@
+"""Exercise code from <benchmarks/harness.py>."""
+
+import unittest
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.bowling_game import BowlingGame
+from benchmarks import bowling_controller_bench, bowling_game_bench
+from benchmarks.harness import compare, generate_rolls, merge_results, run_benchmarks
+
+
+class BenchmarksTestCase(unittest.TestCase):
+
+    def test_generate_rolls(self):
+        """It should generate ball scores for a complete game."""
+        rng = random.Random(1)
+        for i in range(100):
+            game = BowlingGame(10, 10, [])
+            game.post_new_scores(generate_rolls(rng))
+            self.assertEqual(game.current_frame, 10)
+            self.assertTrue(game.is_frame_complete(10))
+
+
+    def test_run_benchmarks(self):
+        """It should report throughput and latency for every selected benchmark."""
+        benchmarks = bowling_game_bench.get_benchmarks() + \
+            bowling_controller_bench.get_benchmarks()
+        results = run_benchmarks(benchmarks, pattern='^Bowling.*replay', scale=0.001)
+        self.assertEqual(sorted(results['results']), ['BowlingController.replay',
+            'BowlingGame.replay'])
+        for result in results['results'].values():
+            self.assertGreater(result['ops_per_sec'], 0)
+            self.assertLessEqual(result['latency_p50_us'], result['latency_max_us'])
+
+
+    def test_compare(self):
+        """It should flag benchmarks that lost more throughput than the threshold."""
+        baseline = {'results': {'a': {'ops_per_sec': 100.0}, 'b': {'ops_per_sec': 100.0},
+            'c': {'ops_per_sec': 100.0}}}
+        results = {'results': {'a': {'ops_per_sec': 95.0}, 'b': {'ops_per_sec': 80.0},
+            'd': {'ops_per_sec': 1.0}}}
+        report = compare(results, baseline, threshold=0.1)
+        self.assertEqual([row['name'] for row in report], ['a', 'b'])
+        self.assertEqual([row['slowdown'] for row in report], [False, True])
+        self.assertAlmostEqual(report[1]['change'], -0.2)
+
+
+    def test_merge_results(self):
+        """It should keep the slowest result for each benchmark from several runs."""
+        runs = [{'meta': {'scale': 1.0}, 'results': {'a': {'ops_per_sec': 90.0},
+            'b': {'ops_per_sec': 100.0}}},
+            {'meta': {'scale': 1.0}, 'results': {'a': {'ops_per_sec': 100.0},
+            'b': {'ops_per_sec': 80.0}, 'c': {'ops_per_sec': 5.0}}}]
+        merged = merge_results(runs)
+        self.assertEqual(merged['meta'], {'scale': 1.0, 'runs': 2})
+        self.assertEqual({name: result['ops_per_sec'] for name, result in
+            merged['results'].items()}, {'a': 90.0, 'b': 80.0, 'c': 5.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,15 +2,95 @@
 
 import unittest
 import os
+import random
 import sys
+import threading
 from functools import reduce
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from app.bowling_controller import BowlingController
+from app.bowling_game import BowlingGame
+from app.compact_bowling_game import CompactBowlingGame
+from app.state_machine_bowling_game import StateMachineBowlingGame
 
 
 class BowlingControllerTestCase(unittest.TestCase):
 
+    def test_amend_roll(self):
+        """It should correct a player's ball score without changing whose turn it is."""
+        b = BowlingController(2, 10, 10, [])
+        b.post_new_scores([3, 4, 10, 5])
+        b.amend_roll(1, 1, 2, 7)
+        self.assertEqual(b.get_rolls(1), [3, 7, 5])
+        self.assertEqual(b.get_current_scores(), [15, 0])
+        self.assertEqual(b.get_current_player(), 1)
+        def cause_error(*args): b.amend_roll(*args)
+        self.assertRaises(ValueError, cause_error, 1, 1, 1, 10) ## Would change the turns.
+        self.assertRaises(ValueError, cause_error, 2, 1, 2, 0)
+        self.assertRaises(ValueError, cause_error, 3, 1, 1, 0)
+        self.assertEqual(b.get_rolls(1), [3, 7, 5])
+
+
+    def test_can_catch(self):
+        """It should tell whether a player's maximum possible score reaches another's score."""
+        b = BowlingController(2, 10, 2, [])
+        b.post_new_scores([10, 3, 4, 9, 0])
+        self.assertTrue(b.can_catch(2, 1))
+        b.post_new_scores([3, 4])
+        self.assertFalse(b.can_catch(2, 1))
+        self.assertTrue(b.can_catch(1, 2))
+        def cause_error(*args): b.can_catch(*args)
+        self.assertRaises(ValueError, cause_error, 3, 1)
+        self.assertRaises(ValueError, cause_error, 1, 3)
+
+
+    def test_get_changes(self):
+        """It should return the frame fields changed after a version, oldest first."""
+        b = BowlingController(2, 10, 10, [], change_log_size=4)
+        b.post_new_score(10)
+        b.post_new_scores([3, 4])
+        b.post_new_score(5)
+        self.assertEqual(b.version, 3)
+        self.assertEqual(b.get_changes(2), [(3, 1, 2, {'ball_1_score': 5, 'is_spare': False,
+            'is_strike': False, 'running_total': 0})])
+        self.assertEqual([change[0] for change in b.get_changes(0)], [1, 2, 3])
+
+        # A removed frame has no fields, and only changed fields are listed.
+        b.undo_last_roll()
+        self.assertEqual(b.get_changes(3), [(4, 1, 2, None)])
+        b.post_new_scores([5, 5])
+        self.assertEqual(b.get_changes(4)[0], (5, 1, 1, {'frame_score': 20,
+            'running_total': 20}))
+
+        # Changes dropped from the log cannot be read.
+        def cause_error(): b.get_changes(1)
+        self.assertRaises(ValueError, cause_error)
+        def cause_error_2(): BowlingController(2, 10, 10, []).get_changes(0)
+        self.assertRaises(ValueError, cause_error_2)
+
+
+    def test_get_changes_sync(self):
+        """It should keep a copy of every frame in sync from the changes alone."""
+        rng = random.Random(13)
+        b = BowlingController(3, 10, 10, [], change_log_size=100)
+        frames = {}
+        version = 0
+        for i in range(150):
+            try:
+                b.post_new_score(rng.randint(0, 10))
+            except ValueError:
+                continue
+            for change_version, player, frame, fields in b.get_changes(version):
+                if fields is None:
+                    del frames[(player, frame)]
+                    continue
+                frames.setdefault((player, frame), {}).update(fields)
+            version = b.version
+        for player in range(1, 4):
+            for i in range(1, 11):
+                self.assertEqual(frames.get((player, i), {}), b.get_frame_data(i, player))
+
+
     def test_get_current_player(self):
         """It should return the current player."""
         b = BowlingController(2, 10, 10, [])
@@ -63,6 +143,29 @@ class BowlingControllerTestCase(unittest.TestCase):
         self.assertEqual(len(b.get_game_states()), 5)
 
 
+    def test_get_max_scores(self):
+        """It should return the maximum possible score for every player."""
+        b = BowlingController(2, 10, 2, [])
+        self.assertEqual(b.get_max_scores(), [60, 60])
+        b.post_new_scores([10, 3, 4])
+        self.assertEqual(b.get_max_scores(), [60, 37])
+        b.post_new_scores([9, 0])
+        self.assertEqual(b.get_max_score(1), 28)
+        b2 = BowlingController(2, 10, 2, [], engine=CompactBowlingGame)
+        b2.post_new_scores([10, 3, 4, 9, 0])
+        self.assertEqual(b2.get_max_scores(), [28, 37])
+
+
+    def test_get_rolls(self):
+        """It should return every ball score for this player in the order it was rolled."""
+        b = BowlingController(2, 10, 10, [])
+        b.post_new_scores([10, 3, 4, 5])
+        self.assertEqual(b.get_rolls(1), [10, 5])
+        self.assertEqual(b.get_rolls(2), [3, 4])
+        def cause_error(): b.get_rolls(3)
+        self.assertRaises(ValueError, cause_error)
+
+
     def test_is_game_over(self):
         """It should return a boolean indicating if the game should continue for this player."""
         b = BowlingController(1, 10, 10, [])
@@ -71,6 +174,29 @@ class BowlingControllerTestCase(unittest.TestCase):
         self.assertTrue(b.is_game_over(1))
 
 
+    def test_read_cache(self):
+        """It should reuse cached reads until a ball score is posted for that player."""
+        b = BowlingController(2, 10, 10, [])
+        b.post_new_score(3)
+        frame = b.get_frame_data(1, 1)
+        self.assertIs(b.get_frame_data(1, 1), frame)
+        self.assertIs(b.get_frames(1)[0], frame)
+        self.assertEqual(b.get_current_scores(), [0, None])
+        def cause_error(): frame['ball_1_score'] = 5
+        self.assertRaises(TypeError, cause_error)
+        b.post_new_score(4)
+        self.assertIsNot(b.get_frame_data(1, 1), frame)
+        self.assertEqual(b.get_frame_data(1, 1).get('running_total'), 7)
+        self.assertEqual(b.get_current_scores(), [7, None])
+        self.assertEqual(b.get_current_score(1), 7)
+        self.assertEqual(b.get_frame_data(2, 1), {})
+        self.assertEqual(b.get_frame_data(1, 3), {})
+        self.assertFalse(b.is_game_over(1))
+        b.post_new_scores([0] * 37)
+        self.assertTrue(b.is_game_over(1))
+        self.assertEqual(b.get_current_scores(), [7, 0])
+
+
     def test_post_new_score(self):
         """It should add a ball score to the current player's frame."""
         game_states = []
@@ -80,6 +206,17 @@ class BowlingControllerTestCase(unittest.TestCase):
         self.assertEqual(player_1_frame_1.get('ball_1_score'), 5)
 
 
+    def test_post_new_score_changes(self):
+        """It should return the frame fields changed by the ball score when asked."""
+        b = BowlingController(2, 10, 10, [])
+        self.assertEqual(b.post_new_score(10, changes=True), [(1, 1, 1, {'ball_1_score': 10,
+            'ball_2_score': 0, 'is_spare': False, 'is_strike': True, 'running_total': 0})])
+        self.assertEqual(b.post_new_score(3), None)
+        changes = b.post_new_scores([4, 5, 5], changes=True)
+        self.assertEqual([change[:3] for change in changes], [(3, 1, 1), (3, 1, 2), (3, 2, 1)])
+        self.assertEqual(changes[0][3], {'frame_score': 20, 'running_total': 20})
+
+
     def test_post_new_score_players(self):
         """It should change the current player after posting a score."""
         b = BowlingController(3, 10, 10, [])
@@ -95,6 +232,150 @@ class BowlingControllerTestCase(unittest.TestCase):
         self.assertEqual(b.get_current_player(), 1)
 
 
+    def test_post_new_score_trusted(self):
+        """It should post ball scores without checking their bounds for a trusted controller."""
+        b1 = BowlingController(2, 10, 10, [], trusted=True)
+        b2 = BowlingController(2, 10, 10, [])
+        rolls = [5, 5, 10, 3, 4, 1, 2, 10, 0, 10] * 5
+        for score in rolls[:9]: b1.post_new_score(score)
+        b1.post_new_scores(rolls[9:])
+        b2.post_new_scores(rolls)
+        self.assertEqual(b1.get_game_states(), b2.get_game_states())
+
+
+    def test_post_new_score_trusted_compact(self):
+        """It should keep a trusted compact game readable after a score it cannot store."""
+        b = BowlingController(2, 10, 10, [], engine=CompactBowlingGame, trusted=True)
+        for post in (lambda: b.post_new_score(3.5), lambda: b.post_new_scores([2**40])):
+            self.assertRaises((TypeError, OverflowError), post)
+            self.assertEqual(b.get_current_scores(), [None, None])
+        b.post_new_scores([3, 4, 10])
+        self.assertEqual(b.get_current_scores(), [7, 0])
+
+
+    def test_post_new_scores(self):
+        """It should add many ball scores, changing the current player as frames complete."""
+        b1 = BowlingController(3, 10, 10, [])
+        b2 = BowlingController(3, 10, 10, [])
+        rolls = [5, 5, 10, 3, 4, 1, 2, 10, 0, 10] * 5
+        b1.post_new_scores(rolls[:7])
+        b1.post_new_scores(rolls[7:])
+        for score in rolls: b2.post_new_score(score)
+        self.assertEqual(b1.get_game_states(), b2.get_game_states())
+        self.assertEqual(b1.get_current_player(), b2.get_current_player())
+        def cause_error(): b1.post_new_scores([1, -1])
+        self.assertRaises(ValueError, cause_error)
+
+
+    def test_post_new_scores_integers(self):
+        """It should reject a score that is not an integer before any engine adds a ball."""
+        for engine in (BowlingGame, CompactBowlingGame, StateMachineBowlingGame):
+            b = BowlingController(2, 10, 10, [], engine=engine)
+            def cause_error(): b.post_new_scores([4, 3.5])
+            self.assertRaises(ValueError, cause_error)
+            self.assertEqual(b.get_current_scores(), [None, None])
+            b.post_new_scores([3, 4, 10])
+            self.assertEqual(b.get_current_scores(), [7, 0])
+
+
+    def test_snapshot(self):
+        """It should restore every player's game and the current player from a snapshot."""
+        b1 = BowlingController(3, 10, 10, [], lane=7, game=2)
+        b1.post_new_scores([5, 5, 10, 3, 4, 1, 2, 10, 0, 10] * 3)
+        self.assertEqual(b1.get_current_scores(), [42, 120, 47])
+        data = b1.snapshot()
+        self.assertLess(len(data), 100)
+        b2 = BowlingController.restore(data)
+        self.assertEqual(b2.NUM_PLAYERS, 3)
+        self.assertEqual(b2.get_current_player(), b1.get_current_player())
+        self.assertEqual(b2.get_game_states(), b1.get_game_states())
+        self.assertEqual(b2.snapshot(), data)
+        for b in (b1, b2): b.post_new_scores([7, 3, 4])
+        self.assertEqual(b2.get_current_scores(), b1.get_current_scores())
+        def cause_error_1(): BowlingController.restore(data[:-1])
+        def cause_error_2(): BowlingController.restore(data + b'\x00')
+        self.assertRaises(ValueError, cause_error_1)
+        self.assertRaises(ValueError, cause_error_2)
+
+
+    def test_snapshot_header(self):
+        """It should throw a ValueError if the lane or game does not fit in the header."""
+        for lane, game in [(-1, 0), (2**32, 0), (0, -1), (0, 2**32)]:
+            b = BowlingController(1, 10, 10, [], lane=lane, game=game)
+            self.assertRaises(ValueError, b.snapshot)
+        b = BowlingController(1, 10, 10, [], lane=2**32 - 1, game=2**32 - 1)
+        self.assertEqual(BowlingController.restore(b.snapshot()).snapshot(), b.snapshot())
+
+
+    def test_thread_safe(self):
+        """It should let readers on other threads see every player as of the same ball score."""
+        b = BowlingController(2, 10, 10, [], thread_safe=True)
+        self.assertIsNotNone(b.lock)
+        self.assertIsNone(BowlingController(2, 10, 10, []).lock)
+        rolls = [5, 5, 10, 3, 4, 1, 2, 10, 0, 10] * 4
+        errors = []
+        done = threading.Event()
+
+        def read():
+            while not done.is_set():
+                with b.lock.read():
+                    scores = b.get_current_scores()
+                    states = b.get_game_states()
+                for score, state in zip(scores, states):
+                    if state and state[-1].get('running_total') != score:
+                        errors.append((score, state))
+
+        readers = [threading.Thread(target=read) for i in range(3)]
+        for reader in readers: reader.start()
+        for score in rolls: b.post_new_score(score)
+        done.set()
+        for reader in readers: reader.join()
+        self.assertEqual(errors, [])
+        self.assertIsInstance(b.get_game_state(1)[0], dict)
+        b2 = BowlingController.restore(b.snapshot(), thread_safe=True)
+        self.assertEqual(b2.get_game_states(), b.get_game_states())
+
+
+    def test_thread_safe_lock(self):
+        """It should lock reads only in thread safe mode, with or without instrumentation."""
+        b = BowlingController(2, 10, 10, [], thread_safe=True)
+        for instrumented in (False, True, False):
+            if instrumented:
+                b.enable_instrumentation()
+            else:
+                b.disable_instrumentation()
+            results = []
+            with b.lock.write():
+                reader = threading.Thread(target=lambda: results.append(b.get_current_scores()))
+                reader.start()
+                reader.join(0.05)
+                self.assertEqual(results, []) ## The read waits for the writer.
+            reader.join(5)
+            self.assertEqual(results, [[None, None]])
+            self.assertEqual(bool(b.stats()), instrumented)
+        self.assertNotIn('get_current_scores', vars(BowlingController(2, 10, 10, [])))
+
+
+    def test_undo_last_roll(self):
+        """It should remove the last ball score posted and give that player the turn."""
+        b = BowlingController(2, 10, 10, [])
+        b.post_new_scores([10, 3, 4, 5])
+        self.assertEqual(b.undo_last_roll(), (1, 5))
+        self.assertEqual(b.get_current_player(), 1)
+        self.assertEqual(b.undo_last_roll(), (2, 4))
+        self.assertEqual(b.get_current_player(), 2)
+        self.assertEqual(b.get_rolls(2), [3])
+        b.post_new_score(6)
+        self.assertEqual(b.get_current_scores(), [0, 9])
+
+        # The order of balls is rebuilt for restored games.
+        b2 = BowlingController.restore(b.snapshot())
+        self.assertEqual(b2.undo_last_roll(), (2, 6))
+        self.assertEqual(b2.undo_last_roll(), (2, 3))
+        self.assertEqual(b2.undo_last_roll(), (1, 10))
+        self.assertRaises(ValueError, b2.undo_last_roll)
+
+
     def test_match_the_bowling_example(self):
         """It should duplicate the final scores in the bowling scoring tutorial example."""
         # URL: http://bowling.about.com/od/rulesofthegame/a/bowlingscoring.htm
@@ -5,7 +5,7 @@ import os
 import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from app.bowling_game import BowlingGame
+from app.bowling_game import BowlingGame, Frame, get_max_score
 
 
 class BowlingGameTestCase(unittest.TestCase):
@@ -86,9 +86,9 @@ class BowlingGameTestCase(unittest.TestCase):
 
 
     def test_build_frame_dict(self):
-        """It should return a dictionary object."""
+        """It should return a frame object."""
         frame = self.b.build_frame()
-        self.assertIsInstance(frame, dict)
+        self.assertIsInstance(frame, Frame)
 
 
     def test_build_frame_keys(self):
@@ -125,7 +125,7 @@ class BowlingGameTestCase(unittest.TestCase):
         self.assertRaises(ValueError, cause_error_4)
         self.assertRaises(ValueError, cause_error_5)
         self.assertRaises(ValueError, cause_error_6)
-        self.assertIsInstance(self.b.build_frame(0, self.b.NUM_PINS), dict)
+        self.assertIsInstance(self.b.build_frame(0, self.b.NUM_PINS), Frame)
 
 
     def test_calculate_forward_score_no_game(self):
@@ -304,6 +304,13 @@ class BowlingGameTestCase(unittest.TestCase):
         self.assertEqual(len(game_state), 5)
 
 
+    def test_calculate_running_total_first_frame(self):
+        """It should not add the last frame to the first frame running total."""
+        b2 = BowlingGame(10, 1, [])
+        for i in range(4): b2.post_new_score(1)
+        self.assertEqual(b2.get_frame_data(1).get('running_total'), 2)
+
+
     def test_is_frame_incomplete(self):
         """It should indicate whether the frame is finished."""
         frame_1 = self.b.build_frame()
@@ -341,13 +348,80 @@ class BowlingGameTestCase(unittest.TestCase):
 
     def test_get_game_state(self):
         """It should return a deep copy of the game state."""
-        game_state = [{'a': 1, 'b': 2}, {'c': 3, 'd': 4}]
+        game_state = [{'ball_1_score': 1, 'ball_2_score': 2}, {'ball_1_score': 3}]
         b2 = BowlingGame(game_state=game_state)
-        inner_state = b2.get_game_state()
+        inner_state = b2.get_game_state(copy=True)
         self.assertEqual(inner_state, game_state)
-        game_state[0]['a'] = 5
+        game_state[0].update(ball_1_score=5)
         self.assertNotEqual(inner_state, game_state)
 
+        for score in [10, 4]: self.b.post_new_score(score)
+        inner_state = self.b.get_game_state(copy=True)
+        self.assertIsInstance(inner_state[0], dict)
+        self.assertEqual(inner_state[0]['next_frame'], inner_state[1])
+        self.assertEqual(inner_state, self.b.get_game_state())
+        self.b.post_new_score(5)
+        self.assertNotEqual(inner_state, self.b.get_game_state())
+        self.assertNotIn('frame_score', inner_state[0])
+
+
+    def test_get_game_state_keys(self):
+        """It should reject a game state with keys that are not frame keys."""
+        def cause_error(): BowlingGame(game_state=[{'a': 1, 'b': 2}, {'c': 3, 'd': 4}])
+        self.assertRaises(ValueError, cause_error)
+
+
+    def test_frame(self):
+        """It should store frame data in slots and read like a dictionary without empty keys."""
+        frame = Frame(ball_1_score=4, ball_2_score=6, is_spare=True, is_strike=False)
+        self.assertFalse(hasattr(frame, '__dict__'))
+        self.assertEqual(frame, {'ball_1_score': 4, 'ball_2_score': 6, 'is_spare': True,
+            'is_strike': False})
+        self.assertNotIn('frame_score', frame)
+        self.assertEqual(frame.get('frame_score'), None)
+        frame.update(frame_score=15)
+        self.assertEqual(frame['frame_score'], 15)
+        self.assertEqual(Frame.from_dict(frame.to_dict()), frame)
+        frame.update(ball_1_score=0, is_spare=False, running_total=0, next_frame=Frame())
+        self.assertEqual(list(frame.to_dict().items()), [('ball_1_score', 0),
+            ('ball_2_score', 6), ('is_spare', False), ('is_strike', False), ('frame_score', 15),
+            ('running_total', 0)])
+        def cause_error_1(): frame.update(apple=1)
+        def cause_error_2(): Frame.from_dict({'apple': 1})
+        self.assertRaises(ValueError, cause_error_1)
+        self.assertRaises(ValueError, cause_error_2)
+
+
+    def test_get_game_state_view(self):
+        """It should return read-only views of the game state."""
+        for i in range(3): self.b.post_new_score(10)
+        views = self.b.get_game_state()
+        self.assertEqual(views, self.b.get_game_state(copy=True))
+        self.assertEqual(views[0]['next_frame'], views[1])
+        def cause_error_1(): views[0]['ball_1_score'] = 5
+        def cause_error_2(): views[0]['next_frame']['ball_1_score'] = 5
+        self.assertRaises(TypeError, cause_error_1)
+        self.assertRaises(TypeError, cause_error_2)
+        self.b.post_new_score(1)
+        self.assertEqual(views[0].get('frame_score'), 30)
+
+
+    def test_get_max_score(self):
+        """It should return the highest score the game can still reach."""
+        self.assertEqual(self.b.get_max_score(), 300)
+        self.b.post_new_scores([10, 7])
+        self.assertEqual(self.b.get_max_score(), 280) ## Spare, then strikes.
+        self.b.post_new_score(2)
+        self.assertEqual(self.b.get_max_score(), 268)
+        self.b.post_new_scores([0] * 16)
+        self.assertTrue(self.b.is_game_over())
+        self.assertEqual(self.b.get_max_score(), 28)
+
+        # The same projection can be made from a list of ball scores.
+        self.assertEqual(get_max_score([10, 7, 2], 10, 10), 268)
+        self.assertEqual(get_max_score([10, 10, 10, 4], 10, 10), 274)
+        self.assertEqual(get_max_score([], 5, 3), 45)
+
 
     def test_is_frame_complete(self):
         """It should indicate whether the current frame has ended."""
@@ -437,5 +511,124 @@ class BowlingGameTestCase(unittest.TestCase):
         self.assertEqual(game[-1].get('running_total'), 10)
 
 
+    def test_post_trusted_score(self):
+        """It should add a ball score without checking its bounds."""
+        self.b.post_trusted_score(4)
+        self.b.post_trusted_score(5)
+        self.assertEqual(self.b.get_frame_data(1).get('frame_score'), 9)
+        self.b.post_new_scores([10, 10], trusted=True)
+        self.assertEqual(self.b.current_frame, 3)
+
+
+    def test_post_new_score_lazy(self):
+        """It should wait until a frame is read to calculate scores in lazy mode."""
+        b2 = BowlingGame(10, 10, [], lazy=True)
+        rolls = [10, 7, 3, 7, 2, 9, 1, 10, 10, 10, 2, 3, 6, 4, 7, 3, 3]
+        for score in rolls[:3]: b2.post_new_score(score)
+        self.assertEqual(b2.get_frame_data(1).get('frame_score'), 20)
+        b2.post_trusted_score(rolls[3])
+        b2.post_new_scores(rolls[4:])
+        self.assertTrue(b2.is_game_over())
+        self.b.post_new_scores(rolls)
+        self.assertEqual(b2.get_game_state(copy=True), self.b.get_game_state(copy=True))
+        self.assertEqual(b2.get_frame_data(10).get('running_total'), 168)
+
+
+    def test_post_new_scores(self):
+        """It should add many ball scores and match the scores posted one at a time."""
+        rolls = [10, 7, 3, 7, 2, 9, 1, 10, 10, 10, 2, 3, 6, 4, 7, 3, 3]
+        for score in rolls[:5]: self.b.post_new_score(score)
+        self.b.post_new_scores(rolls[5:])
+        b2 = BowlingGame(10, 10, [])
+        for score in rolls: b2.post_new_score(score)
+        self.assertEqual(self.b.get_game_state(), b2.get_game_state())
+        self.assertEqual(self.b.get_frame_data(10).get('running_total'), 168)
+
+
+    def test_post_new_scores_error(self):
+        """It should check every score before adding any and keep scores before a bad frame."""
+        def cause_error_1(): self.b.post_new_scores([1, 2, self.b.NUM_PINS+1])
+        self.assertRaises(ValueError, cause_error_1)
+        self.assertEqual(self.b.current_frame, 0)
+        def cause_error_2(): self.b.post_new_scores([1, 2, 6, 5])
+        self.assertRaises(ValueError, cause_error_2)
+        self.assertEqual(self.b.get_frame_data(1).get('running_total'), 3)
+        self.assertEqual(self.b.get_frame_data(2).get('ball_1_score'), 6)
+
+
+    def test_amend_roll(self):
+        """It should correct a posted ball score and rescore the frames that depend on it."""
+        self.b.post_new_scores([3, 4, 10, 5, 2, 6, 1])
+        self.b.amend_roll(3, 2, 5)
+        self.assertEqual(self.b.get_rolls(), [3, 4, 10, 5, 5, 6, 1])
+        self.assertEqual([frame['running_total'] for frame in self.b.get_game_state()],
+            [7, 27, 43, 50])
+        self.b.amend_roll(4, 1, 10)
+        self.assertEqual(self.b.get_rolls(), [3, 4, 10, 5, 5, 10, 1])
+        self.assertEqual(self.b.current_frame, 5)
+        self.assertNotIn('frame_score', self.b.get_game_state()[3])
+
+
+    def test_amend_roll_error(self):
+        """It should leave the game unchanged if a correction is not valid."""
+        self.b.post_new_scores([3, 4, 10, 5, 2])
+        state = self.b.get_game_state()
+        def cause_error(*args, **kwargs): self.b.amend_roll(*args, **kwargs)
+        self.assertRaises(ValueError, cause_error, 2, 2, 0) ## No second ball after a strike.
+        self.assertRaises(ValueError, cause_error, 4, 1, 0) ## No fourth frame yet.
+        self.assertRaises(ValueError, cause_error, 1, 1, 11)
+        self.assertRaises(ValueError, cause_error, 3, 1, 9) ## Frame score of 11.
+        self.assertRaises(ValueError, cause_error, 3, 1, 10, keep_frames=True)
+        self.assertEqual(self.b.get_game_state(), state)
+
+        # A correction cannot leave balls after the end of the game.
+        b2 = BowlingGame(10, 1, [])
+        b2.post_new_scores([3, 7, 5])
+        self.assertRaises(ValueError, b2.amend_roll, 1, 2, 6)
+        self.assertEqual(b2.get_rolls(), [3, 7, 5])
+
+
+    def test_undo_last_roll(self):
+        """It should remove the last ball score and rescore the frames that depended on it."""
+        self.b.post_new_scores([10, 3, 4])
+        self.assertEqual(self.b.undo_last_roll(), 4)
+        self.assertEqual(self.b.get_rolls(), [10, 3])
+        self.assertNotIn('frame_score', self.b.get_game_state()[0])
+        self.assertEqual(self.b.undo_last_roll(), 3)
+        self.assertEqual(self.b.current_frame, 1)
+        self.assertEqual(self.b.undo_last_roll(), 10)
+        self.assertEqual(self.b.get_game_state(), [])
+        self.assertRaises(ValueError, self.b.undo_last_roll)
+
+
+    def test_snapshot(self):
+        """It should restore the same game from a compact snapshot."""
+        rolls = [10, 7, 3, 7, 2, 9, 1, 10, 10, 10, 2, 3, 6, 4, 7, 3, 3]
+        self.b.post_new_scores(rolls)
+        data = self.b.snapshot()
+        self.assertEqual(len(data), 5 + len(rolls))
+        self.assertEqual(self.b.get_rolls(), rolls)
+        b2 = BowlingGame.restore(data)
+        self.assertEqual(b2.get_rolls(), rolls)
+        self.assertEqual(b2.snapshot(), data)
+        self.assertEqual(b2.get_game_state(), self.b.get_game_state())
+        self.assertTrue(b2.is_game_over())
+
+
+    def test_snapshot_lazy(self):
+        """It should score a restored game the first time it is read or a score is posted."""
+        b2 = BowlingGame.restore(BowlingGame(10, 10, []).snapshot())
+        self.assertEqual(b2.current_frame, 0)
+        self.b.post_new_scores([4, 6, 5])
+        b2 = BowlingGame.restore(self.b.snapshot())
+        b2.post_new_score(2)
+        self.assertEqual(b2.get_frame_data(1).get('frame_score'), 15)
+        self.assertEqual(b2.get_frame_data(2).get('running_total'), 22)
+        b3 = BowlingGame.restore(self.b.snapshot())
+        self.assertFalse(b3.is_frame_complete(2))
+        def cause_error(): BowlingGame.restore(b'')
+        self.assertRaises(ValueError, cause_error)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,144 @@
+"""Exercise code from <app/compact_bowling_game.py>."""
+
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.bowling_controller import BowlingController
+from app.bowling_game import BowlingGame
+from app.compact_bowling_game import CompactBowlingGame
+
+
+class CompactBowlingGameTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Instantiate a basic test object."""
+        self.b = CompactBowlingGame(10, 10)
+        self.rolls = [10, 7, 3, 7, 2, 9, 1, 10, 10, 10, 2, 3, 6, 4, 7, 3, 3]
+
+
+    def tearDown(self):
+        """Destroy test object."""
+        self.b = None
+
+
+    def test_current_frame(self):
+        """It should return a value between 0 and NUM_FRAMES."""
+        self.assertEqual(self.b.current_frame, 0)
+        for i in range(12): self.b.post_new_score(10)
+        self.assertEqual(self.b.current_frame, self.b.NUM_FRAMES)
+
+
+    def test_add_ball_score_error(self):
+        """It should throw an error if the frame score is greater than NUM_PINS."""
+        self.b.post_new_score(6)
+        def cause_error(): self.b.post_new_score(5)
+        self.assertRaises(ValueError, cause_error)
+        self.assertEqual(self.b.get_rolls(), [6])
+
+
+    def test_add_ball_score_type_error(self):
+        """It should leave the game unchanged if a ball score cannot be stored."""
+        def cause_error(): self.b.add_ball_score(3.5)
+        self.assertRaises(TypeError, cause_error)
+        self.assertEqual((self.b.current_frame, self.b.get_rolls()), (0, []))
+        self.b.post_new_scores([10, 3, 4])
+        self.assertEqual(self.b.get_frame_data(1)['frame_score'], 17)
+
+
+    def test_post_new_score_error(self):
+        """It should throw an error if the ball score is outside the bounds."""
+        def cause_error_1(): self.b.post_new_score(-1)
+        def cause_error_2(): self.b.post_new_score(self.b.NUM_PINS+1)
+        def cause_error_3(): self.b.post_new_score('apple')
+        self.assertRaises(ValueError, cause_error_1)
+        self.assertRaises(ValueError, cause_error_2)
+        self.assertRaises(ValueError, cause_error_3)
+
+
+    def test_post_new_scores(self):
+        """It should add many ball scores and match the scores posted one at a time."""
+        self.b.post_new_scores(self.rolls[:3])
+        self.b.post_new_scores(self.rolls[3:])
+        b2 = CompactBowlingGame(10, 10, self.rolls)
+        self.assertEqual(self.b.get_game_state(), b2.get_game_state())
+        def cause_error(): self.b.post_new_scores([1, 'apple'])
+        self.assertRaises(ValueError, cause_error)
+
+
+    def test_post_trusted_score(self):
+        """It should add ball scores without checking their bounds."""
+        self.b.post_trusted_score(4)
+        self.b.post_new_scores([5, 10], trusted=True)
+        self.assertEqual(self.b.get_rolls(), [4, 5, 10])
+
+
+    def test_get_frame_data(self):
+        """It should return the same frame data as <BowlingGame>."""
+        b2 = BowlingGame(10, 10, [])
+        for score in self.rolls:
+            self.b.post_new_score(score)
+            b2.post_new_score(score)
+            for i in range(-1, 12):
+                self.assertEqual(self.b.get_frame_data(i), b2.get_frame_data(i))
+
+
+    def test_get_game_state(self):
+        """It should return the same linked game state as <BowlingGame>."""
+        for pins, frames, rolls in [(10, 10, [10] * 12), (10, 10, [1, 9] * 10 + [10, 5]),
+                (5, 3, [5, 2, 3, 1, 1]), (3, 1, [3, 3, 3]), (10, 10, self.rolls)]:
+            b1 = CompactBowlingGame(pins, frames)
+            b2 = BowlingGame(pins, frames, [])
+            for score in rolls:
+                b1.post_new_score(score)
+                b2.post_new_score(score)
+                self.assertEqual(b1.get_game_state(), b2.get_game_state())
+                self.assertEqual(b1.is_game_over(), b2.is_game_over())
+
+
+    def test_get_rolls(self):
+        """It should replay a game from a list of rolls."""
+        b2 = CompactBowlingGame(10, 10, self.rolls)
+        self.assertEqual(b2.get_rolls(), self.rolls)
+        self.assertEqual(b2.get_frame_data(10).get('running_total'), 168)
+
+
+    def test_is_frame_complete(self):
+        """It should indicate whether the frame has ended."""
+        self.b.post_new_score(1)
+        self.assertFalse(self.b.is_frame_complete(1))
+        self.b.post_new_score(2)
+        self.assertTrue(self.b.is_frame_complete(1))
+        def cause_error(): self.b.is_frame_complete(11)
+        self.assertRaises(ValueError, cause_error)
+
+
+    def test_snapshot(self):
+        """It should share snapshots with BowlingGame and restore the same game."""
+        self.b.post_new_scores(self.rolls[:10])
+        b2 = BowlingGame(10, 10, [])
+        b2.post_new_scores(self.rolls[:10])
+        self.assertEqual(self.b.snapshot(), b2.snapshot())
+        b3 = CompactBowlingGame.restore(b2.snapshot())
+        self.assertEqual(b3.get_rolls(), self.rolls[:10])
+        b3.post_new_scores(self.rolls[10:])
+        self.assertEqual(b3.get_frame_data(10).get('running_total'), 168)
+        b4 = CompactBowlingGame.restore(self.b.snapshot())
+        self.assertEqual(b4.get_game_state(), b2.get_game_state())
+        self.assertFalse(CompactBowlingGame.restore(self.b.snapshot()).is_game_over())
+
+
+    def test_controller_engine(self):
+        """It should run a controller game with the compact engine."""
+        b1 = BowlingController(2, 10, 10, [], engine=CompactBowlingGame)
+        b2 = BowlingController(2, 10, 10, [])
+        for score in [5, 2, 5, 0, 3, 5] * 8:
+            b1.post_new_score(score)
+            b2.post_new_score(score)
+        self.assertEqual(b1.get_game_states(), b2.get_game_states())
+        self.assertEqual(b1.get_current_player(), b2.get_current_player())
+
+
+if __name__ == '__main__':
+    unittest.main()
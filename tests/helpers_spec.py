@@ -3,9 +3,11 @@
 import unittest
 import os
 import sys
+import threading
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from app.helpers import read_only, restrict_bounds
+from app.helpers import FrameView, ReadWriteLock, check_bounds, pack_snapshot, read_only, \
+    restrict_bounds, unpack_snapshot
 
 
 class HelpersTestCase(unittest.TestCase):
@@ -29,6 +31,49 @@ class HelpersTestCase(unittest.TestCase):
         self.assertRaises(TypeError, cause_error)
 
 
+    def test_restrict_bounds_cache(self):
+        """It should call the bounds functions once for each class object."""
+        calls = []
+        class TestClass2(object):
+            def __init__(self, bound): self.bound = bound
+            @restrict_bounds(0, lambda self: calls.append(self) or self.bound)
+            def fn(self, arg): return arg
+        t2 = TestClass2(5)
+        t3 = TestClass2(7)
+        for i in range(3): self.assertEqual(t2.fn(5), 5)
+        self.assertEqual(t3.fn(7), 7)
+        self.assertEqual(calls, [t2, t3])
+        def cause_error(): t2.fn(7)
+        self.assertRaises(ValueError, cause_error)
+
+
+    def test_check_bounds(self):
+        """It should return the values if they are all inside or at the bounds."""
+        self.assertEqual(check_bounds((1, 3, 5), 1, 5), [1, 3, 5])
+        def cause_error_1(): check_bounds([1, 6], 1, 5)
+        def cause_error_2(): check_bounds([1, 'apple'], 1, 5)
+        self.assertRaises(ValueError, cause_error_1)
+        self.assertRaises(ValueError, cause_error_2)
+        self.assertEqual(check_bounds([1, 2.5], 1, 5), [1, 2.5])
+        def cause_error_3(): check_bounds([1, 2.5], 1, 5, integer=True)
+        self.assertRaises(ValueError, cause_error_3)
+
+
+    def test_pack_snapshot(self):
+        """It should pack ball scores into one byte each and unpack them again."""
+        data = pack_snapshot(10, 10, [10] * 12)
+        self.assertEqual(len(data), 17)
+        self.assertEqual(unpack_snapshot(data)[:2], (10, 10))
+        self.assertEqual(list(unpack_snapshot(data)[2]), [10] * 12)
+        self.assertEqual(list(unpack_snapshot(pack_snapshot(300, 2, [299, 1]))[2]), [299, 1])
+        def cause_error_1(): unpack_snapshot(data[:3])
+        def cause_error_2(): unpack_snapshot(pack_snapshot(10, 10, [11]))
+        def cause_error_3(): unpack_snapshot(pack_snapshot(10, 1, [1, 2, 3, 4, 5]))
+        def cause_error_4(): unpack_snapshot(b'\x09' + data[1:])
+        for cause_error in (cause_error_1, cause_error_2, cause_error_3, cause_error_4):
+            self.assertRaises(ValueError, cause_error)
+
+
     def test_restrict_bounds_is_number(self):
         """It should return True if this is a number or False if not."""
         r = restrict_bounds(None, None)
@@ -90,5 +135,50 @@ class HelpersTestCase(unittest.TestCase):
         self.assertEqual(t2.fn(42), 42)
 
 
+    def test_frame_view(self):
+        """It should read through to the frame without allowing changes."""
+        frame = {'a': 1, 'next_frame': {'b': 2}}
+        view = FrameView(frame)
+        self.assertEqual(view, frame)
+        self.assertEqual(len(view), 2)
+        self.assertIsInstance(view['next_frame'], FrameView)
+        frame['a'] = 3
+        self.assertEqual(view['a'], 3)
+        def cause_error(): view['a'] = 4
+        self.assertRaises(TypeError, cause_error)
+        frame_copy = view.copy()
+        frame_copy['next_frame']['b'] = 5
+        self.assertEqual(frame['next_frame']['b'], 2)
+
+
+
+    def test_read_write_lock(self):
+        """It should let readers share the lock and make a writer wait for them."""
+        lock = ReadWriteLock()
+        events = []
+        def read():
+            with lock.read(): events.append('read')
+        def write():
+            with lock.write(): events.append('write')
+        with lock.read():
+            reader = threading.Thread(target=read)
+            reader.start()
+            reader.join(5)
+            self.assertEqual(events, ['read']) ## Readers do not wait for one another.
+            writer = threading.Thread(target=write)
+            writer.start()
+            writer.join(0.1)
+            self.assertEqual(events, ['read']) ## The writer waits for the reader.
+            with lock.read(): events.append('again') ## A reading thread may read again.
+            def cause_error():
+                with lock.write(): pass
+            self.assertRaises(RuntimeError, cause_error)
+        writer.join(5)
+        self.assertEqual(events, ['read', 'again', 'write'])
+        with lock.write():
+            with lock.read(), lock.write(): events.append('nested')
+        self.assertEqual(events[-1], 'nested')
+
+
 if __name__ == '__main__':
     unittest.main()
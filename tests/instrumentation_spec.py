@@ -0,0 +1,101 @@
+"""Exercise code from <app/instrumentation.py>."""
+
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.bowling_controller import BowlingController
+from app.bowling_game import BowlingGame
+from app.compact_bowling_game import CompactBowlingGame
+from app.instrumentation import BASE_NS, NUM_BUCKETS, Instrumentation
+
+
+class InstrumentationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Instantiate a basic test object."""
+        self.b = BowlingController(2, 10, 10, [])
+
+
+    def tearDown(self):
+        """Destroy test object."""
+        self.b = None
+
+
+    def test_wrap(self):
+        """It should count calls and sort their latency into doubling buckets."""
+        instrumentation = Instrumentation()
+        fn = instrumentation.wrap('fn', lambda x: x * 2)
+        self.assertEqual(fn(4), 8)
+        self.assertEqual(fn(5), 10)
+        stats = instrumentation.stats()['fn']
+        self.assertEqual(stats['count'], 2)
+        self.assertEqual(sum(count for bound, count in stats['histogram']), 2)
+        self.assertEqual(len(stats['histogram']), NUM_BUCKETS + 1)
+        self.assertAlmostEqual(stats['histogram'][1][0], 2 * BASE_NS / 1e9)
+        self.assertEqual(stats['histogram'][-1][0], float('inf'))
+        instrumentation.reset()
+        self.assertEqual(instrumentation.stats()['fn']['count'], 0)
+
+
+    def test_wrap_error(self):
+        """It should record a call that raises an error."""
+        instrumentation = Instrumentation()
+        game = BowlingGame(10, 10, [])
+        game.enable_instrumentation(instrumentation)
+        def cause_error(): game.post_new_score(11)
+        self.assertRaises(ValueError, cause_error)
+        self.assertEqual(game.stats()['BowlingGame.post_new_score']['count'], 1)
+
+
+    def test_enable_instrumentation(self):
+        """It should record calls to the controller and every player's game."""
+        self.assertEqual(self.b.stats(), {})
+        self.b.enable_instrumentation()
+        for score in [5, 5, 10, 3, 4]: self.b.post_new_score(score)
+        self.b.get_current_scores()
+        stats = self.b.stats()
+        self.assertEqual(stats['BowlingController.post_new_score']['count'], 5)
+        self.assertEqual(stats['BowlingController.get_current_scores']['count'], 1)
+        self.assertEqual(stats['BowlingGame.add_ball_score']['count'], 5)
+        self.assertEqual(stats['BowlingGame.calculate_running_total']['count'], 5)
+        self.assertGreater(stats['BowlingGame.post_new_score']['total_seconds'], 0)
+
+
+    def test_disable_instrumentation(self):
+        """It should restore the uninstrumented methods."""
+        game = BowlingGame(10, 10, [])
+        game.enable_instrumentation()
+        self.assertIn('add_ball_score', vars(game))
+        game.disable_instrumentation()
+        self.assertNotIn('add_ball_score', vars(game))
+        self.assertEqual(game.stats(), {})
+        self.assertEqual(game.stats(prometheus=True), '')
+
+
+    def test_compact_engine(self):
+        """It should record controller calls when the engine has no instrumentation support."""
+        b = BowlingController(2, 10, 10, [], engine=CompactBowlingGame)
+        b.enable_instrumentation()
+        b.post_new_scores([3, 4, 5])
+        self.assertEqual(b.stats()['BowlingController.post_new_scores']['count'], 1)
+        self.assertNotIn('BowlingGame.add_ball_score', b.stats())
+
+
+    def test_to_prometheus(self):
+        """It should format cumulative buckets, a sum, and a count for each method."""
+        self.b.enable_instrumentation()
+        self.b.post_new_score(3)
+        text = self.b.stats(prometheus=True)
+        self.assertTrue(text.startswith('# HELP bowling_method_duration_seconds'))
+        self.assertIn('# TYPE bowling_method_duration_seconds histogram\n', text)
+        self.assertIn('bowling_method_duration_seconds_bucket{method="BowlingGame.add_ball_score",'
+            'le="+Inf"} 1\n', text)
+        self.assertIn('bowling_method_duration_seconds_count'
+            '{method="BowlingController.post_new_score"} 1\n', text)
+        self.assertIn('le="1e-07"', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""Exercise code from <app/leaderboard.py>."""
+
+import unittest
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.bowling_controller import BowlingController
+from app.leaderboard import Leaderboard
+
+
+class LeaderboardTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Instantiate a leaderboard ranking two controllers."""
+        self.l = Leaderboard(10, 10)
+        self.c1 = BowlingController(2, 10, 10, [])
+        self.c2 = BowlingController(3, 10, 10, [])
+        self.l.add_controller(self.c1, key='lane-1')
+        self.l.add_controller(self.c2, key='lane-2')
+
+
+    def tearDown(self):
+        """Destroy test objects."""
+        self.l = self.c1 = self.c2 = None
+
+
+    def test_add_controller(self):
+        """It should rank every player at a score of 0 and reject a key in use."""
+        self.assertEqual(len(self.l), 5)
+        self.assertEqual(self.l.get_rank('lane-2', 3), 1)
+        def cause_error(): self.l.add_controller(BowlingController(1), key='lane-1')
+        self.assertRaises(ValueError, cause_error)
+
+
+    def test_add_controller_rules(self):
+        """It should reject a controller whose games have other rules before ranking it."""
+        c3 = BowlingController(1, 10, 20, [])
+        self.assertRaises(ValueError, self.l.add_controller, c3, 'lane-3')
+        self.assertRaises(ValueError, self.l.add_controller, BowlingController(1, 5, 10, []))
+        c3.post_new_scores([10] * 14) ## More than a 10-frame game can score.
+        self.assertEqual(len(self.l), 5)
+        self.assertEqual(c3.get_current_player(), 1)
+
+
+    def test_add_controller_twice(self):
+        """It should reject a controller that already belongs to a leaderboard."""
+        other = Leaderboard()
+        self.assertRaises(ValueError, other.add_controller, self.c1, 'lane-1')
+        self.assertRaises(ValueError, self.l.add_controller, self.c1, 'lane-3')
+        self.c1.post_new_scores([4, 5])
+        self.assertEqual(self.l.get_score('lane-1', 1), 9)
+        self.assertEqual(len(other), 0)
+
+        self.l.remove_controller('lane-1')
+        other.add_controller(self.c1, 'lane-1')
+        self.assertEqual(other.get_score('lane-1', 1), 9)
+
+
+    def test_update_score(self):
+        """It should follow ball scores posted to each controller."""
+        self.c1.post_new_scores([4, 5, 10])
+        self.c2.post_new_score(3)
+        self.c2.post_new_score(6)
+        self.assertEqual(self.l.get_top(3), [(9, 'lane-1', 1), (9, 'lane-2', 1),
+            (0, 'lane-1', 2)])
+        self.assertEqual(self.l.get_rank('lane-2', 1), 1)
+        self.assertEqual(self.l.get_rank('lane-1', 2), 3)
+        self.assertEqual(self.l.get_score('lane-1', 1), 9)
+
+
+    def test_range(self):
+        """It should count and list players in a score range from the highest score down."""
+        self.c1.post_new_scores([1, 2, 5, 5, 7, 1])
+        self.c2.post_new_scores([2, 2])
+        self.assertEqual(self.l.count_range(1, 20), 2)
+        self.assertEqual(self.l.get_range(1, 20), [(11, 'lane-1', 1), (4, 'lane-2', 1)])
+        self.assertEqual(self.l.get_range(0, 0), [(0, 'lane-1', 2), (0, 'lane-2', 2),
+            (0, 'lane-2', 3)])
+        self.assertEqual(self.l.count_range(5, 1), 0)
+        self.assertEqual(self.l.get_top(0), [])
+
+
+    def test_remove_controller(self):
+        """It should stop ranking and updating a removed controller's players."""
+        self.l.remove_controller('lane-2')
+        self.c2.post_new_scores([9, 0])
+        self.assertEqual(len(self.l), 2)
+        def cause_error_1(): self.l.get_rank('lane-2', 1)
+        def cause_error_2(): self.l.remove_controller('lane-2')
+        self.assertRaises(ValueError, cause_error_1)
+        self.assertRaises(ValueError, cause_error_2)
+
+
+    def test_sorted_scores(self):
+        """It should match sorting every player's current score."""
+        rng = random.Random(7)
+        controllers = [self.c1, self.c2]
+        for i in range(200):
+            controller = rng.choice(controllers)
+            try:
+                controller.post_new_score(rng.randint(0, 10))
+            except ValueError:
+                pass
+        scores = sorted([c.get_current_score(p) or 0 for c in controllers
+            for p in range(1, c.NUM_PLAYERS + 1)], reverse=True)
+        self.assertEqual([score for score, key, player in self.l.get_top(5)], scores)
+        for score, key, player in self.l.get_top(5):
+            self.assertEqual(self.l.get_rank(key, player), scores.index(score) + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+"""Exercise code from <app/replay_engine.py>."""
+
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.bowling_game import BowlingGame
+from app.compact_bowling_game import CompactBowlingGame
+from app.replay_engine import replay_chunk, replay_games
+
+
+class ReplayEngineTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Build a few sample games."""
+        self.games = [[i % 10, 0] * 10 for i in range(25)]
+        self.games.append([10, 7, 3, 7, 2, 9, 1, 10, 10, 10, 2, 3, 6, 4, 7, 3, 3])
+
+
+    def test_replay_chunk(self):
+        """It should return the frame data for each game."""
+        results = replay_chunk(self.games[-2:])
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0][-1].get('running_total'), 40)
+        self.assertEqual(results[1][-1].get('running_total'), 168)
+        b = BowlingGame(10, 10, [])
+        b.post_new_scores(self.games[-1])
+        self.assertEqual(results[1], [b.get_frame_data(i) for i in range(1, 11)])
+
+
+    def test_replay_games(self):
+        """It should yield the same results as a single process in input order."""
+        expected = replay_chunk(self.games)
+        results = list(replay_games(iter(self.games), chunk_size=4, max_workers=2))
+        self.assertEqual(results, expected)
+        results = list(replay_games(self.games, chunk_size=3, max_workers=2,
+            engine=CompactBowlingGame))
+        self.assertEqual(results, expected)
+
+
+    def test_replay_games_error(self):
+        """It should throw an error if a game or the configuration is incorrect."""
+        def cause_error_1(): list(replay_games([[5, 6]], max_workers=1))
+        def cause_error_2(): list(replay_games(self.games, chunk_size=0))
+        def cause_error_3(): list(replay_games(self.games, max_workers=0))
+        self.assertRaises(ValueError, cause_error_1)
+        self.assertRaises(ValueError, cause_error_2)
+        self.assertRaises(ValueError, cause_error_3)
+
+
+if __name__ == '__main__':
+    unittest.main()
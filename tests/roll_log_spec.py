@@ -0,0 +1,137 @@
+"""Exercise code from <app/roll_log.py>."""
+
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.bowling_controller import BowlingController
+from app.compact_bowling_game import CompactBowlingGame
+from app.roll_log import RECORD, RollLog, list_segments, read_records, restore_controllers
+
+
+class RollLogTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Create an empty log directory."""
+        self.directory = tempfile.mkdtemp()
+        self.rolls = [5, 5, 10, 3, 4, 1, 2, 10, 0, 10] * 5
+
+
+    def tearDown(self):
+        """Remove the log directory."""
+        shutil.rmtree(self.directory)
+
+
+    def test_append(self):
+        """It should write fixed-width records across segments."""
+        with RollLog(self.directory, segment_size=RECORD.size * 3, buffer_size=1) as log:
+            for i in range(7): log.append(1, 2, 1, i, 5, 2, timestamp=float(i))
+        self.assertEqual(len(list_segments(self.directory)), 3)
+        records = list(read_records(self.directory))
+        self.assertEqual(len(records), 7)
+        self.assertEqual(records[6], (1, 2, 1, 6, 5, 2, 6.0, RollLog.ROLL, 0))
+
+
+    def test_append_partial_record(self):
+        """It should drop a partially written record when the log is opened again."""
+        with RollLog(self.directory) as log:
+            log.append(1, 1, 1, 1, 5, 1)
+        with open(list_segments(self.directory)[0], 'ab') as f:
+            f.write(b'\x00' * 3)
+        self.assertEqual(len(list(read_records(self.directory))), 1)
+        with RollLog(self.directory) as log:
+            log.append(1, 1, 1, 1, 4, 1)
+        self.assertEqual([r[4] for r in read_records(self.directory)], [5, 4])
+
+
+    def test_restore_controllers(self):
+        """It should rebuild the game state of every logged controller."""
+        controllers = {}
+        with RollLog(self.directory, segment_size=RECORD.size * 10) as log:
+            for lane in range(3):
+                b = BowlingController(lane + 1, 10, 10, [], roll_log=log, lane=lane, game=9)
+                for score in self.rolls[:11]: b.post_new_score(score)
+                b.post_new_scores(self.rolls[11:])
+                def cause_error(): b.post_new_score(11)
+                self.assertRaises(ValueError, cause_error)
+                controllers[(lane, 9)] = b
+
+        restored = restore_controllers(self.directory, engine=CompactBowlingGame)
+        self.assertEqual(sorted(restored), sorted(controllers))
+        for key, b in controllers.items():
+            self.assertEqual(restored[key].NUM_PLAYERS, b.NUM_PLAYERS)
+            self.assertEqual(restored[key].get_game_states(), b.get_game_states())
+            self.assertEqual(restored[key].get_current_player(), b.get_current_player())
+
+
+    def test_restore_controllers_log(self):
+        """It should keep logging new ball scores to a restored controller."""
+        with RollLog(self.directory) as log:
+            BowlingController(1, 10, 10, [], roll_log=log, lane=4, game=0) \
+                .post_new_scores([3, 4])
+        with RollLog(self.directory) as log:
+            restored = restore_controllers(self.directory, roll_log=log)
+            restored[(4, 0)].post_new_score(5)
+        self.assertEqual([r[4] for r in read_records(self.directory)], [3, 4, 5])
+        self.assertEqual(restore_controllers(tempfile.gettempdir() + '/missing'), {})
+
+
+
+    def test_restore_controllers_corrections(self):
+        """It should apply corrections and undos from the log when restoring games."""
+        with RollLog(self.directory) as log:
+            b = BowlingController(2, 10, 10, [], roll_log=log, lane=3, game=1)
+            b.post_new_scores([3, 4, 10, 8, 1, 2])
+            b.amend_roll(1, 1, 2, 5)
+            self.assertEqual(b.undo_last_roll(), (2, 2))
+            b.post_new_scores([6, 2, 7])
+            b.amend_roll(2, 2, 1, 7)
+            def cause_error(): b.amend_roll(1, 1, 2, 8)
+            self.assertRaises(ValueError, cause_error)
+
+        kinds = [r[7] for r in read_records(self.directory)]
+        self.assertEqual(kinds.count(RollLog.AMEND), 2)
+        self.assertEqual(kinds.count(RollLog.UNDO), 1)
+        restored = restore_controllers(self.directory)[(3, 1)]
+        self.assertEqual(restored.get_game_states(), b.get_game_states())
+        self.assertEqual(restored.get_current_player(), b.get_current_player())
+        self.assertEqual(restored.get_frame_data(1, 1)['ball_2_score'], 5)
+        def cause_error_2(): restore_controllers(self.directory, engine=CompactBowlingGame)
+        self.assertRaises(ValueError, cause_error_2)
+
+
+    def test_restore_controllers_players(self):
+        """It should record and restore games with more players than fit in a byte."""
+        with RollLog(self.directory) as log:
+            b = BowlingController(300, 10, 10, [], roll_log=log, lane=2**32 - 1, game=1)
+            b.post_new_scores([3, 4] * 5)
+        restored = restore_controllers(self.directory)[(2**32 - 1, 1)]
+        self.assertEqual(restored.NUM_PLAYERS, 300)
+        self.assertEqual(restored.get_current_scores(), b.get_current_scores())
+
+
+    def test_roll_log_error(self):
+        """It should reject a log without a valid lane and game before any ball is posted."""
+        with RollLog(self.directory) as log:
+            def cause_error_1(): BowlingController(2, 10, 10, [], roll_log=log, lane=1)
+            def cause_error_2(): BowlingController(2, 10, 10, [], roll_log=log, lane=-1, game=1)
+            def cause_error_3(): BowlingController(2**16, 10, 10, [], roll_log=log, lane=1, game=1)
+            self.assertRaises(ValueError, cause_error_1)
+            self.assertRaises(ValueError, cause_error_2)
+            self.assertRaises(ValueError, cause_error_3)
+            b = BowlingController(2, 10, 10, [])
+            self.assertRaises(ValueError, b.set_roll_log, log)
+
+            # A record that does not fit is rejected before the game changes.
+            b = BowlingController(2, 10, 10, [], trusted=True, roll_log=log, lane=1, game=1)
+            self.assertRaises(ValueError, b.post_new_score, -1)
+            self.assertRaises(ValueError, b.post_new_scores, [3, -1])
+            self.assertEqual((b.get_current_player(), b.get_current_scores()), (1, [0, None]))
+        self.assertEqual([r[4] for r in read_records(self.directory)], [3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""Exercise code from <app/score_cache.py>."""
+
+import unittest
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.bowling_game import BowlingGame
+from app.score_cache import ScoreCache
+
+
+class ScoreCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Instantiate a basic test object."""
+        self.c = ScoreCache(max_size=3)
+
+
+    def tearDown(self):
+        """Destroy test object."""
+        self.c = None
+
+
+    def test_score(self):
+        """It should score frames like a game and count hits and misses."""
+        self.assertEqual(self.c.score([10, 7]), ((None, 0), (None, 0)))
+        self.assertEqual(self.c.score([]), ())
+        self.assertEqual(self.c.score([10] * 12)[-1], (30, 300))
+        self.assertEqual(self.c.score([10] * 3, 10, 1), ((30, 30),))
+        self.assertEqual(self.c.score([10] * 12)[-1], (30, 300))
+        self.assertEqual((self.c.hits, self.c.resumes, self.c.misses), (1, 0, 4))
+        self.assertEqual(len(self.c), 3)
+
+
+    def test_score_resume(self):
+        """It should continue scoring from the longest sequence scored before."""
+        self.c.score([10, 7])
+        self.c.score([10, 7, 2, 5])
+        self.assertEqual(self.c.score([10, 7, 2, 5, 5]),
+            ((19, 19), (9, 28), (None, 28)))
+        self.assertEqual((self.c.hits, self.c.resumes, self.c.misses), (0, 2, 1))
+
+        for rolls in [[9, 0], [4], [1]]:
+            self.c.score(rolls)
+        self.assertEqual(self.c.score([10, 7, 2, 5, 5, 3]), ((19, 19), (9, 28), (13, 41),
+            (None, 41)))
+        self.assertEqual(self.c.resumes, 2) ## Earlier sequences were dropped.
+
+
+    def test_score_error(self):
+        """It should reject invalid ball scores and balls after the end of the game."""
+        self.assertRaises(ValueError, self.c.score, [11])
+        self.assertRaises(ValueError, self.c.score, [7, 4])
+        self.assertRaises(ValueError, self.c.score, [0] * 21)
+        self.assertRaises(ValueError, self.c.score, [10] * 9 + [10, 3, 8])
+        self.assertEqual(self.c.score([0] * 18 + [5, 5, 10, 4])[-1], (20, 20))
+        self.c.score([10, 7])
+        self.assertRaises(ValueError, self.c.score, [10, 7, 4])
+        self.assertEqual(len(self.c), 2)
+
+
+    def test_score_game(self):
+        """It should match the frame scores and running totals of every game."""
+        rng = random.Random(13)
+        cache = ScoreCache(max_size=50)
+        for i in range(100):
+            game = BowlingGame(10, 10, [])
+            while not game.is_game_over():
+                try:
+                    game.post_new_score(rng.choice([10, rng.randint(0, 10)]))
+                except ValueError:
+                    continue
+                frames = tuple((frame.get('frame_score'), frame['running_total'])
+                    for frame in game.get_game_state()[:10])
+                self.assertEqual(cache.score(game.get_rolls()), frames)
+        self.assertLess(cache.misses, 100)
+
+
+    def test_clear(self):
+        """It should drop every result and reset the counts."""
+        self.c.score([3, 4])
+        self.c.score([3, 4])
+        self.c.clear()
+        self.assertEqual((len(self.c), self.c.hits, self.c.misses), (0, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
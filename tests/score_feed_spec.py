@@ -0,0 +1,209 @@
+"""Exercise code from <app/score_feed.py>."""
+
+import unittest
+import asyncio
+import os
+import random
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.bowling_controller import BowlingController
+from app.score_feed import ScoreFeed
+
+
+class ScoreFeedTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Instantiate a feed following two controllers."""
+        self.f = ScoreFeed()
+        self.c1 = BowlingController(2, 10, 10, [])
+        self.c2 = BowlingController(1, 10, 10, [])
+        self.f.add_controller(self.c1, key='lane-1')
+        self.f.add_controller(self.c2, key='lane-2')
+
+
+    def tearDown(self):
+        """Destroy test objects."""
+        self.f = self.c1 = self.c2 = None
+
+
+    def test_add_controller(self):
+        """It should reject a key in use and stop publishing once a controller is removed."""
+        def cause_error(): self.f.add_controller(BowlingController(1, 10, 10, []), key='lane-1')
+        self.assertRaises(ValueError, cause_error)
+        self.assertRaises(ValueError, self.f.remove_controller, 'lane-3')
+
+        s = self.f.subscribe()
+        self.f.remove_controller('lane-2')
+        self.c2.post_new_score(4)
+        self.assertEqual(s.poll(), [])
+
+
+    def test_subscribe(self):
+        """It should merge events for a player until they are read."""
+        s = self.f.subscribe()
+        for pins in [3, 4, 10, 7, 2]:
+            self.c1.post_new_score(pins)
+        events = s.poll()
+        self.assertEqual([event['player'] for event in events], [1, 2])
+        self.assertEqual(events[0]['version'], 5)
+        self.assertEqual(events[0]['score'], 16)
+        self.assertEqual(sorted(events[0]['frames']), [1, 2])
+        self.assertEqual(events[0]['frames'][1]['running_total'], 7)
+        self.assertEqual(events[1]['frames'][1]['ball_1_score'], 10)
+        self.assertEqual(s.merged, 3)
+        self.assertEqual(s.poll(), [])
+
+        self.c1.post_new_scores([2, 5])
+        events = s.poll()
+        self.assertEqual([(event['player'], event['version']) for event in events], [(2, 6)])
+        self.assertEqual(events[0]['score'], 24)
+        self.assertEqual(sorted(events[0]['frames']), [1, 2])
+
+
+    def test_subscribe_keys(self):
+        """It should only publish events from the controllers a subscription follows."""
+        s = self.f.subscribe(keys=['lane-2'])
+        self.c1.post_new_score(5)
+        self.c2.post_new_score(6)
+        events = s.poll()
+        self.assertEqual([(event['key'], event['player']) for event in events], [('lane-2', 1)])
+
+        s.close()
+        self.c2.post_new_score(1)
+        self.assertTrue(s.closed)
+        self.assertEqual(s.poll(), [])
+        self.assertEqual(s.get(), [])
+
+
+    def test_subscribe_callback(self):
+        """It should call a callback from its own thread without holding up ball scores."""
+        started, release = threading.Event(), threading.Event()
+        received = []
+        def callback(events):
+            started.set()
+            release.wait(5)
+            received.extend(events)
+        s = self.f.subscribe(callback=callback)
+
+        self.c2.post_new_score(1)
+        self.assertTrue(started.wait(5))
+        for pins in [2, 10, 10, 3]:
+            self.c2.post_new_score(pins) ## The callback is still running.
+        release.set()
+        s.close()
+        for i in range(500):
+            if len(received) == 2:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(len(received), 2)
+        self.assertEqual(received[1]['score'], 3 + 23) ## The third frame awaits a bonus ball.
+        self.assertEqual(sorted(received[1]['frames']), [1, 2, 3, 4])
+
+
+    def test_subscribe_async(self):
+        """It should deliver events to async readers as ball scores are posted from a thread."""
+        s = self.f.subscribe(keys=['lane-2'])
+
+        async def read():
+            events = []
+            async for batch in s:
+                events.extend(batch)
+            return events
+
+        def post():
+            for pins in [10] * 12:
+                self.c2.post_new_score(pins)
+            s.close()
+
+        async def main():
+            reader = asyncio.ensure_future(read())
+            await asyncio.sleep(0)
+            thread = threading.Thread(target=post)
+            thread.start()
+            events = await reader
+            thread.join()
+            return events
+
+        events = asyncio.run(main())
+        self.assertEqual(events[-1]['score'], 300)
+        self.assertEqual(events[-1]['version'], 12)
+
+
+    def test_subscribe_async_readers(self):
+        """It should wake every async reader and drop readers whose event loop was closed."""
+        s = self.f.subscribe(keys=['lane-2'])
+
+        # A reader left waiting on a closed event loop does not stop ball scores.
+        async def start():
+            reader = s.__anext__()
+            reader.send(None)
+            return reader
+        loop = asyncio.new_event_loop()
+        reader = loop.run_until_complete(start())
+        loop.close()
+        self.c2.post_new_scores([3, 4])
+        self.c2.post_new_score(10)
+        self.assertEqual(self.c2.get_current_scores(), [7])
+        self.assertEqual(len(s.poll()), 1)
+        reader.close()
+
+        async def read():
+            try:
+                return await s.__anext__()
+            except StopAsyncIteration:
+                return []
+
+        async def main():
+            readers = [asyncio.ensure_future(read()) for i in range(2)]
+            await asyncio.sleep(0)
+            thread = threading.Thread(target=self.c2.post_new_score, args=(5,))
+            thread.start()
+            thread.join()
+            await asyncio.sleep(0.01)
+            s.close()
+            return await asyncio.wait_for(asyncio.gather(*readers), 5)
+
+        events = asyncio.run(main())
+        self.assertEqual(sorted(len(batch) for batch in events), [0, 1])
+
+
+    def test_mirror(self):
+        """It should keep a display built from events in step with every controller."""
+        rng = random.Random(11)
+        s = self.f.subscribe()
+        controllers = {'lane-1': self.c1, 'lane-2': self.c2}
+        mirror = {}
+        scores = {}
+        for i in range(400):
+            key = rng.choice(sorted(controllers))
+            controller = controllers[key]
+            try:
+                if rng.random() < 0.1:
+                    controller.undo_last_roll()
+                else:
+                    controller.post_new_score(rng.randint(0, 10))
+            except ValueError:
+                pass
+            if rng.random() < 0.3:
+                continue
+            for event in s.poll():
+                frames = mirror.setdefault((event['key'], event['player']), {})
+                for frame, data in event['frames'].items():
+                    if data is None:
+                        frames.pop(frame, None)
+                    else:
+                        frames[frame] = dict(data)
+                scores[(event['key'], event['player'])] = event['score']
+
+            for (key, player), frames in mirror.items():
+                controller = controllers[key]
+                self.assertEqual(scores[(key, player)], controller.get_current_score(player))
+                for frame in range(1, 11):
+                    self.assertEqual(frames.get(frame, {}),
+                        dict(controller.get_frame_data(frame, player)))
+
+
+if __name__ == '__main__':
+    unittest.main()
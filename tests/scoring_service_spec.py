@@ -0,0 +1,55 @@
+"""Exercise code from <app/scoring_service.py>."""
+
+import asyncio
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.scoring_service import ScoringService, simulate_load
+
+
+class ScoringServiceTestCase(unittest.TestCase):
+
+    def test_post_new_score(self):
+        """It should apply ball scores to each lane in the order they were posted."""
+        async def run():
+            s = ScoringService()
+            s.open_lane('A', 1)
+            s.open_lane('B', 2)
+            await asyncio.gather(*[s.post_new_score('A', 1) for i in range(20)],
+                *[s.post_new_score('B', 3) for i in range(4)])
+            self.assertEqual(s.get_current_scores('A'), [20])
+            self.assertEqual(s.get_current_scores('B'), [6, 6])
+            self.assertEqual(s.get_frames('B', 1)[1].get('ball_2_score'), 3)
+            await s.close()
+        asyncio.run(run())
+
+
+    def test_post_new_score_error(self):
+        """It should reject bad scores and unknown lanes without stopping the lane."""
+        async def run():
+            s = ScoringService()
+            s.open_lane(1)
+            with self.assertRaises(ValueError): await s.post_new_score(1, 11)
+            with self.assertRaises(ValueError): await s.post_new_score(2, 1)
+            with self.assertRaises(ValueError): s.open_lane(1)
+            await s.post_new_score(1, 3)
+            controller = await s.close_lane(1)
+            self.assertEqual(controller.get_current_score(1), 0)
+            self.assertEqual(controller.get_frame_data(1, 1).get('ball_1_score'), 3)
+            with self.assertRaises(ValueError): s.get_current_scores(1)
+        asyncio.run(run())
+
+
+    def test_get_latency(self):
+        """It should report latency percentiles under a simulated load."""
+        latency = asyncio.run(simulate_load(num_lanes=5, num_players=2, seed=1))
+        self.assertGreater(latency['count'], 5 * 2 * 10)
+        self.assertLessEqual(latency['p50'], latency['p99'])
+        self.assertLessEqual(latency['p99'], latency['max'])
+        self.assertEqual(ScoringService().get_latency()['count'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""Exercise code from <app/shared_scores.py>."""
+
+import unittest
+import multiprocessing
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.bowling_controller import BowlingController
+from app.compact_bowling_game import CompactBowlingGame
+from app.shared_scores import SharedScoreTable
+
+
+def read_scores(name, lane, queue):
+    """Attach to a table from another process and send back a lane's scores."""
+    with SharedScoreTable.attach(name) as table:
+        queue.put(table.get_current_scores(lane))
+
+
+class SharedScoresTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Create a table with three lanes and a game to publish."""
+        self.table = SharedScoreTable.create(3, num_players=2)
+        self.b = BowlingController(2, 10, 10, [])
+        self.b.post_new_scores([10, 7, 3, 7, 2, 9, 1, 10, 10, 10, 2, 3, 6, 4, 7])
+
+
+    def tearDown(self):
+        """Remove the table."""
+        self.table.close()
+        self.table.unlink()
+
+
+    def test_publish(self):
+        """It should copy every player's rolls, frame scores, and running totals to a slot."""
+        self.table.publish(1, self.b)
+        lane = self.table.read_lane(1)
+        self.assertEqual(lane['version'], 1)
+        self.assertEqual(lane['current_player'], self.b.get_current_player())
+        self.assertEqual(len(lane['players']), 2)
+        for p, player in enumerate(lane['players'], 1):
+            self.assertEqual(player['rolls'], self.b.get_rolls(p))
+            for i in range(1, 11):
+                frame = self.b.get_frame_data(i, p)
+                self.assertEqual(player['frame_scores'][i-1], frame.get('frame_score'))
+                self.assertEqual(player['running_totals'][i-1], frame.get('running_total'))
+        self.assertEqual(self.table.get_current_scores(1), self.b.get_current_scores())
+        self.assertEqual(self.table.read_lane(0)['players'], [])
+
+
+    def test_publish_error(self):
+        """It should reject unknown lanes, too many players, and read-only tables."""
+        def cause_error_1(): self.table.publish(3, self.b)
+        def cause_error_2(): self.table.publish(0, BowlingController(3, 10, 10, []))
+        def cause_error_3(): self.table.read_lane(-1)
+        self.assertRaises(ValueError, cause_error_1)
+        self.assertRaises(ValueError, cause_error_2)
+        self.assertRaises(ValueError, cause_error_3)
+        with SharedScoreTable.attach(self.table.name) as table:
+            def cause_error_4(): table.publish(0, self.b)
+            self.assertRaises(ValueError, cause_error_4)
+
+
+    def test_publish_rules(self):
+        """It should reject a controller whose games have other rules and leave the slot."""
+        self.table.publish(1, self.b)
+        lane = self.table.read_lane(1)
+        for pins, frames in [(10, 12), (5, 10), (10, 5)]:
+            b = BowlingController(2, pins, frames, [])
+            b.post_new_scores([5] * 20)
+            self.assertRaises(ValueError, self.table.publish, 1, b)
+        self.assertEqual(self.table.read_lane(1), lane)
+
+
+    def test_attach(self):
+        """It should let another process read the published scores."""
+        b = BowlingController(2, 10, 10, [], engine=CompactBowlingGame)
+        for score in [10] * 24: b.post_new_score(score)
+        self.table.publish(2, b)
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=read_scores, args=(self.table.name, 2, queue))
+        process.start()
+        self.assertEqual(queue.get(timeout=10), [300, 300])
+        process.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
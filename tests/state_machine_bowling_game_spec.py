@@ -0,0 +1,130 @@
+"""Exercise code from <app/state_machine_bowling_game.py>."""
+
+import unittest
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.bowling_controller import BowlingController
+from app.bowling_game import BowlingGame
+from app.state_machine_bowling_game import STATES, TRANSITIONS, StateMachineBowlingGame
+
+
+class StateMachineBowlingGameTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Instantiate a basic test object."""
+        self.b = StateMachineBowlingGame(10, 10)
+        self.rolls = [10, 7, 3, 7, 2, 9, 1, 10, 10, 10, 2, 3, 6, 4, 7, 3, 3]
+
+
+    def tearDown(self):
+        """Destroy test object."""
+        self.b = None
+
+
+    def test_build_transition_table(self):
+        """It should reach only the states possible in a game."""
+        self.assertEqual(len(STATES), 6)
+        self.assertEqual(STATES[0], ((), False))
+        self.assertIn(((1, 2), False), STATES)
+        self.assertEqual(len(TRANSITIONS), 6 * 5)
+        self.assertTrue(all(len(needs) <= 2 for needs, is_second_ball in STATES))
+
+
+    def test_current_frame(self):
+        """It should return a value between 0 and NUM_FRAMES."""
+        self.assertEqual(self.b.current_frame, 0)
+        for i in range(12): self.b.post_new_score(10)
+        self.assertEqual(self.b.current_frame, self.b.NUM_FRAMES)
+        self.assertEqual(self.b.get_frame_data(10).get('running_total'), 300)
+
+
+    def test_add_ball_score_error(self):
+        """It should throw an error if the frame score is greater than NUM_PINS."""
+        self.b.post_new_score(6)
+        def cause_error(): self.b.post_new_score(5)
+        self.assertRaises(ValueError, cause_error)
+        self.assertEqual(self.b.get_rolls(), [6])
+        self.assertFalse(self.b.is_frame_complete(1))
+
+
+    def test_post_new_score_error(self):
+        """It should throw an error if the score is not a number between 0 and NUM_PINS."""
+        def cause_error_1(): self.b.post_new_score(11)
+        def cause_error_2(): self.b.post_new_scores([1, -1])
+        self.assertRaises(ValueError, cause_error_1)
+        self.assertRaises(ValueError, cause_error_2)
+        self.assertEqual(self.b.current_frame, 0)
+
+
+    def test_post_new_scores(self):
+        """It should add many ball scores and match the scores posted one at a time."""
+        self.b.post_new_scores(self.rolls[:5])
+        for score in self.rolls[5:]: self.b.post_trusted_score(score)
+        self.assertEqual(self.b.get_frame_data(10).get('running_total'), 168)
+        self.assertTrue(self.b.is_game_over())
+
+
+    def test_match_bowling_game(self):
+        """It should match BowlingGame after every ball for any number of pins and frames."""
+        rng = random.Random(1)
+        for i in range(300):
+            num_pins = rng.choice([1, 2, 3, 10])
+            num_frames = rng.choice([1, 2, 3, 10])
+            b1 = StateMachineBowlingGame(num_pins, num_frames)
+            b2 = BowlingGame(num_pins, num_frames, [])
+            for k in range(2 * num_frames + 4):
+                score = rng.randint(0, num_pins)
+                try:
+                    b2.post_new_score(score)
+                except ValueError:
+                    self.assertRaises(ValueError, b1.post_new_score, score)
+                    continue
+                b1.post_new_score(score)
+                self.assertEqual(b1.get_game_state(), b2.get_game_state())
+                self.assertEqual(b1.is_game_over(), b2.is_game_over())
+
+
+    def test_get_game_state(self):
+        """It should link frames in a copy and return read-only views otherwise."""
+        self.b.post_new_scores([4, 6, 10, 1])
+        state = self.b.get_game_state(copy=True)
+        self.assertEqual(state[0]['next_frame']['next_frame']['ball_1_score'], 1)
+        self.assertEqual(state[0]['frame_score'], 20)
+        self.assertNotIn('frame_score', state[1])
+        def cause_error(): self.b.get_game_state()[0]['ball_1_score'] = 5
+        self.assertRaises(TypeError, cause_error)
+
+
+    def test_snapshot(self):
+        """It should share snapshots with BowlingGame and restore the same game."""
+        self.b.post_new_scores(self.rolls[:10])
+        b2 = BowlingGame(10, 10, [])
+        b2.post_new_scores(self.rolls[:10])
+        self.assertEqual(self.b.snapshot(), b2.snapshot())
+        b3 = StateMachineBowlingGame.restore(b2.snapshot())
+        b3.post_new_scores(self.rolls[10:])
+        self.assertEqual(b3.get_rolls(), self.rolls)
+        self.assertEqual(b3.get_frame_data(10).get('running_total'), 168)
+
+
+    def test_controller_engine(self):
+        """It should run a controller game with the state machine engine."""
+        b1 = BowlingController(2, 10, 10, [], engine=StateMachineBowlingGame)
+        b2 = BowlingController(2, 10, 10, [])
+        for score in [5, 5, 10, 3, 4, 1, 2, 10, 0, 10] * 5:
+            b1.post_new_score(score)
+            b2.post_new_score(score)
+        b1.post_new_scores([10, 10])
+        b2.post_new_scores([10, 10])
+        self.assertEqual(b1.get_game_states(), b2.get_game_states())
+        self.assertEqual(b1.get_current_player(), b2.get_current_player())
+        b1.enable_instrumentation()
+        b1.get_frames(3)
+        self.assertEqual(b1.stats()['StateMachineBowlingGame.get_frame_data']['count'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""Exercise code from <app/stats_aggregator.py>."""
+
+import unittest
+import os
+import pickle
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.bowling_game import BowlingGame
+from app.stats_aggregator import StatsAggregator
+
+
+class StatsAggregatorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Instantiate a basic test object."""
+        self.s = StatsAggregator(10, 10)
+
+
+    def tearDown(self):
+        """Destroy test object."""
+        self.s = None
+
+
+    def test_add_rolls(self):
+        """It should count strikes, spares, open frames, and first balls for a bowler and lane."""
+        self.s.add_rolls([10, 7, 3, 9, 0], 'Ada', lane=7)
+        stats = self.s.get_bowler_stats('Ada')
+        self.assertEqual(stats['games'], 1)
+        self.assertEqual(stats['frames'], 3)
+        self.assertEqual((stats['strikes'], stats['spares'], stats['opens']), (1, 1, 1))
+        self.assertEqual(stats['spare_rate'], 0.5)
+        self.assertEqual(stats['first_ball_average'], 26 / 3)
+        self.assertEqual(self.s.get_lane_stats(7), stats)
+        self.assertEqual(self.s.get_lanes(), [7])
+
+
+    def test_add_rolls_error(self):
+        """It should reject invalid ball scores and ball scores after the end of the game."""
+        def cause_error(rolls): self.s.add_rolls(rolls, 'Ada')
+        self.assertRaises(ValueError, cause_error, [11])
+        self.assertRaises(ValueError, cause_error, [7, 4])
+        self.assertRaises(ValueError, cause_error, [0] * 21)
+        self.assertEqual(self.s.get_bowlers(), [])
+        def cause_error_2(): self.s.get_bowler_stats('Ada')
+        self.assertRaises(ValueError, cause_error_2)
+
+
+    def test_add_roll(self):
+        """It should count ball scores one at a time and ignore balls after the game is over."""
+        s = StatsAggregator(10, 2)
+        for pins in [7, 3, 10, 5, 0, 9]:
+            s.add_roll(pins, 'Bo', lane=1, game=1)
+        stats = s.get_bowler_stats('Bo')
+        self.assertEqual((stats['games'], stats['frames']), (1, 2))
+        self.assertEqual((stats['strikes'], stats['spares']), (1, 1))
+        self.assertEqual(stats['first_ball_pins'], 17) ## Bonus balls are not first balls.
+
+        s.add_roll(9, 'Bo', lane=1, game=2)
+        self.assertEqual(s.get_bowler_stats('Bo')['games'], 2)
+        self.assertEqual(s.get_bowler_stats('Bo')['frames'], 2)
+
+
+    def test_add_roll_new_game(self):
+        """It should start a new game when a ball arrives for another game before one ends."""
+        self.s.add_roll(3, 'A', 1, game=1) ## Game 1 is abandoned after one ball.
+        self.s.add_roll(5, 'A', 1, game=2)
+        self.s.add_roll(4, 'A', 1, game=2)
+        stats = self.s.get_bowler_stats('A')
+        self.assertEqual((stats['games'], stats['frames'], stats['first_balls']), (2, 1, 2))
+        self.assertEqual(stats['first_ball_pins'], 8)
+
+
+    def test_add_game(self):
+        """It should count the same frames as each game's state."""
+        rng = random.Random(3)
+        total = 0
+        for i in range(50):
+            game = BowlingGame(10, 10, [])
+            while not game.is_game_over():
+                try:
+                    game.post_new_score(rng.randint(0, 10))
+                except ValueError:
+                    pass
+            self.s.add_game(game, 'Cy')
+            strikes = sum(1 for frame in game.get_game_state()[:10] if frame['is_strike'])
+            stats = self.s.get_bowler_stats('Cy')
+            self.assertEqual(stats['frames'], 10 * (i + 1))
+            self.assertEqual(stats['strikes'] - total, strikes)
+            total = stats['strikes']
+
+
+    def test_merge(self):
+        """It should match counting every game in one aggregator."""
+        rng = random.Random(5)
+        parts = [StatsAggregator(10, 10) for i in range(3)]
+        for i in range(60):
+            game = BowlingGame(10, 10, [])
+            while not game.is_game_over():
+                try:
+                    game.post_new_score(rng.randint(0, 10))
+                except ValueError:
+                    pass
+            bowler, lane = rng.choice('abc'), rng.randint(1, 3)
+            rng.choice(parts).add_game(game, bowler, lane)
+            self.s.add_game(game, bowler, lane)
+
+        merged = StatsAggregator(10, 10)
+        for part in parts:
+            merged.merge(pickle.loads(pickle.dumps(part))) ## As returned by a worker process.
+        for bowler in self.s.get_bowlers():
+            self.assertEqual(merged.get_bowler_stats(bowler), self.s.get_bowler_stats(bowler))
+        for lane in self.s.get_lanes():
+            self.assertEqual(merged.get_lane_stats(lane), self.s.get_lane_stats(lane))
+
+
+    def test_merge_error(self):
+        """It should reject aggregators with other rules or the same game in progress."""
+        other = StatsAggregator(10, 10)
+        self.s.add_roll(3, 'Ada', lane=1)
+        other.add_roll(4, 'Ada', lane=1)
+        self.assertRaises(ValueError, self.s.merge, other)
+        self.assertRaises(ValueError, self.s.merge, StatsAggregator(5, 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""Exercise code from <app/stream_scorer.py>."""
+
+import unittest
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.bowling_game import BowlingGame
+from app.state_machine_bowling_game import StateMachineBowlingGame
+from app.stream_scorer import main, read_rolls, score_rolls
+
+
+class StreamScorerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Create a directory for roll feeds and two interleaved games."""
+        self.directory = tempfile.mkdtemp()
+        self.rolls_1 = [10, 7, 3, 7, 2, 9, 1, 10, 10, 10, 2, 3, 6, 4, 7, 3, 3]
+        self.rolls_2 = [10] * 12
+        self.lines = ['lane,game,player,pins']
+        for i in range(len(self.rolls_2)):
+            self.lines.append('1,1,1,{pins}'.format(pins=self.rolls_1[i]))
+            self.lines.append('1,1,2,{pins}'.format(pins=self.rolls_2[i]))
+        self.lines += ['1,1,1,{pins}'.format(pins=pins) for pins in self.rolls_1[12:]]
+
+
+    def tearDown(self):
+        """Remove the roll feed directory."""
+        shutil.rmtree(self.directory)
+
+
+    def test_read_rolls(self):
+        """It should read CSV rows with or without a header and JSON lines."""
+        self.assertEqual(list(read_rolls(['pins,player,game,lane', '7,1,2,3'])),
+            [(2, '3', '2', '1', '7')])
+        self.assertEqual(list(read_rolls(['3,2,1,7', '', '3,2'])),
+            [(1, '3', '2', '1', '7'), (3, None, None, None, None)])
+        lines = ['{"lane": 3, "game": 2, "player": 1, "pins": 7}', '{"lane": 3}']
+        self.assertEqual(list(read_rolls(lines)), [(1, 3, 2, 1, 7), (2, None, None, None, None)])
+
+
+    def test_score_rolls(self):
+        """It should yield each game as soon as it is over, then the open games."""
+        results = score_rolls(read_rolls(self.lines + ['2,1,1,4']))
+        result = next(results)
+        self.assertEqual((result['player'], result['score'], result['game_over']), ('2', 300, True))
+        self.assertEqual(len(result['frames']), 10)
+        result = next(results)
+        self.assertEqual((result['player'], result['score'], result['game_over']), ('1', 168, True))
+        game = BowlingGame(10, 10, [])
+        game.post_new_scores(self.rolls_1)
+        self.assertEqual(result['frames'], [game.get_frame_data(i) for i in range(1, 11)])
+        result = next(results)
+        self.assertEqual((result['lane'], result['score'], result['game_over']), ('2', 0, False))
+        self.assertRaises(StopIteration, next, results)
+
+
+    def test_score_rolls_error(self):
+        """It should raise an error or report it and skip the roll."""
+        lines = ['1,1,1,6', '1,1,1,5', '1,1,1,apple', '1,1,1', '1,1,1,3']
+        def cause_error(): list(score_rolls(read_rolls(lines)))
+        self.assertRaises(ValueError, cause_error)
+        errors = []
+        results = list(score_rolls(read_rolls(lines), engine=StateMachineBowlingGame,
+            on_error=lambda n, message: errors.append(n)))
+        self.assertEqual(errors, [2, 3, 4])
+        self.assertEqual(results[0]['frames'][0]['frame_score'], 9)
+
+
+    def test_score_rolls_pins(self):
+        """It should report pin counts that are not whole numbers rather than truncate them."""
+        lines = ['{"lane": 1, "game": 1, "player": 1, "pins": %s}' % pins
+            for pins in ['3.7', 'true', '3.0', '"4"', '2']]
+        errors = []
+        results = list(score_rolls(read_rolls(lines),
+            on_error=lambda n, message: errors.append(n)))
+        self.assertEqual(errors, [1, 2, 3])
+        self.assertEqual(results[0]['frames'][0]['frame_score'], 6)
+
+
+    def test_main(self):
+        """It should write each game from the roll feed files as a JSON line."""
+        path = os.path.join(self.directory, 'rolls.csv')
+        output = os.path.join(self.directory, 'games.jsonl')
+        with open(path, 'w') as f:
+            f.write('\n'.join(self.lines))
+        self.assertEqual(main([path, '--engine', 'compact', '--output', output]), 0)
+        with open(output) as f:
+            results = [json.loads(line) for line in f]
+        self.assertEqual([result['score'] for result in results], [300, 168])
+
+
+if __name__ == '__main__':
+    unittest.main()
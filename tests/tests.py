@@ -5,9 +5,23 @@ import os
 import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from tests.benchmarks_spec import BenchmarksTestCase
 from tests.bowling_controller_spec import BowlingControllerTestCase
 from tests.bowling_game_spec import BowlingGameTestCase
+from tests.compact_bowling_game_spec import CompactBowlingGameTestCase
 from tests.helpers_spec import HelpersTestCase
+from tests.instrumentation_spec import InstrumentationTestCase
+from tests.leaderboard_spec import LeaderboardTestCase
+from tests.replay_engine_spec import ReplayEngineTestCase
+from tests.roll_log_spec import RollLogTestCase
+from tests.score_cache_spec import ScoreCacheTestCase
+from tests.score_feed_spec import ScoreFeedTestCase
+from tests.scoring_service_spec import ScoringServiceTestCase
+from tests.shared_scores_spec import SharedScoresTestCase
+from tests.state_machine_bowling_game_spec import StateMachineBowlingGameTestCase
+from tests.stats_aggregator_spec import StatsAggregatorTestCase
+from tests.stream_scorer_spec import StreamScorerTestCase
+from tests.vectorized_scorer_spec import VectorizedScorerTestCase
 
 
 if __name__ == '__main__':
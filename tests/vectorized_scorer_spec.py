@@ -0,0 +1,80 @@
+"""Exercise code from <app/vectorized_scorer.py>."""
+
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.bowling_game import BowlingGame
+
+try:
+    import numpy
+    from app.vectorized_scorer import NO_SCORE, build_roll_matrix, score_games
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed.')
+class VectorizedScorerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Build a few sample games."""
+        self.games = [
+            [10, 7, 3, 7, 2, 9, 1, 10, 10, 10, 2, 3, 6, 4, 7, 3, 3],
+            [10] * 12,
+            [1, 9, 10, 3],
+            [4],
+            [],
+        ]
+
+
+    def test_build_roll_matrix(self):
+        """It should pack games into a zero-padded matrix with a vector of roll counts."""
+        rolls, lengths = build_roll_matrix(self.games)
+        self.assertEqual(rolls.shape, (5, 17))
+        self.assertEqual(lengths.tolist(), [17, 12, 4, 1, 0])
+        self.assertEqual(rolls[2].tolist(), [1, 9, 10, 3] + [0] * 13)
+
+
+    def test_score_games(self):
+        """It should match the frame data from <BowlingGame> for every game."""
+        result = score_games(*build_roll_matrix(self.games))
+        for row, rolls in enumerate(self.games):
+            b = BowlingGame(10, 10, [])
+            for score in rolls: b.post_new_score(score)
+            for i in range(10):
+                frame = b.get_frame_data(i+1)
+                self.assertEqual(result['frame_score'][row, i], frame.get('frame_score', NO_SCORE))
+                self.assertEqual(result['running_total'][row, i],
+                    frame.get('running_total', NO_SCORE))
+                self.assertEqual(result['is_strike'][row, i], frame.get('is_strike', False))
+                self.assertEqual(result['is_spare'][row, i], frame.get('is_spare', False))
+
+
+    def test_score_games_config(self):
+        """It should score games with any number of pins and frames."""
+        rolls, lengths = build_roll_matrix([[5, 2, 3, 1, 1, 0], [5, 5, 5, 5]])
+        result = score_games(rolls, lengths, num_pins=5, num_frames=3)
+        self.assertEqual(result['frame_score'].tolist(), [[10, 6, 2], [15, 15, NO_SCORE]])
+        self.assertEqual(result['running_total'].tolist(), [[10, 16, 18], [15, 30, 30]])
+
+
+    def test_score_games_error(self):
+        """It should throw an error if the ball scores or roll counts are incorrect."""
+        def cause_error_1(): score_games(*build_roll_matrix([[11]]))
+        def cause_error_2(): score_games(*build_roll_matrix([[-1]]))
+        def cause_error_3(): score_games(*build_roll_matrix([[6, 5]]))
+        def cause_error_4(): score_games(*build_roll_matrix([[10] * 10 + [6, 5]]))
+        def cause_error_5(): score_games([[1, 2]], [3])
+        self.assertRaises(ValueError, cause_error_1)
+        self.assertRaises(ValueError, cause_error_2)
+        self.assertRaises(ValueError, cause_error_3)
+        self.assertRaises(ValueError, cause_error_4)
+        self.assertRaises(ValueError, cause_error_5)
+        # Ball scores past the end of a game are ignored.
+        result = score_games(*build_roll_matrix([[0] * 20 + [6, 5]]))
+        self.assertEqual(result['running_total'][0, -1], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()